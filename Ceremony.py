@@ -0,0 +1,137 @@
+from py_ecc.bn128 import G1, G2, multiply, neg, curve_order
+import secrets
+
+from Curve import default_backend
+from Msm import msm
+from Pairing import multi_pairing_check
+
+"""
+Powers of tau ceremony (the circuit independent part of the setup):
+instead of one party knowing tau, every contributor rescales the current powers
+with a secret s of their own, [tau^i] * s^i = [(tau * s)^i], without knowing the previous tau.
+The final tau is the product of all secrets, which nobody knows
+as long as a single contributor deleted theirs.
+Every contribution publishes [s]_2, so anyone can check that it built on the previous powers
+"""
+
+"""
+[tau^0], [tau^1], ..., [tau^(n-1)] in G1 and G2 (lowest power first, unlike the srs's of the Setup),
+plus the [s]_2 of every contribution so far
+"""
+class PowersOfTau:
+    # bits of the random factors of the consistency checks, a malformed srs passes with probability ~ 2^-128
+    RANDOMIZER_BITS = 128
+
+    def __init__(self, g1_powers, g2_powers, contributions=None):
+        if len(g1_powers) != len(g2_powers) or len(g1_powers) < 2:
+            raise ValueError("Powers of tau need the same number (at least 2) of G1 and G2 powers")
+        self.g1_powers = list(g1_powers)
+        self.g2_powers = list(g2_powers)
+        self.contributions = list(contributions) if contributions is not None else []
+
+    """
+    The starting point of a ceremony, tau = 1
+    """
+    @classmethod
+    def new(cls, num_powers):
+        return cls([G1] * num_powers, [G2] * num_powers)
+
+    def __len__(self):
+        return len(self.g1_powers)
+
+    """
+    Returns the powers rescaled with the secret (random if not given) and the contribution recorded.
+    The scalar multiplications are done in chunks of chunk_size points,
+    on the pool's workers if a MsmPool (see Parallel.py) is given
+    """
+    def contribute(self, secret=None, backend=None, pool=None, chunk_size=1024):
+        secret = secret if secret is not None else secrets.randbelow(curve_order - 1) + 1
+        if secret % curve_order == 0:
+            raise ValueError("The secret must not be 0")
+        backend = backend if backend is not None else default_backend
+
+        # s^0 .. s^(n-1)
+        scalars = [1]
+        for _ in range(len(self) - 1):
+            scalars.append((scalars[-1] * secret) % curve_order)
+
+        powers = []
+        for points in [self.g1_powers, self.g2_powers]:
+            rescaled = []
+            for start in range(0, len(points), chunk_size):
+                rescaled += self.__rescale(points[start:start + chunk_size], scalars[start:start + chunk_size], backend, pool)
+            powers.append(rescaled)
+
+        return PowersOfTau(powers[0], powers[1], self.contributions + [multiply(G2, secret % curve_order)])
+
+    @staticmethod
+    def __rescale(points, scalars, backend, pool):
+        if pool is not None:
+            return pool.multiply_each(points, scalars)
+        group = backend.group_of(points[0])
+        return group.batch_to_affine([group.multiply(group.from_affine(point), scalar) for point, scalar in zip(points, scalars)])
+
+    """
+    Checks that the powers are consecutive powers of one tau in both groups,
+    with random linear combinations of all powers and one product of pairings:
+    e(sum r_i [tau^(i+1)]_1, G2) = e(sum r_i [tau^i]_1, [tau]_2)
+    e(G1, sum r_i [tau^(i+1)]_2) = e([tau]_1, sum r_i [tau^i]_2)
+    e([tau]_1, G2) = e(G1, [tau]_2)
+    """
+    def is_well_formed(self, backend=None):
+        g1, g2 = self.g1_powers, self.g2_powers
+        if g1[0] != G1 or g2[0] != G2 or g1[1] is None or g2[1] is None:
+            return False
+
+        r = [self.__randomizer() for _ in range(len(self) - 1)]
+        # each equation gets its own random factor, so they can't cancel out in the product
+        rho_2, rho_3 = self.__randomizer(), self.__randomizer()
+
+        pairs = [
+            (msm(g1[1:], r, backend=backend), G2),
+            (neg(msm(g1[:-1], r, backend=backend)), g2[1]),
+            (multiply(G1, rho_2), msm(g2[1:], r, backend=backend)),
+            (neg(multiply(g1[1], rho_2)), msm(g2[:-1], r, backend=backend)),
+            (multiply(g1[1], rho_3), G2),
+            (neg(multiply(G1, rho_3)), g2[1]),
+        ]
+        try:
+            return multi_pairing_check(pairs)
+        except ValueError:
+            # points not on the curve
+            return False
+
+    """
+    Returns g1_srs and g2_srs for a circuit of num_constraints constraints, highest power first like Setup
+    """
+    def srs(self, num_constraints):
+        if num_constraints > len(self):
+            raise ValueError(f"The ceremony has {len(self)} powers, the circuit needs {num_constraints}")
+        return {
+            "g1_srs": self.g1_powers[:num_constraints][::-1],
+            "g2_srs": self.g2_powers[:num_constraints][::-1],
+        }
+
+    def __randomizer(self):
+        return secrets.randbelow(2**self.RANDOMIZER_BITS - 1) + 1
+
+
+"""
+Checks that updated is a well-formed contribution on top of previous:
+it records one more contribution [s]_2 and [tau']_1 = s * [tau]_1, i.e. e([tau']_1, G2) = e([tau]_1, [s]_2)
+"""
+def verify_contribution(previous, updated, backend=None):
+    if len(updated) != len(previous) or updated.contributions[:-1] != previous.contributions:
+        return False
+    if len(updated.contributions) != len(previous.contributions) + 1:
+        return False
+
+    s_g2 = updated.contributions[-1]
+    if s_g2 is None:
+        return False
+    try:
+        if not multi_pairing_check([(updated.g1_powers[1], G2), (neg(previous.g1_powers[1]), s_g2)]):
+            return False
+    except ValueError:
+        return False
+    return updated.is_well_formed(backend=backend)
@@ -0,0 +1,342 @@
+from py_ecc.bn128 import FQ, FQ2, G1, G2, add, double, multiply, neg, field_modulus, curve_order
+
+from Glv import BETA, glv_multiply
+
+"""
+Pluggable curve arithmetic backends for G1 and G2.
+Every backend offers one group object per curve group with the same interface:
+from_affine/to_affine convert from/to py_ecc's affine tuples (None = point at infinity),
+add, double, neg and multiply operate on the backend's internal representation
+and batch_to_affine normalizes a whole list of points at once.
+"""
+
+"""
+Reference backend: py_ecc's affine arithmetic (one field inversion per group operation)
+"""
+class PyEccGroup:
+    def __init__(self, generator):
+        self.generator = generator
+        self.zero = None
+
+    def from_affine(self, point):
+        return point
+
+    def to_affine(self, point):
+        return point
+
+    def batch_to_affine(self, points):
+        return list(points)
+
+    def is_zero(self, point):
+        return point is None
+
+    def add(self, p, q):
+        return add(p, q)
+
+    def double(self, p):
+        return double(p)
+
+    def neg(self, p):
+        return neg(p)
+
+    def multiply(self, p, scalar):
+        return multiply(p, int(scalar) % curve_order)
+
+
+"""
+Arithmetic of the base field Fq on plain python ints
+"""
+class FqOps:
+    zero = 0
+    one = 1
+
+    @staticmethod
+    def add(a, b):
+        return (a + b) % field_modulus
+
+    @staticmethod
+    def sub(a, b):
+        return (a - b) % field_modulus
+
+    @staticmethod
+    def mul(a, b):
+        return (a * b) % field_modulus
+
+    @staticmethod
+    def sqr(a):
+        return (a * a) % field_modulus
+
+    @staticmethod
+    def mul_int(a, k):
+        return (a * k) % field_modulus
+
+    @staticmethod
+    def neg(a):
+        return -a % field_modulus
+
+    @staticmethod
+    def inv(a):
+        return pow(a, -1, field_modulus)
+
+    @staticmethod
+    def from_py_ecc(a):
+        return a.n
+
+    @staticmethod
+    def to_py_ecc(a):
+        return FQ(a)
+
+
+"""
+Arithmetic of the quadratic extension Fq2 = Fq[i] / (i^2 + 1)
+on tuples of python ints (a, b) representing a + b*i
+"""
+class Fq2Ops:
+    zero = (0, 0)
+    one = (1, 0)
+
+    @staticmethod
+    def add(a, b):
+        return ((a[0] + b[0]) % field_modulus, (a[1] + b[1]) % field_modulus)
+
+    @staticmethod
+    def sub(a, b):
+        return ((a[0] - b[0]) % field_modulus, (a[1] - b[1]) % field_modulus)
+
+    @staticmethod
+    def mul(a, b):
+        # Karatsuba: three multiplications instead of four
+        t0 = a[0] * b[0]
+        t1 = a[1] * b[1]
+        t2 = (a[0] + a[1]) * (b[0] + b[1])
+        return ((t0 - t1) % field_modulus, (t2 - t0 - t1) % field_modulus)
+
+    @staticmethod
+    def sqr(a):
+        # (a0 + a1 i)^2 = (a0 + a1)(a0 - a1) + 2 a0 a1 i
+        return (
+            ((a[0] + a[1]) * (a[0] - a[1])) % field_modulus,
+            (2 * a[0] * a[1]) % field_modulus
+        )
+
+    @staticmethod
+    def mul_int(a, k):
+        return ((a[0] * k) % field_modulus, (a[1] * k) % field_modulus)
+
+    @staticmethod
+    def neg(a):
+        return (-a[0] % field_modulus, -a[1] % field_modulus)
+
+    @staticmethod
+    def inv(a):
+        # 1 / (a0 + a1 i) = (a0 - a1 i) / (a0^2 + a1^2)
+        norm_inv = pow(a[0] * a[0] + a[1] * a[1], -1, field_modulus)
+        return ((a[0] * norm_inv) % field_modulus, (-a[1] * norm_inv) % field_modulus)
+
+    @staticmethod
+    def from_py_ecc(a):
+        return (a.coeffs[0].n, a.coeffs[1].n)
+
+    @staticmethod
+    def to_py_ecc(a):
+        return FQ2([a[0], a[1]])
+
+
+"""
+Montgomery's trick: inverts all (non-zero) elements with a single field inversion
+"""
+def batch_inverse(field, elements):
+    prefix = []
+    acc = field.one
+    for element in elements:
+        prefix.append(acc)
+        acc = field.mul(acc, element)
+
+    acc_inv = field.inv(acc)
+
+    inverses = [None] * len(elements)
+    for i in range(len(elements) - 1, -1, -1):
+        inverses[i] = field.mul(acc_inv, prefix[i])
+        acc_inv = field.mul(acc_inv, elements[i])
+    return inverses
+
+
+"""
+Points in Jacobian coordinates (X, Y, Z) representing the affine point (X/Z^2, Y/Z^3)
+on a curve y^2 = x^3 + b over the given field. Z = 0 is the point at infinity.
+The group law needs no field inversions, only to_affine does
+"""
+class JacobianGroup:
+    def __init__(self, field, generator):
+        self.field = field
+        self.zero = (field.one, field.one, field.zero)
+        self.generator = self.from_affine(generator)
+
+    def from_affine(self, point):
+        if point is None:
+            return self.zero
+        return (
+            self.field.from_py_ecc(point[0]),
+            self.field.from_py_ecc(point[1]),
+            self.field.one
+        )
+
+    def to_affine(self, point):
+        return self.batch_to_affine([point])[0]
+
+    """
+    Normalizes all points with one shared inversion of their Z coordinates
+    """
+    def batch_to_affine(self, points):
+        F = self.field
+        finite = [i for i, p in enumerate(points) if p[2] != F.zero]
+        z_invs = batch_inverse(F, [points[i][2] for i in finite])
+
+        res = [None] * len(points)
+        for i, z_inv in zip(finite, z_invs):
+            x, y, _ = points[i]
+            z_inv2 = F.sqr(z_inv)
+            res[i] = (
+                F.to_py_ecc(F.mul(x, z_inv2)),
+                F.to_py_ecc(F.mul(y, F.mul(z_inv2, z_inv)))
+            )
+        return res
+
+    def is_zero(self, point):
+        return point[2] == self.field.zero
+
+    def neg(self, point):
+        return (point[0], self.field.neg(point[1]), point[2])
+
+    """
+    Doubling for a = 0 (dbl-2009-l)
+    """
+    def double(self, point):
+        F = self.field
+        x, y, z = point
+        if z == F.zero:
+            return point
+
+        a = F.sqr(x)
+        b = F.sqr(y)
+        c = F.sqr(b)
+        d = F.mul_int(F.sub(F.sub(F.sqr(F.add(x, b)), a), c), 2)
+        e = F.mul_int(a, 3)
+        f = F.sqr(e)
+
+        x3 = F.sub(f, F.mul_int(d, 2))
+        y3 = F.sub(F.mul(e, F.sub(d, x3)), F.mul_int(c, 8))
+        z3 = F.mul_int(F.mul(y, z), 2)
+        return (x3, y3, z3)
+
+    """
+    Addition (add-2007-bl), with the cheaper mixed addition if q has Z = 1
+    """
+    def add(self, p, q):
+        F = self.field
+        x1, y1, z1 = p
+        x2, y2, z2 = q
+        if z1 == F.zero:
+            return q
+        if z2 == F.zero:
+            return p
+
+        z1z1 = F.sqr(z1)
+        u2 = F.mul(x2, z1z1)
+        s2 = F.mul(y2, F.mul(z1, z1z1))
+
+        if z2 == F.one:
+            u1 = x1
+            s1 = y1
+        else:
+            z2z2 = F.sqr(z2)
+            u1 = F.mul(x1, z2z2)
+            s1 = F.mul(y1, F.mul(z2, z2z2))
+
+        h = F.sub(u2, u1)
+        r = F.mul_int(F.sub(s2, s1), 2)
+        if h == F.zero:
+            # same x coordinate: either the same point or its negation
+            return self.double(p) if r == F.zero else self.zero
+
+        i = F.sqr(F.mul_int(h, 2))
+        j = F.mul(h, i)
+        v = F.mul(u1, i)
+
+        x3 = F.sub(F.sub(F.sqr(r), j), F.mul_int(v, 2))
+        y3 = F.sub(F.mul(r, F.sub(v, x3)), F.mul_int(F.mul(s1, j), 2))
+        # (z1 + z2)^2 - z1^2 - z2^2 = 2 z1 z2
+        z3 = F.mul_int(F.mul(z1, h), 2) if z2 == F.one else F.mul_int(F.mul(F.mul(z1, z2), h), 2)
+        return (x3, y3, z3)
+
+    """
+    Left-to-right double-and-add
+    """
+    def multiply(self, point, scalar):
+        scalar = int(scalar) % curve_order
+        acc = self.zero
+        for bit in bin(scalar)[2:]:
+            acc = self.double(acc)
+            if bit == "1":
+                acc = self.add(acc, point)
+        return acc
+
+
+"""
+Jacobian G1 with the GLV endomorphism phi(x, y) = (beta * x, y) (see Glv.py):
+multiply splits the scalar into two halves of about 128 bits,
+and msm splits the terms the same way when the group has an endomorphism
+"""
+class GlvJacobianGroup(JacobianGroup):
+    def __init__(self, generator):
+        super().__init__(FqOps, generator)
+
+    """
+    phi(P), in Jacobian coordinates x = X / Z^2 so only X is scaled
+    """
+    def endomorphism(self, point):
+        return (FqOps.mul(point[0], BETA), point[1], point[2])
+
+    def multiply(self, point, scalar):
+        return glv_multiply(self, point, scalar)
+
+
+"""
+A backend bundles one group object for G1 and one for G2.
+It's pickled as its class and constructor arguments (args), e.g. for worker processes
+which then rebuild the same configuration, as py_ecc's Fq2 elements can not be pickled
+"""
+class CurveBackend:
+    args = ()
+
+    def __init__(self, g1, g2):
+        self.g1 = g1
+        self.g2 = g2
+
+    def __reduce__(self):
+        return (type(self), self.args)
+
+    """
+    Returns the group object a py_ecc affine point belongs to
+    """
+    def group_of(self, point):
+        return self.g2 if isinstance(point[0], FQ2) else self.g1
+
+
+class PyEccBackend(CurveBackend):
+    def __init__(self):
+        super().__init__(PyEccGroup(G1), PyEccGroup(G2))
+
+
+class JacobianBackend(CurveBackend):
+    """
+    glv: use the GLV endomorphism for G1 scalar multiplications and MSMs
+    """
+    def __init__(self, glv=True):
+        self.glv = glv
+        self.args = (glv,)
+        g1 = GlvJacobianGroup(G1) if glv else JacobianGroup(FqOps, G1)
+        super().__init__(g1, JacobianGroup(Fq2Ops, G2))
+
+
+default_backend = PyEccBackend()
@@ -0,0 +1,266 @@
+from py_ecc.bn128 import curve_order
+import numpy as np
+
+"""
+Evaluation domains, i.e. the x values the rows of the R1CS are interpolated at,
+and the number theoretic transform (NTT) over the BN128 scalar field
+"""
+
+# curve_order - 1 = 2^28 * odd, so the scalar field has roots of unity of order up to 2^28
+TWO_ADICITY = 28
+# generator of the multiplicative group of the scalar field
+MULTIPLICATIVE_GENERATOR = 5
+
+
+"""
+Returns a primitive n-th root of unity of the scalar field, n must be a power of two <= 2^28
+"""
+def root_of_unity(n):
+    if n & (n - 1) != 0 or n > 2**TWO_ADICITY:
+        raise ValueError(f"No root of unity of order {n} in the scalar field")
+    return pow(MULTIPLICATIVE_GENERATOR, (curve_order - 1) // n, curve_order)
+
+"""
+Reorders the first axis by bit-reversed indices
+"""
+def _bit_reverse(values):
+    n = values.shape[0]
+    bits = n.bit_length() - 1
+    indices = [int(format(i, f"0{bits}b")[::-1], 2) for i in range(n)]
+    return values[indices]
+
+"""
+Iterative radix-2 NTT along the first axis of values (length a power of two).
+All columns of a 2d array are transformed at once, every butterfly stage
+operates on the whole matrix. Returns an object array of python ints
+"""
+def ntt(values, omega, mod=curve_order):
+    a = np.array(values, dtype=object) % mod
+    n = a.shape[0]
+    if n == 1:
+        return a
+    a = _bit_reverse(a)
+
+    trailing = a.shape[1:]
+    length = 2
+    while length <= n:
+        half = length // 2
+        w_len = pow(omega, n // length, mod)
+        twiddles = np.array([pow(w_len, j, mod) for j in range(half)], dtype=object)
+        twiddles = twiddles.reshape((half,) + (1,) * len(trailing))
+
+        blocks = a.reshape((n // length, length) + trailing)
+        even = blocks[:, :half]
+        odd = (blocks[:, half:] * twiddles) % mod
+        a = np.concatenate([(even + odd) % mod, (even - odd) % mod], axis=1).reshape((n,) + trailing)
+        length *= 2
+
+    return a
+
+"""
+Inverse NTT: from evaluations at omega^0 .. omega^(n-1) to coefficients (lowest power first)
+"""
+def intt(values, omega, mod=curve_order):
+    n = len(values)
+    n_inv = pow(n, -1, mod)
+    return (ntt(values, pow(omega, -1, mod), mod) * n_inv) % mod
+
+
+"""
+The original domain x = 1, 2, ..., n with t(x) = (x-1)(x-2)...(x-n)
+"""
+class IntegerDomain:
+    name = "integers"
+
+    def __init__(self, num_constraints):
+        self.size = num_constraints
+        self.__vanishing_coeffs = None
+
+    def points(self):
+        return list(range(1, self.size + 1))
+
+    """
+    t(x) for a scalar x
+    """
+    def vanishing_at(self, x):
+        res = 1
+        for point in self.points():
+            res = (res * (x - point)) % curve_order
+        return res
+
+    """
+    Coefficients of t(x), highest power first
+    """
+    def vanishing_coeffs(self):
+        if self.__vanishing_coeffs is None:
+            coeffs = [1]
+            for point in self.points():
+                # multiply by (x - point)
+                coeffs = [
+                    (a - point * b) % curve_order
+                    for a, b in zip(coeffs + [0], [0] + coeffs)
+                ]
+            self.__vanishing_coeffs = coeffs
+        return list(self.__vanishing_coeffs)
+
+    """
+    Coefficients (lowest power first) of the Lagrange basis polynomial
+    which is 1 at the point of the given row and 0 at all other points
+    """
+    def lagrange_basis(self, row):
+        x_j = int(row) + 1
+
+        # t(x) / (x - x_j) by synthetic division, highest power first
+        quotient = []
+        acc = 0
+        for coeff in self.vanishing_coeffs()[:-1]:
+            acc = (acc * x_j + coeff) % curve_order
+            quotient.append(acc)
+
+        # scale to 1 at x_j
+        denominator = 0
+        for coeff in quotient:
+            denominator = (denominator * x_j + coeff) % curve_order
+        scale = pow(denominator, -1, curve_order)
+
+        return np.array([(coeff * scale) % curve_order for coeff in reversed(quotient)], dtype=object)
+
+    """
+    Takes the nonzero entries (row, col, value) of a (size x num_columns) evaluation matrix
+    and returns the (size x num_columns) coefficient matrix (lowest power first)
+    by accumulating the Lagrange basis polynomial of each row with its values
+    """
+    def interpolate_sparse(self, entries, num_columns):
+        by_row = {}
+        for row, col, value in entries:
+            by_row.setdefault(row, []).append((col, value))
+
+        coeffs = np.zeros((self.size, num_columns), dtype=object)
+        for row, values in by_row.items():
+            basis = self.lagrange_basis(row)
+            for col, value in values:
+                coeffs[:, col] += basis * value
+        return coeffs % curve_order
+
+    """
+    Takes a (size x m) matrix of evaluations and returns the coefficient matrix (lowest power first)
+    """
+    def interpolate(self, evaluations):
+        evaluations = np.array(evaluations, dtype=object).reshape(self.size, -1)
+        entries = [(int(row), int(col), evaluations[row, col]) for row, col in zip(*np.nonzero(evaluations))]
+        return self.interpolate_sparse(entries, evaluations.shape[1])
+
+
+"""
+The domain of the n-th roots of unity 1, omega, ..., omega^(n-1)
+with t(x) = x^n - 1, n being the number of constraints rounded up to a power of two.
+Interpolation is an inverse NTT
+"""
+class RootsOfUnityDomain:
+    name = "roots"
+
+    def __init__(self, num_constraints):
+        self.size = 1 << max(0, (num_constraints - 1).bit_length())
+        self.omega = root_of_unity(self.size)
+        self.__inverse_powers = None
+
+    def points(self):
+        return [pow(self.omega, i, curve_order) for i in range(self.size)]
+
+    def vanishing_at(self, x):
+        return (pow(x, self.size, curve_order) - 1) % curve_order
+
+    def vanishing_coeffs(self):
+        return [1] + [0] * (self.size - 1) + [curve_order - 1]
+
+    """
+    Takes a (num_constraints x m) matrix of evaluations, one column per polynomial,
+    pads it with zero rows to the domain size and returns the
+    (size x m) coefficient matrix (lowest power first) of all polynomials at once
+    """
+    def interpolate(self, evaluations):
+        return intt(self.__pad(evaluations), self.omega)
+
+    """
+    Takes the nonzero entries (row, col, value) of a (num_constraints x num_columns) evaluation matrix
+    and returns the (size x num_columns) coefficient matrix (lowest power first)
+    """
+    def interpolate_sparse(self, entries, num_columns):
+        evaluations = np.zeros((self.size, num_columns), dtype=object)
+        for row, col, value in entries:
+            evaluations[row, col] = value
+        return self.interpolate(evaluations)
+
+    """
+    Coefficients (lowest power first) of the Lagrange basis polynomial
+    l_j(x) = 1/n * sum_k omega^(-jk) x^k, which is 1 at omega^j and 0 at all other points
+    """
+    def lagrange_basis(self, row):
+        if self.__inverse_powers is None:
+            omega_inv = pow(self.omega, -1, curve_order)
+            power = pow(self.size, -1, curve_order)
+            inverse_powers = []
+            for _ in range(self.size):
+                inverse_powers.append(power)
+                power = (power * omega_inv) % curve_order
+            self.__inverse_powers = np.array(inverse_powers, dtype=object)
+
+        return self.__inverse_powers[(int(row) * np.arange(self.size)) % self.size]
+
+    """
+    Evaluations at all domain points of the polynomial(s) given by their coefficients (lowest power first)
+    """
+    def evaluate(self, coeffs):
+        return ntt(self.__pad(coeffs), self.omega)
+
+    """
+    Evaluations at the coset g * omega^i (g being the multiplicative generator,
+    so no coset point is a root of t) of the polynomial(s) given by their coefficients
+    """
+    def coset_evaluate(self, coeffs):
+        return self.evaluate(self.__scale_by_powers(self.__pad(coeffs), MULTIPLICATIVE_GENERATOR))
+
+    """
+    Inverse of coset_evaluate: coefficients (lowest power first) from evaluations on the coset
+    """
+    def coset_interpolate(self, evaluations):
+        coeffs = self.interpolate(evaluations)
+        return self.__scale_by_powers(coeffs, pow(MULTIPLICATIVE_GENERATOR, -1, curve_order))
+
+    """
+    Multiplies the k-th row with factor^k, i.e. p(x) -> p(factor * x)
+    """
+    def __scale_by_powers(self, coeffs, factor):
+        powers = []
+        power = 1
+        for _ in range(coeffs.shape[0]):
+            powers.append(power)
+            power = (power * factor) % curve_order
+        powers = np.array(powers, dtype=object).reshape((-1,) + (1,) * (coeffs.ndim - 1))
+        return (coeffs * powers) % curve_order
+
+    """
+    Pads the first axis with zeros up to the domain size
+    """
+    def __pad(self, values):
+        values = np.array(values, dtype=object)
+        padding = self.size - values.shape[0]
+        if padding > 0:
+            values = np.concatenate([
+                values,
+                np.zeros((padding,) + values.shape[1:], dtype=object)
+            ])
+        return values
+
+
+"""
+Returns the evaluation domain for the given name and number of constraints
+"""
+def get_domain(name, num_constraints):
+    domains = {
+        IntegerDomain.name: IntegerDomain,
+        RootsOfUnityDomain.name: RootsOfUnityDomain,
+    }
+    if name not in domains:
+        raise ValueError(f"Unknown evaluation domain {name}, expected one of {list(domains)}")
+    return domains[name](num_constraints)
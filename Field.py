@@ -0,0 +1,368 @@
+from py_ecc.bn128 import curve_order
+from numba import njit
+import numpy as np
+
+"""
+Vectorized arithmetic in the BN128 scalar field on fixed-width limb arrays.
+galois falls back to object arrays of python ints for the 254 bit curve order,
+so every operation there is one python int operation per element.
+Here an element is stored as eight 32 bit limbs (least significant first) in uint64 words,
+in Montgomery form a * 2^256 mod p, and the operations are compiled loops over whole arrays:
+32 bit limbs keep every limb product plus carries within 64 bits
+"""
+
+MODULUS = curve_order
+LIMB_BITS = 32
+NUM_LIMBS = 8
+
+# Montgomery constants for R = 2^256
+_R = 1 << (LIMB_BITS * NUM_LIMBS)
+_R2 = _R * _R % MODULUS
+# -p^-1 mod 2^32
+_P_INV = np.uint64((-pow(MODULUS, -1, 1 << LIMB_BITS)) % (1 << LIMB_BITS))
+
+_MASK = np.uint64((1 << LIMB_BITS) - 1)
+_SHIFT = np.uint64(LIMB_BITS)
+
+
+def _int_limbs(values):
+    data = b"".join(int(value).to_bytes(4 * NUM_LIMBS, "little") for value in values)
+    return np.frombuffer(data, dtype="<u4").astype(np.uint64).reshape(-1, NUM_LIMBS)
+
+def _limbs_ints(limbs):
+    data = limbs.astype("<u4").tobytes()
+    size = 4 * NUM_LIMBS
+    return [int.from_bytes(data[i:i + size], "little") for i in range(0, len(data), size)]
+
+_P = _int_limbs([MODULUS])[0]
+
+
+"""
+a * b / R mod p of single elements into out (CIOS Montgomery multiplication), t is scratch of 10 limbs
+"""
+@njit(cache=True)
+def _mont_mul_into(a, b, out, t, p, p_inv):
+    for j in range(10):
+        t[j] = 0
+    for i in range(8):
+        c = np.uint64(0)
+        bi = b[i]
+        for j in range(8):
+            s = t[j] + a[j] * bi + c
+            t[j] = s & _MASK
+            c = s >> _SHIFT
+        s = t[8] + c
+        t[8] = s & _MASK
+        t[9] = s >> _SHIFT
+
+        # add m * p so the lowest limb becomes zero, then shift by one limb
+        m = (t[0] * p_inv) & _MASK
+        s = t[0] + m * p[0]
+        c = s >> _SHIFT
+        for j in range(1, 8):
+            s = t[j] + m * p[j] + c
+            t[j - 1] = s & _MASK
+            c = s >> _SHIFT
+        s = t[8] + c
+        t[7] = s & _MASK
+        t[8] = t[9] + (s >> _SHIFT)
+
+    _reduce_once(t, out, p)
+
+"""
+out = t - p if t >= p else t, for t < 2p given as limbs t[0..8]
+"""
+@njit(cache=True)
+def _reduce_once(t, out, p):
+    geq = t[8] != 0
+    if not geq:
+        geq = True
+        for j in range(7, -1, -1):
+            if t[j] != p[j]:
+                geq = t[j] > p[j]
+                break
+    if geq:
+        borrow = np.int64(0)
+        for j in range(8):
+            d = np.int64(t[j]) - np.int64(p[j]) - borrow
+            borrow = np.int64(0)
+            if d < 0:
+                d += np.int64(1) << np.int64(32)
+                borrow = np.int64(1)
+            out[j] = np.uint64(d)
+    else:
+        for j in range(8):
+            out[j] = t[j]
+
+@njit(cache=True)
+def _mul(a, b, out, p, p_inv):
+    t = np.zeros(10, dtype=np.uint64)
+    for k in range(a.shape[0]):
+        _mont_mul_into(a[k], b[k], out[k], t, p, p_inv)
+
+@njit(cache=True)
+def _add(a, b, out, p):
+    t = np.zeros(9, dtype=np.uint64)
+    for k in range(a.shape[0]):
+        c = np.uint64(0)
+        for j in range(8):
+            s = a[k, j] + b[k, j] + c
+            t[j] = s & _MASK
+            c = s >> _SHIFT
+        t[8] = c
+        _reduce_once(t, out[k], p)
+
+@njit(cache=True)
+def _sub(a, b, out, p):
+    for k in range(a.shape[0]):
+        borrow = np.int64(0)
+        for j in range(8):
+            d = np.int64(a[k, j]) - np.int64(b[k, j]) - borrow
+            borrow = np.int64(0)
+            if d < 0:
+                d += np.int64(1) << np.int64(32)
+                borrow = np.int64(1)
+            out[k, j] = np.uint64(d)
+        if borrow:
+            # a - b + p
+            c = np.uint64(0)
+            for j in range(8):
+                s = out[k, j] + p[j] + c
+                out[k, j] = s & _MASK
+                c = s >> _SHIFT
+
+"""
+Prefix products of Montgomery's batch inversion: prefix[k] = a[0] * ... * a[k - 1]
+"""
+@njit(cache=True)
+def _prefix_products(a, prefix, one, p, p_inv):
+    t = np.zeros(10, dtype=np.uint64)
+    prefix[0] = one
+    for k in range(1, a.shape[0] + 1):
+        _mont_mul_into(prefix[k - 1], a[k - 1], prefix[k], t, p, p_inv)
+
+"""
+Backward pass of the batch inversion, given the inverse of the product of all elements
+"""
+@njit(cache=True)
+def _batch_inverse(a, prefix, acc_inv, out, p, p_inv):
+    t = np.zeros(10, dtype=np.uint64)
+    tmp = np.zeros(8, dtype=np.uint64)
+    for k in range(a.shape[0] - 1, -1, -1):
+        _mont_mul_into(acc_inv, prefix[k], out[k], t, p, p_inv)
+        _mont_mul_into(acc_inv, a[k], tmp, t, p, p_inv)
+        acc_inv[:] = tmp
+
+"""
+Horner's method for every row of coeffs (num_polys, num_coeffs, 8), lowest power first, at x
+"""
+@njit(cache=True)
+def _evaluate(coeffs, x, out, p, p_inv):
+    t = np.zeros(10, dtype=np.uint64)
+    s = np.zeros(9, dtype=np.uint64)
+    acc = np.zeros(8, dtype=np.uint64)
+    for k in range(coeffs.shape[0]):
+        acc[:] = 0
+        for d in range(coeffs.shape[1] - 1, -1, -1):
+            _mont_mul_into(acc, x, acc, t, p, p_inv)
+            c = np.uint64(0)
+            for j in range(8):
+                v = acc[j] + coeffs[k, d, j] + c
+                s[j] = v & _MASK
+                c = v >> _SHIFT
+            s[8] = c
+            _reduce_once(s, acc, p)
+        out[k] = acc
+
+"""
+matrix (rows, cols, 8) times vector (cols, 8), only over the given columns
+"""
+@njit(cache=True)
+def _matvec(matrix, vector, columns, out, p, p_inv):
+    t = np.zeros(10, dtype=np.uint64)
+    s = np.zeros(9, dtype=np.uint64)
+    prod = np.zeros(8, dtype=np.uint64)
+    for r in range(matrix.shape[0]):
+        out[r] = 0
+        for col in columns:
+            _mont_mul_into(matrix[r, col], vector[col], prod, t, p, p_inv)
+            c = np.uint64(0)
+            for j in range(8):
+                v = out[r, j] + prod[j] + c
+                s[j] = v & _MASK
+                c = v >> _SHIFT
+            s[8] = c
+            _reduce_once(s, out[r], p)
+
+"""
+a (rows, inner, 8) times b (inner, cols, 8), skipping the zero entries of a
+"""
+@njit(cache=True)
+def _matmul(a, b, out, p, p_inv):
+    t = np.zeros(10, dtype=np.uint64)
+    s = np.zeros(9, dtype=np.uint64)
+    prod = np.zeros(8, dtype=np.uint64)
+    for r in range(a.shape[0]):
+        out[r] = 0
+        for i in range(a.shape[1]):
+            zero = True
+            for j in range(8):
+                if a[r, i, j] != 0:
+                    zero = False
+                    break
+            if zero:
+                continue
+            for col in range(b.shape[1]):
+                _mont_mul_into(a[r, i], b[i, col], prod, t, p, p_inv)
+                c = np.uint64(0)
+                for j in range(8):
+                    v = out[r, col, j] + prod[j] + c
+                    s[j] = v & _MASK
+                    c = v >> _SHIFT
+                s[8] = c
+                _reduce_once(s, out[r, col], p)
+
+
+"""
+Array of scalar field elements of any shape, stored as limbs of shape (*shape, 8).
+Supports +, -, * (element wise, with broadcasting of a single element or an int),
+negation, batch inversion, indexing and conversion from/to python ints
+"""
+class FieldArray:
+    def __init__(self, limbs):
+        self.limbs = limbs
+
+    """
+    Converts (nested lists or arrays of) ints, reduced modulo p, into Montgomery form
+    """
+    @classmethod
+    def from_ints(cls, values):
+        values = np.asarray(values, dtype=object)
+        flat = _int_limbs(int(value) % MODULUS for value in values.reshape(-1))
+        r2 = np.broadcast_to(_int_limbs([_R2]), flat.shape)
+        out = np.empty_like(flat)
+        _mul(flat, np.ascontiguousarray(r2), out, _P, _P_INV)
+        return cls(out.reshape(values.shape + (NUM_LIMBS,)))
+
+    @classmethod
+    def zeros(cls, shape):
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        return cls(np.zeros(shape + (NUM_LIMBS,), dtype=np.uint64))
+
+    """
+    The elements as object array of python ints of the same shape
+    """
+    def to_ints(self):
+        flat = self.__flat()
+        one = np.zeros_like(flat)
+        one[:, 0] = 1
+        out = np.empty_like(flat)
+        _mul(flat, one, out, _P, _P_INV)
+        res = np.empty(len(flat), dtype=object)
+        res[:] = _limbs_ints(out)
+        return res.reshape(self.shape)
+
+    @property
+    def shape(self):
+        return self.limbs.shape[:-1]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        index = index if isinstance(index, tuple) else (index,)
+        return FieldArray(self.limbs[index + (slice(None),)])
+
+    def __add__(self, other):
+        return self.__binary(_add, other, False)
+
+    def __sub__(self, other):
+        return self.__binary(_sub, other, False)
+
+    def __mul__(self, other):
+        return self.__binary(_mul, other, True)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __rsub__(self, other):
+        return FieldArray.from_ints(other) - self
+
+    def __neg__(self):
+        return FieldArray.zeros(self.shape) - self
+
+    def __eq__(self, other):
+        other = other if isinstance(other, FieldArray) else FieldArray.from_ints(other)
+        return np.all(self.limbs == other.limbs, axis=-1)
+
+    """
+    Element wise inverses with a single field inversion (Montgomery's trick)
+    """
+    def inverse(self):
+        flat = self.__flat()
+        if np.any(np.all(flat == 0, axis=1)):
+            raise ZeroDivisionError("Cannot invert zero in the scalar field")
+
+        one = FieldArray.from_ints([1]).limbs
+        prefix = np.empty((len(flat) + 1, NUM_LIMBS), dtype=np.uint64)
+        _prefix_products(flat, prefix, one[0], _P, _P_INV)
+
+        [product] = FieldArray(prefix[-1:]).to_ints()
+        acc_inv = FieldArray.from_ints([pow(product, -1, MODULUS)]).limbs[0].copy()
+
+        out = np.empty_like(flat)
+        _batch_inverse(flat, prefix, acc_inv, out, _P, _P_INV)
+        return FieldArray(out.reshape(self.limbs.shape))
+
+    """
+    Evaluates every row of a 2d array, polynomial coefficients lowest power first, at the point x
+    """
+    def evaluate(self, x):
+        x = x if isinstance(x, FieldArray) else FieldArray.from_ints([x])
+        coeffs = np.ascontiguousarray(self.limbs)
+        out = np.empty((coeffs.shape[0], NUM_LIMBS), dtype=np.uint64)
+        _evaluate(coeffs, x.limbs.reshape(NUM_LIMBS), out, _P, _P_INV)
+        return FieldArray(out)
+
+    """
+    Product of a 2d array with a vector, skipping the zero entries of the vector
+    """
+    def matvec(self, vector):
+        vector = vector if isinstance(vector, FieldArray) else FieldArray.from_ints(vector)
+        if len(vector.shape) != 1 or self.shape[1] != vector.shape[0]:
+            raise ValueError(f"Cannot multiply a {self.shape} matrix by a {vector.shape} vector")
+        columns = np.nonzero(np.any(vector.limbs != 0, axis=1))[0]
+        out = np.empty((self.shape[0], NUM_LIMBS), dtype=np.uint64)
+        _matvec(np.ascontiguousarray(self.limbs), vector.limbs, columns, out, _P, _P_INV)
+        return FieldArray(out)
+
+    """
+    Product of two 2d arrays, skipping the zero entries of this one,
+    e.g. the coefficient matrix of a circuit's polynomials times a matrix of witnesses (one per column)
+    """
+    def matmul(self, other):
+        other = other if isinstance(other, FieldArray) else FieldArray.from_ints(other)
+        if self.shape[1] != other.shape[0]:
+            raise ValueError(f"Cannot multiply a {self.shape} by a {other.shape} matrix")
+        out = np.empty((self.shape[0], other.shape[1], NUM_LIMBS), dtype=np.uint64)
+        _matmul(np.ascontiguousarray(self.limbs), np.ascontiguousarray(other.limbs), out, _P, _P_INV)
+        return FieldArray(out)
+
+    def __flat(self):
+        return np.ascontiguousarray(self.limbs.reshape(-1, NUM_LIMBS))
+
+    def __binary(self, kernel, other, montgomery):
+        other = other if isinstance(other, FieldArray) else FieldArray.from_ints(other)
+        a, b = np.broadcast_arrays(self.limbs, other.limbs)
+        shape = a.shape
+        a = np.ascontiguousarray(a.reshape(-1, NUM_LIMBS))
+        b = np.ascontiguousarray(b.reshape(-1, NUM_LIMBS))
+        out = np.empty_like(a)
+        if montgomery:
+            kernel(a, b, out, _P, _P_INV)
+        else:
+            kernel(a, b, out, _P)
+        return FieldArray(out.reshape(shape))
+
+    def __repr__(self):
+        return f"FieldArray({self.to_ints().tolist()})"
@@ -0,0 +1,43 @@
+from py_ecc.bn128 import curve_order
+import threading
+
+from Domain import MULTIPLICATIVE_GENERATOR
+
+"""
+The galois field (galois.GF) of the curve's scalar field, shared by all modules.
+It's built on first use, so importing a module doesn't build it. Only the construction is deferred:
+Prover.py and Qap.py still import galois and Field.py numba, only the Verifier imports neither.
+galois.GF(curve_order) alone checks the primality of the order and searches a primitive element,
+which takes minutes for the 254 bit prime. Both are known for the scalar field:
+5 generates its multiplicative group (see Domain.py), so the field is built without them.
+As 5 is the smallest primitive element, which galois picks itself, it's the same class
+as galois.GF(curve_order) and pickled field arrays load into it
+"""
+
+_fields = {}
+_lock = threading.Lock()
+
+"""
+Returns the galois field of the given prime order, the scalar field if not given
+"""
+def get_field(order=curve_order):
+    field = _fields.get(order)
+    if field is not None:
+        return field
+
+    with _lock:
+        if order not in _fields:
+            import galois
+            if order == curve_order:
+                _fields[order] = galois.GF(order, primitive_element=MULTIPLICATIVE_GENERATOR, verify=False)
+            else:
+                _fields[order] = galois.GF(order)
+        return _fields[order]
+
+"""
+Class attribute holding the scalar field, built on first access from the class or an instance,
+e.g. GF = LazyField() keeps Prover.GF(3) working without building the field on import
+"""
+class LazyField:
+    def __get__(self, obj, owner=None):
+        return get_field()
@@ -0,0 +1,72 @@
+from py_ecc.bn128 import curve_order
+
+"""
+Fixed-base scalar multiplication with precomputed window tables.
+For a base point B and window width w the table holds d * 2^(j*w) * B
+for every window position j and every digit d = 1 .. 2^w - 1,
+so k * B becomes one table lookup and addition per window without any doubling
+"""
+
+SCALAR_BITS = curve_order.bit_length()
+
+"""
+Picks the window width with the least estimated number of group additions
+for building the table plus num_scalars multiplications with it
+"""
+def fixed_base_window(num_scalars, max_window=12):
+    def cost(w):
+        num_windows = (SCALAR_BITS + w - 1) // w
+        return num_windows * ((1 << w) - 1) + num_scalars * num_windows
+
+    return min(range(1, max_window + 1), key=cost)
+
+
+class FixedBaseTable:
+    """
+    Builds the table for the (affine) base point within the given group of a curve backend
+    """
+    def __init__(self, group, base, window):
+        self.group = group
+        self.window = window
+        self.num_windows = (SCALAR_BITS + window - 1) // window
+        self.mask = (1 << window) - 1
+
+        rows = []
+        row_base = group.from_affine(base)
+        for _ in range(self.num_windows):
+            row = [row_base]
+            for _ in range(self.mask - 1):
+                row.append(group.add(row[-1], row_base))
+            rows.append(row)
+            # 2^w times the current base is the base of the next window
+            row_base = group.add(row[-1], row_base)
+
+        # normalize all entries at once, so additions with them are mixed additions
+        flat = group.batch_to_affine([point for row in rows for point in row])
+        self.table = [
+            [group.from_affine(point) for point in flat[j * self.mask:(j + 1) * self.mask]]
+            for j in range(self.num_windows)
+        ]
+
+    """
+    k * base in the group's representation
+    """
+    def multiply(self, scalar):
+        scalar = int(scalar) % curve_order
+        group = self.group
+
+        acc = group.zero
+        j = 0
+        while scalar:
+            digit = scalar & self.mask
+            if digit:
+                acc = group.add(acc, self.table[j][digit - 1])
+            scalar >>= self.window
+            j += 1
+        return acc
+
+    """
+    Multiplies the base with every scalar and returns the affine points
+    """
+    def multiply_all(self, scalars):
+        return self.group.batch_to_affine([self.multiply(scalar) for scalar in scalars])
@@ -0,0 +1,86 @@
+from py_ecc.bn128 import FQ, curve_order, field_modulus
+
+"""
+GLV scalar multiplication for BN128 G1.
+The curve y^2 = x^3 + 3 has the cheap endomorphism phi(x, y) = (beta * x, y),
+with beta a cube root of unity in Fq, which acts on G1 as multiplication
+by a cube root of unity lambda modulo the curve order: phi(P) = lambda * P.
+A scalar k is split into k = k1 + k2 * lambda with k1, k2 of about 128 bits,
+so k * P = k1 * P + k2 * phi(P) needs only half as many doublings
+"""
+
+# beta^3 = 1 in Fq and lambda^3 = 1 modulo the curve order, paired so that phi(P) = lambda * P
+BETA = 2203960485148121921418603742825762020974279258880205651966
+LAMBDA = 4407920970296243842393367215006156084916469457145843978461
+
+# short basis (a1, b1), (a2, b2) of the lattice {(a, b) : a + b * lambda = 0 mod curve_order},
+# from the extended euclidean algorithm on (curve_order, lambda)
+A1 = 9931322734385697763
+B1 = -147946756881789319000765030803803410728
+A2 = 147946756881789319010696353538189108491
+B2 = 9931322734385697763
+
+"""
+Rounded division of python ints (n / d rounded to the nearest int), for d > 0
+"""
+def _round_div(n, d):
+    return (2 * n + d) // (2 * d)
+
+"""
+Splits the scalar k into (k1, k2) with k = k1 + k2 * lambda modulo the curve order.
+k1 and k2 may be negative, their absolute values have at most 128 bits
+"""
+def decompose(k):
+    k = int(k) % curve_order
+    # closest lattice vector to (k, 0): c1 * (a1, b1) + c2 * (a2, b2)
+    c1 = _round_div(B2 * k, curve_order)
+    c2 = _round_div(-B1 * k, curve_order)
+    k1 = k - c1 * A1 - c2 * A2
+    k2 = -c1 * B1 - c2 * B2
+    return k1, k2
+
+"""
+phi(P) = (beta * x, y) of a py_ecc affine G1 point, None being the point at infinity
+"""
+def endomorphism(point):
+    if point is None:
+        return None
+    return (point[0] * FQ(BETA), point[1])
+
+"""
+Splits (point, scalar) terms in the group's representation into twice as many terms
+with non-negative scalars of at most 128 bits, negating the points where a half is negative
+"""
+def split_terms(group, terms):
+    res = []
+    for point, scalar in terms:
+        k1, k2 = decompose(scalar)
+        for p, k in [(point, k1), (group.endomorphism(point), k2)]:
+            if k < 0:
+                p, k = group.neg(p), -k
+            if k != 0:
+                res.append((p, k))
+    return res
+
+"""
+k * P as k1 * P + k2 * phi(P) with one shared double-and-add loop (Shamir's trick),
+point and result in the group's representation
+"""
+def glv_multiply(group, point, scalar):
+    k1, k2 = decompose(scalar)
+    p1, p2 = point, group.endomorphism(point)
+    if k1 < 0:
+        p1, k1 = group.neg(p1), -k1
+    if k2 < 0:
+        p2, k2 = group.neg(p2), -k2
+
+    # P, phi(P) and their sum, indexed by the pair of bits
+    table = [None, p1, p2, group.add(p1, p2)]
+
+    acc = group.zero
+    for i in range(max(k1.bit_length(), k2.bit_length()) - 1, -1, -1):
+        acc = group.double(acc)
+        bits = ((k1 >> i) & 1) | (((k2 >> i) & 1) << 1)
+        if bits:
+            acc = group.add(acc, table[bits])
+    return acc
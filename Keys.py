@@ -0,0 +1,350 @@
+from py_ecc.bn128 import FQ, FQ2, b, b2, is_on_curve, field_modulus
+import mmap
+import os
+import struct
+
+"""
+Proving and verification keys with a compact binary file format:
+
+header:  magic (4 bytes), format version (u16), curve id (u16), number of sections (u32)
+section table, per section: name (16 bytes, ascii, zero padded), group (u8: 1 = G1, 2 = G2),
+         3 bytes padding, number of points (u64), byte offset of the first point (u64)
+points:  fixed-width little-endian coordinates, 32 bytes per base field element,
+         G1 = x, y (64 bytes), G2 = x.c0, x.c1, y.c0, y.c1 (128 bytes),
+         the point at infinity is all zeros (which is not on the curve)
+
+All integers are little-endian. Loaded keys are memory mapped and decode
+points lazily, only the header is read when opening the file
+"""
+
+FORMAT_VERSION = 2
+CURVE_IDS = {"bn128": 1}
+
+FIELD_BYTES = 32
+POINT_BYTES = {1: 2 * FIELD_BYTES, 2: 4 * FIELD_BYTES}
+
+HEADER = struct.Struct("<4sHHI")
+SECTION = struct.Struct("<16sB3xQQ")
+
+
+def encode_point(point, group):
+    if point is None:
+        return bytes(POINT_BYTES[group])
+    if group == 1:
+        coords = [point[0].n, point[1].n]
+    else:
+        coords = [c.n for c in point[0].coeffs] + [c.n for c in point[1].coeffs]
+    return b"".join(c.to_bytes(FIELD_BYTES, "little") for c in coords)
+
+def decode_point(data, group):
+    coords = [
+        int.from_bytes(data[i:i + FIELD_BYTES], "little")
+        for i in range(0, POINT_BYTES[group], FIELD_BYTES)
+    ]
+    if not any(coords):
+        return None
+    if any(c >= field_modulus for c in coords):
+        raise ValueError("Coordinate is not reduced modulo the field modulus")
+    if group == 1:
+        return (FQ(coords[0]), FQ(coords[1]))
+    return (FQ2(coords[0:2]), FQ2(coords[2:4]))
+
+"""
+JSON form of a point: [x, y] for G1, [[x.c0, x.c1], [y.c0, y.c1]] for G2,
+coordinates as decimal strings (JSON numbers are not exact beyond 2^53 in most languages),
+null for the point at infinity
+"""
+def point_to_json(point):
+    if point is None:
+        return None
+    if isinstance(point[0], FQ2):
+        return [[str(c.n) for c in coord.coeffs] for coord in point]
+    return [str(coord.n) for coord in point]
+
+def point_from_json(value):
+    if value is None:
+        return None
+    if not isinstance(value, list) or len(value) != 2:
+        raise ValueError(f"Invalid point {value!r}")
+    if all(isinstance(coord, list) for coord in value):
+        point = tuple(FQ2([int(c) % field_modulus for c in coord]) for coord in value)
+        curve_b = b2
+    else:
+        point = tuple(FQ(int(coord) % field_modulus) for coord in value)
+        curve_b = b
+    if not is_on_curve(point, curve_b):
+        raise ValueError(f"Point {value!r} is not on the curve")
+    return point
+
+
+"""
+Read-only sequence of the points of one section of a memory mapped key file,
+points are decoded on access (index or slice)
+"""
+class PointSection:
+    def __init__(self, buffer, offset, count, group):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.group = group
+        self.point_bytes = POINT_BYTES[group]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Point index out of range")
+        start = self.offset + index * self.point_bytes
+        return decode_point(self.buffer[start:start + self.point_bytes], self.group)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+"""
+Common base of ProvingKey and VerificationKey.
+Subclasses define MAGIC and SECTIONS, a list of (name, group, is_single_point)
+"""
+class Key:
+    MAGIC = None
+    SECTIONS = []
+
+    """
+    Takes the points per section name (single points or lists of points)
+    """
+    def __init__(self, points, curve="bn128"):
+        self.curve = curve
+        self.points = points
+        self.__file = None
+        self.__mmap = None
+
+    def __getattr__(self, name):
+        points = self.__dict__.get("points", {})
+        if name in points:
+            return points[name]
+        raise AttributeError(name)
+
+    """
+    Builds the key from the dict of Setup.get_setup()
+    """
+    @classmethod
+    def from_setup(cls, setup):
+        return cls({name: setup[name] for name, _, _ in cls.SECTIONS})
+
+    """
+    Returns the key's points as dict, like Setup.get_setup() does
+    """
+    def get_setup(self):
+        return dict(self.points)
+
+    def save(self, path):
+        header_size = HEADER.size + SECTION.size * len(self.SECTIONS)
+
+        table = []
+        body = []
+        offset = header_size
+        for name, group, single in self.SECTIONS:
+            points = [self.points[name]] if single else list(self.points[name])
+            table.append(SECTION.pack(name.encode("ascii"), group, len(points), offset))
+            body.append(b"".join(encode_point(point, group) for point in points))
+            offset += len(points) * POINT_BYTES[group]
+
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(self.MAGIC, FORMAT_VERSION, CURVE_IDS[self.curve], len(self.SECTIONS)))
+            f.write(b"".join(table))
+            for data in body:
+                f.write(data)
+
+    """
+    Opens a key file memory mapped, only the header is read here.
+    List sections become PointSections, which decode points on access
+    """
+    @classmethod
+    def load(cls, path):
+        f = open(path, "rb")
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            f.close()
+            raise ValueError(f"{path} is empty")
+
+        try:
+            points = cls.__read_sections(buffer)
+        except Exception:
+            buffer.close()
+            f.close()
+            raise
+
+        key = cls(points, curve="bn128")
+        key.__file = f
+        key.__mmap = buffer
+        return key
+
+    @classmethod
+    def __read_sections(cls, buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError("File too short for a key header")
+
+        magic, version, curve_id, num_sections = HEADER.unpack_from(buffer, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not a {cls.__name__} file (magic {magic!r})")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported key format version {version}")
+        if curve_id != CURVE_IDS["bn128"]:
+            raise ValueError(f"Unsupported curve id {curve_id}")
+        if HEADER.size + num_sections * SECTION.size > len(buffer):
+            raise ValueError("File too short for its section table")
+
+        sections = {}
+        for i in range(num_sections):
+            raw_name, group, count, offset = SECTION.unpack_from(buffer, HEADER.size + i * SECTION.size)
+            name = raw_name.rstrip(b"\0").decode("ascii")
+            if group not in POINT_BYTES:
+                raise ValueError(f"Unknown group {group} of section {name}")
+            if offset + count * POINT_BYTES[group] > len(buffer):
+                raise ValueError(f"Section {name} exceeds the file")
+            sections[name] = PointSection(buffer, offset, count, group)
+
+        points = {}
+        for name, group, single in cls.SECTIONS:
+            if name not in sections:
+                raise ValueError(f"Missing section {name}")
+            if sections[name].group != group:
+                raise ValueError(f"Section {name} has points of the wrong group")
+            if single:
+                if len(sections[name]) != 1:
+                    raise ValueError(f"Section {name} must hold exactly one point")
+                points[name] = sections[name][0]
+            else:
+                points[name] = sections[name]
+        return points
+
+    """
+    Checks that every point of the key is on its curve (decodes all points)
+    """
+    def validate(self):
+        for name, group, single in self.SECTIONS:
+            points = [self.points[name]] if single else self.points[name]
+            for point in points:
+                if not is_on_curve(point, b if group == 1 else b2):
+                    raise ValueError(f"Point of section {name} is not on the curve")
+
+    def close(self):
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__file.close()
+            self.__mmap = None
+            self.__file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+"""
+Writes a key file in chunks, for keys too large to hold in memory at once.
+counts gives the number of points per section, so the file is allocated with its
+final size up front and chunks can be written at their offsets in any order.
+The header is written last by finish(), so an unfinished file never loads as a key.
+With resume an existing unfinished file of the right size is continued
+"""
+class KeyWriter:
+    def __init__(self, key_class, path, counts, resume=False, curve="bn128"):
+        self.key_class = key_class
+        self.path = path
+        self.curve = curve
+
+        self.sections = {}
+        offset = HEADER.size + SECTION.size * len(key_class.SECTIONS)
+        for name, group, _ in key_class.SECTIONS:
+            self.sections[name] = (group, counts[name], offset)
+            offset += counts[name] * POINT_BYTES[group]
+        self.size = offset
+
+        if resume and os.path.exists(path):
+            if os.path.getsize(path) != self.size:
+                raise ValueError(f"{path} has not the size of the key to resume")
+            self.file = open(path, "r+b")
+        else:
+            self.file = open(path, "w+b")
+            self.file.truncate(self.size)
+
+    """
+    Writes the points of section name starting at the point index start
+    """
+    def write(self, name, start, points):
+        group, count, offset = self.sections[name]
+        points = list(points)
+        if start < 0 or start + len(points) > count:
+            raise ValueError(f"Points {start} to {start + len(points)} exceed section {name} of {count} points")
+        self.file.seek(offset + start * POINT_BYTES[group])
+        self.file.write(b"".join(encode_point(point, group) for point in points))
+
+    """
+    Makes the written chunks durable, before they're recorded as done
+    """
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def finish(self):
+        table = [
+            SECTION.pack(name.encode("ascii"), group, count, offset)
+            for name, (group, count, offset) in self.sections.items()
+        ]
+        self.file.seek(0)
+        self.file.write(HEADER.pack(self.key_class.MAGIC, FORMAT_VERSION, CURVE_IDS[self.curve], len(table)))
+        self.file.write(b"".join(table))
+        self.flush()
+        self.close()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+"""
+Everything the Prover needs from the Setup
+"""
+class ProvingKey(Key):
+    MAGIC = b"ZKPK"
+    SECTIONS = [
+        ("alpha_g1", 1, True),
+        ("beta_g1", 1, True),
+        ("beta_g2", 2, True),
+        ("g1_srs", 1, False),
+        ("g2_srs", 2, False),
+        ("t_tau_srs", 1, False),
+        ("psis", 1, False),
+        ("a_query_g1", 1, False),
+        ("b_query_g1", 1, False),
+        ("b_query_g2", 2, False),
+    ]
+
+    def verification_key(self):
+        return VerificationKey({name: self.points[name] for name, _, _ in VerificationKey.SECTIONS})
+
+
+"""
+Everything the Verifier needs from the Setup
+"""
+class VerificationKey(Key):
+    MAGIC = b"ZKVK"
+    SECTIONS = [
+        ("alpha_g1", 1, True),
+        ("beta_g2", 2, True),
+    ]
@@ -0,0 +1,237 @@
+from py_ecc.bn128 import add, multiply, curve_order
+
+from Curve import default_backend
+from Glv import decompose, split_terms
+
+"""
+Multi-scalar multiplication (MSM) sum(scalar_i * point_i)
+with the bucket method of Pippenger.
+Works for G1 as well as G2 points, as only the group law of the curve backend is used.
+"""
+
+"""
+Picks the bit width of a window depending on the number of terms,
+as larger windows pay off only if there are enough points to fill the buckets
+"""
+def window_size(n):
+    if n < 32:
+        return 3
+    # ~ ln(n) + 2
+    return (n.bit_length() * 69) // 100 + 2
+
+# scalars below this bound get their own pass with fewer windows
+SMALL_SCALAR_BOUND = 1 << 16
+
+# called with the number of scalars per class of every msm, see set_scalar_stats_hook
+_scalar_stats_hook = None
+
+"""
+Registers a function that is called by every msm with a dict of how many
+of its scalars were "zero", "one", "small" (< SMALL_SCALAR_BOUND) and "large",
+to see how sparse the witnesses of a circuit are. None removes the hook
+"""
+def set_scalar_stats_hook(hook):
+    global _scalar_stats_hook
+    _scalar_stats_hook = hook
+
+"""
+Computes sum(scalars[i] * points[i]) with the bucket method.
+Points are given and returned as py_ecc affine tuples, in between they stay
+in the representation of the curve backend (see Curve.py).
+Scalars are reduced modulo the curve order and classified first, as witnesses are mostly
+zeros, ones (constant and boolean wires) and small values: None points and zero scalars
+are skipped, points with scalar one are added directly and small scalars
+are summed in a separate pass over only their few low windows.
+In groups with an endomorphism (GLV, see Glv.py) the large scalars are split
+into two halves, which halves the number of windows.
+Returns None (the point at infinity) for an empty sum
+"""
+def msm(points, scalars, window=None, backend=None):
+    ones = []
+    small = []
+    large = []
+    num_zeros = 0
+    for point, scalar in zip(points, scalars):
+        scalar = int(scalar) % curve_order
+        if point is None or scalar == 0:
+            num_zeros += 1
+        elif scalar == 1:
+            ones.append(point)
+        elif scalar < SMALL_SCALAR_BOUND:
+            small.append((point, scalar))
+        else:
+            large.append((point, scalar))
+
+    if _scalar_stats_hook is not None:
+        _scalar_stats_hook({"zero": num_zeros, "one": len(ones), "small": len(small), "large": len(large)})
+
+    if len(ones) + len(small) + len(large) == 0:
+        return None
+
+    backend = backend if backend is not None else default_backend
+    group = backend.group_of((ones + [point for point, _ in small + large])[0])
+
+    acc = group.zero
+    for point in ones:
+        acc = group.add(acc, group.from_affine(point))
+    small = [(group.from_affine(point), scalar) for point, scalar in small]
+    large = [(group.from_affine(point), scalar) for point, scalar in large]
+    if hasattr(group, "endomorphism"):
+        large = split_terms(group, large)
+    for terms, terms_window in [(small, None), (large, window)]:
+        if len(terms) > 0:
+            acc = group.add(acc, msm_in_group(group, terms, terms_window))
+
+    return group.to_affine(acc)
+
+"""
+The bucket method on (point, scalar) terms already in the group's representation,
+with all scalars reduced and non-zero. Returns the sum in the group's representation
+"""
+def msm_in_group(group, terms, window=None):
+    c = window if window is not None else window_size(len(terms))
+    num_bits = max(scalar.bit_length() for _, scalar in terms)
+    num_windows = (num_bits + c - 1) // c
+    mask = (1 << c) - 1
+
+    acc = group.zero
+    for w in range(num_windows - 1, -1, -1):
+        # shift the accumulated sum by one window
+        if not group.is_zero(acc):
+            for _ in range(c):
+                acc = group.double(acc)
+
+        # bucket j collects all points whose scalar has the digit j in this window
+        buckets = [group.zero] * mask
+        shift = w * c
+        for point, scalar in terms:
+            digit = (scalar >> shift) & mask
+            if digit != 0:
+                buckets[digit - 1] = group.add(buckets[digit - 1], point)
+
+        # sum(j * bucket_j) as sum of running sums from the highest bucket down
+        running = group.zero
+        window_sum = group.zero
+        for bucket in reversed(buckets):
+            running = group.add(running, bucket)
+            window_sum = group.add(window_sum, running)
+
+        acc = group.add(acc, window_sum)
+
+    return acc
+
+"""
+MSMs of many scalar vectors with the same points, e.g. one per witness of a batch of proofs.
+The points are converted once and every point's shifted copies 2^(c*w) * point for all windows w
+(and those of its endomorphism with GLV) are computed once and normalized to affine coordinates.
+The MSM of a scalar vector is then a single bucket pass over the digits of all windows,
+without the doublings between the windows and with one bucket reduction instead of one per window.
+Holds num_windows points per point (per half with GLV), the precomputation costs
+about one doubling per bit and point, which pays off after a few scalar vectors
+"""
+class BatchMsm:
+    # largest window considered when picking it from the number of points
+    MAX_WINDOW = 16
+
+    def __init__(self, points, backend=None, window=None):
+        backend = backend if backend is not None else default_backend
+        finite = [point for point in points if point is not None]
+        self.num_points = len(points)
+        self.group = backend.group_of(finite[0]) if len(finite) > 0 else None
+
+        # with GLV the scalars are split into halves of at most 128 bits
+        self.glv = self.group is not None and hasattr(self.group, "endomorphism")
+        num_bits = 128 if self.glv else curve_order.bit_length()
+        num_bases = 2 if self.glv else 1
+        self.window = window if window is not None else self.pick_window(num_bases * len(finite), num_bits)
+        self.num_windows = (num_bits + self.window - 1) // self.window
+
+        # shifted[i][base][w] = 2^(c*w) * (point_i or phi(point_i)), None for points at infinity
+        self.shifted = [None] * len(points)
+        if self.group is None:
+            return
+        indices = [i for i, point in enumerate(points) if point is not None]
+        bases = [self.group.from_affine(points[i]) for i in indices]
+        if self.glv:
+            bases += [self.group.endomorphism(base) for base in bases]
+
+        rows = []
+        for base in bases:
+            row = [base]
+            for _ in range(self.num_windows - 1):
+                for _ in range(self.window):
+                    base = self.group.double(base)
+                row.append(base)
+            rows.append(row)
+
+        # affine points (Z = 1) make the bucket additions the cheaper mixed additions
+        flat = self.group.batch_to_affine([point for row in rows for point in row])
+        flat = [self.group.from_affine(point) for point in flat]
+        rows = [flat[r * self.num_windows:(r + 1) * self.num_windows] for r in range(len(rows))]
+        for k, i in enumerate(indices):
+            self.shifted[i] = [rows[k], rows[k + len(indices)]] if self.glv else [rows[k]]
+
+    """
+    The window c minimizing the additions per scalar vector: a bucket addition
+    per point and window, plus 2^(c+1) for the single bucket reduction
+    """
+    @classmethod
+    def pick_window(cls, num_points, num_bits):
+        return min(
+            range(2, cls.MAX_WINDOW + 1),
+            key=lambda c: num_points * ((num_bits + c - 1) // c) + 2**(c + 1)
+        )
+
+    """
+    Returns sum(scalars[i] * points[i]) for every scalar vector, as py_ecc affine points
+    """
+    def msm(self, scalar_vectors):
+        sums = [self.__msm(scalars) for scalars in scalar_vectors]
+        if self.group is None:
+            return sums
+        return self.group.batch_to_affine(sums)
+
+    def __msm(self, scalars):
+        if len(scalars) != self.num_points:
+            raise ValueError(f"Got {len(scalars)} scalars for {self.num_points} points")
+        if self.group is None:
+            return None
+
+        group = self.group
+        c = self.window
+        mask = (1 << c) - 1
+        buckets = [group.zero] * mask
+        for shifted, scalar in zip(self.shifted, scalars):
+            scalar = int(scalar) % curve_order
+            if shifted is None or scalar == 0:
+                continue
+
+            halves = zip(shifted, decompose(scalar)) if self.glv else [(shifted[0], scalar)]
+            for row, k in halves:
+                negate = k < 0
+                k = -k if negate else k
+                w = 0
+                while k:
+                    digit = k & mask
+                    if digit:
+                        point = group.neg(row[w]) if negate else row[w]
+                        buckets[digit - 1] = group.add(buckets[digit - 1], point)
+                    k >>= c
+                    w += 1
+
+        # sum(j * bucket_j) as sum of running sums from the highest bucket down
+        running = group.zero
+        acc = group.zero
+        for bucket in reversed(buckets):
+            running = group.add(running, bucket)
+            acc = group.add(acc, running)
+        return acc
+
+"""
+Reference implementation: one full scalar multiplication per term
+"""
+def naive_msm(points, scalars):
+    acc = None
+    for point, scalar in zip(points, scalars):
+        acc = add(acc, multiply(point, int(scalar) % curve_order))
+    return acc
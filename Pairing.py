@@ -0,0 +1,187 @@
+from py_ecc.bn128 import FQ2, FQ12, field_modulus, curve_order, b, b2, is_on_curve
+from py_ecc.bn128.bn128_pairing import ate_loop_count, log_ate_loop_count
+
+"""
+Optimal ate pairing on BN128, split into the Miller loop and the final exponentiation,
+so the Miller loops of several pairings can share one accumulator (one squaring per step)
+and one final exponentiation, e.g. to check a product of pairings.
+Results match py_ecc's pairing(Q, P) == final_exponentiate(miller_loop([(P, Q)])).
+
+Unlike py_ecc, which runs the loop on the G2 point twisted into Fq12,
+the G2 point stays in Fq2 here: the slope m and the constant c = y - m * x
+of every line are computed in Fq2 and only the line's value at P
+is embedded into Fq12, as a sparse element without any Fq12 inversion.
+The final exponentiation splits (p^12 - 1) / r into (p^6 - 1)(p^2 + 1) (p^4 - p^2 + 1) / r,
+the first two factors are frobenius maps, only the last one is a real exponentiation
+"""
+
+# Fq12 = Fq[w] / (w^12 - 18 w^6 + 82), so w^6 = 9 + i and Fq2 embeds via i -> w^6 - 9
+XI = FQ2([9, 1])
+# the twist maps (x, y) to (x * w^2, y * w^3), with the frobenius x^p
+# the factors w^(2(p-1)) = xi^((p-1)/3) and w^(3(p-1)) = xi^((p-1)/2) show up
+FROBENIUS_X = XI ** ((field_modulus - 1) // 3)
+FROBENIUS_Y = XI ** ((field_modulus - 1) // 2)
+
+# per line of the Miller loop, whether the accumulator is squared before multiplying with it
+SQUARE_BEFORE = []
+for i in range(log_ate_loop_count, -1, -1):
+    SQUARE_BEFORE.append(True)
+    if ate_loop_count & (2**i):
+        SQUARE_BEFORE.append(False)
+SQUARE_BEFORE += [False, False]
+
+HARD_EXPONENT = (field_modulus**4 - field_modulus**2 + 1) // curve_order
+
+# (w^k)^p as coefficient lists, computed on first use
+_frobenius_basis = None
+
+
+def _conjugate(x):
+    return FQ2([x.coeffs[0].n, (-x.coeffs[1]).n])
+
+"""
+The (untwisted) G2 point of the frobenius endomorphism applied to the twisted point
+"""
+def _frobenius(Q):
+    return (_conjugate(Q[0]) * FROBENIUS_X, _conjugate(Q[1]) * FROBENIUS_Y)
+
+"""
+Line through R and S (tangent if equal) and R + S.
+Lines are (m, c) with y = m * x + c or (None, x) if vertical
+"""
+def _line_and_sum(R, S):
+    (x1, y1), (x2, y2) = R, S
+    if x1 != x2:
+        m = (y2 - y1) / (x2 - x1)
+    elif y1 == y2:
+        m = 3 * x1**2 / (2 * y1)
+    else:
+        return (None, x1), None
+
+    c = y1 - m * x1
+    x3 = m * m - x1 - x2
+    return (m, c), (x3, -(m * x3 + c))
+
+"""
+All lines of the Miller loop for the G2 point Q, in the order of SQUARE_BEFORE.
+They only depend on Q, so they can be computed once for a fixed G2 point
+"""
+def g2_lines(Q):
+    lines = []
+    R = Q
+    for i in range(log_ate_loop_count, -1, -1):
+        line, R = _line_and_sum(R, R)
+        lines.append(line)
+        if ate_loop_count & (2**i):
+            line, R = _line_and_sum(R, Q)
+            lines.append(line)
+
+    Q1 = _frobenius(Q)
+    nQ2 = _frobenius(Q1)
+    nQ2 = (nQ2[0], -nQ2[1])
+
+    line, R = _line_and_sum(R, Q1)
+    lines.append(line)
+    line, _ = _line_and_sum(R, nQ2)
+    lines.append(line)
+    return lines
+
+"""
+Value of a line at the G1 point P as sparse Fq12 element.
+With the twist the line m * (x - x1) - (y - y1) becomes -y_P + m x_P w + c w^3
+(resp. x_P - x1 w^2 for vertical lines), a + b*i embedding as (a - 9b) + b w^6
+"""
+def _evaluate_line(line, P):
+    x, y = P[0].n, P[1].n
+    coeffs = [0] * 12
+    if line[0] is None:
+        a, b_ = (c.n for c in line[1].coeffs)
+        coeffs[0] = x
+        coeffs[2] = -(a - 9 * b_)
+        coeffs[8] = -b_
+    else:
+        (m_a, m_b), (c_a, c_b) = ((c.n for c in value.coeffs) for value in line)
+        coeffs[0] = -y
+        coeffs[1] = x * (m_a - 9 * m_b)
+        coeffs[7] = x * m_b
+        coeffs[3] = c_a - 9 * c_b
+        coeffs[9] = c_b
+    return FQ12([coeff % field_modulus for coeff in coeffs])
+
+"""
+Product of the Miller loops of all (P, Q) pairs (P in G1, Q in G2),
+without final exponentiation. Instead of Q its g2_lines can be given.
+Pairs with a point at infinity contribute 1
+"""
+def miller_loop(pairs):
+    prepared = []
+    for P, Q in pairs:
+        if P is None or Q is None:
+            continue
+        if not is_on_curve(P, b):
+            raise ValueError("Invalid input - point P is not on the correct curve")
+        if isinstance(Q, tuple):
+            if not is_on_curve(Q, b2):
+                raise ValueError("Invalid input - point Q is not on the correct curve")
+            Q = g2_lines(Q)
+        prepared.append((Q, P))
+
+    f = FQ12.one()
+    if len(prepared) == 0:
+        return f
+
+    for k, square in enumerate(SQUARE_BEFORE):
+        if square:
+            f = f * f
+        for lines, P in prepared:
+            f = f * _evaluate_line(lines[k], P)
+    return f
+
+"""
+Checks prod e(P_i, Q_i) == 1 for the (P, Q) pairs (P in G1, Q in G2 or its g2_lines)
+with one product of Miller loops and a single final exponentiation.
+Equations like e(A, B) == e(C, D) become e(A, B) * e(-C, D) == 1 by negating a G1 point
+"""
+def multi_pairing_check(pairs):
+    return final_exponentiate(miller_loop(pairs)) == FQ12.one()
+
+"""
+e(P, Q) for P in G1 and Q in G2, equal to py_ecc's pairing(Q, P)
+"""
+def pairing(P, Q):
+    return final_exponentiate(miller_loop([(P, Q)]))
+
+"""
+f^p, a linear map on the coefficients as a^p = a for the coefficients in Fq
+"""
+def _frobenius_fq12(f):
+    global _frobenius_basis
+    if _frobenius_basis is None:
+        w_p = FQ12([0, 1] + [0] * 10) ** field_modulus
+        power = FQ12.one()
+        _frobenius_basis = []
+        for _ in range(12):
+            _frobenius_basis.append([c.n for c in power.coeffs])
+            power = power * w_p
+
+    res = [0] * 12
+    for coeff, basis in zip(f.coeffs, _frobenius_basis):
+        coeff = coeff.n
+        if coeff == 0:
+            continue
+        for j in range(12):
+            res[j] += coeff * basis[j]
+    return FQ12([c % field_modulus for c in res])
+
+"""
+f^((p^12 - 1) / r), maps the product of Miller loops to the pairing group
+"""
+def final_exponentiate(f):
+    # f^(p^6 - 1)
+    f_p6 = f
+    for _ in range(6):
+        f_p6 = _frobenius_fq12(f_p6)
+    f = f_p6 / f
+    # f^(p^2 + 1)
+    f = _frobenius_fq12(_frobenius_fq12(f)) * f
+    return f ** HARD_EXPONENT
@@ -0,0 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from py_ecc.bn128 import FQ2, add
+import os
+
+from Curve import default_backend
+from Keys import POINT_BYTES, encode_point, decode_point
+from Msm import msm
+
+"""
+Multi-scalar multiplications (and element wise scalar multiplications) on a pool of worker processes.
+The points are copied once into shared memory, in the fixed-width encoding of Keys.py,
+so a task only carries the name of the memory block, its index range and its scalars.
+Every MSM is split into chunks, each worker computes the MSM of its chunk
+and the partial sums are added up in the calling process
+"""
+
+# curve backend of a worker process, set by the pool's initializer
+_worker_backend = None
+
+def _init_worker(backend):
+    global _worker_backend
+    _worker_backend = backend
+
+def _read_chunk(name, group, start, count):
+    point_bytes = POINT_BYTES[group]
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(memory.buf[start * point_bytes:(start + count) * point_bytes])
+    finally:
+        memory.close()
+
+def _msm_chunk(name, group, start, scalars):
+    point_bytes = POINT_BYTES[group]
+    data = _read_chunk(name, group, start, len(scalars))
+
+    # decode only the points that are actually needed
+    terms = [
+        (decode_point(data[i * point_bytes:(i + 1) * point_bytes], group), scalar)
+        for i, scalar in enumerate(scalars)
+        if scalar != 0
+    ]
+    res = msm([point for point, _ in terms], [scalar for _, scalar in terms], backend=_worker_backend)
+    # py_ecc's Fq2 elements can not be pickled, so results travel encoded as well
+    return encode_point(res, group)
+
+def _multiply_chunk(name, group, start, scalars):
+    point_bytes = POINT_BYTES[group]
+    data = _read_chunk(name, group, start, len(scalars))
+
+    curve_group = _worker_backend.g1 if group == 1 else _worker_backend.g2
+    res = curve_group.batch_to_affine([
+        curve_group.multiply(curve_group.from_affine(decode_point(data[i * point_bytes:(i + 1) * point_bytes], group)), scalar)
+        for i, scalar in enumerate(scalars)
+    ])
+    return b"".join(encode_point(point, group) for point in res)
+
+
+"""
+A list of points (all in G1 or all in G2) in shared memory,
+must be closed to free the memory
+"""
+class SharedPoints:
+    def __init__(self, points):
+        points = list(points)
+        self.count = len(points)
+        first = next((point for point in points if point is not None), None)
+        self.group = 2 if first is not None and isinstance(first[0], FQ2) else 1
+
+        data = b"".join(encode_point(point, self.group) for point in points)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        self.memory.buf[:len(data)] = data
+        self.name = self.memory.name
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+
+class MsmPool:
+    """
+    workers: number of worker processes, all cores if not given
+    backend: curve backend (see Curve.py) the workers compute with
+    min_chunk: an MSM is only split into chunks of at least this many points
+    """
+    def __init__(self, workers=None, backend=None, min_chunk=256):
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.backend = backend if backend is not None else default_backend
+        self.min_chunk = min_chunk
+
+        # workers must report to the tracker of this process, not start their own,
+        # which would unlink the shared memory as soon as a worker exits
+        resource_tracker.ensure_running()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            # the backend arrives with its configuration (see CurveBackend in Curve.py)
+            initargs=(self.backend,)
+        )
+
+    """
+    Copies the points into shared memory, to reuse them for several MSMs
+    """
+    def share(self, points):
+        return SharedPoints(points)
+
+    def msm(self, points, scalars):
+        return self.msm_many([(points, scalars)])[0]
+
+    """
+    Takes (points, scalars) jobs, points as list or SharedPoints, and returns the affine MSM results.
+    The chunks of all jobs are submitted at once, so independent MSMs run in parallel too
+    """
+    def msm_many(self, jobs):
+        temporary = []
+        submitted = []
+        try:
+            for points, scalars in jobs:
+                if not isinstance(points, SharedPoints):
+                    points = self.share(points)
+                    temporary.append(points)
+
+                scalars = [int(scalar) for scalar in scalars][:len(points)]
+                futures = [
+                    self.executor.submit(_msm_chunk, points.name, points.group, start, scalars[start:stop])
+                    for start, stop in self.__chunks(len(scalars))
+                ]
+                submitted.append((points.group, futures))
+
+            results = []
+            for group, futures in submitted:
+                res = None
+                for future in futures:
+                    res = add(res, decode_point(future.result(), group))
+                results.append(res)
+            return results
+        finally:
+            # wait for all tasks before freeing their memory, also if one failed
+            for _, futures in submitted:
+                for future in futures:
+                    future.exception()
+            for points in temporary:
+                points.close()
+
+    """
+    Returns [scalars[i] * points[i]], the chunks computed in parallel
+    """
+    def multiply_each(self, points, scalars):
+        shared = points if isinstance(points, SharedPoints) else self.share(points)
+        futures = []
+        try:
+            scalars = [int(scalar) for scalar in scalars][:len(shared)]
+            futures = [
+                self.executor.submit(_multiply_chunk, shared.name, shared.group, start, scalars[start:stop])
+                for start, stop in self.__chunks(len(scalars))
+            ]
+            point_bytes = POINT_BYTES[shared.group]
+            res = []
+            for future in futures:
+                data = future.result()
+                res += [decode_point(data[i:i + point_bytes], shared.group) for i in range(0, len(data), point_bytes)]
+            return res
+        finally:
+            for future in futures:
+                future.exception()
+            if shared is not points:
+                shared.close()
+
+    """
+    Splits range(count) into at most one chunk per worker, each with at least min_chunk points
+    """
+    def __chunks(self, count):
+        num_chunks = max(1, min(self.workers, count // self.min_chunk))
+        bounds = [count * i // num_chunks for i in range(num_chunks + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
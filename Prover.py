@@ -1,15 +1,334 @@
-from py_ecc.bn128 import multiply, G1, curve_order, add
+from py_ecc.bn128 import curve_order, add
 import numpy as np
 import galois
 
-class Prover:
-    GF = galois.GF(curve_order)
+from Msm import msm, BatchMsm
+from Field import FieldArray
+from FieldContext import LazyField
+from Domain import IntegerDomain, MULTIPLICATIVE_GENERATOR
+
+"""
+Prover bound to one circuit and setup: takes the qap polynomials,
+the needed curve scalars and the two srs's from the setup once,
+preprocesses them and then proves any number of witnesses with prove(witness)
+"""
+class CircuitProver:
+    # the scalar field, only built when needed (see FieldContext.py)
+    GF = LazyField()
+
+    def __init__(
+        self,
+        left_polys: np.ndarray,
+        right_polys: np.ndarray,
+        out_polys: np.ndarray,
+        alpha_g1,
+        beta_g2,
+        g1_srs,
+        g2_srs,
+        t_tau_srs,
+        psis,
+        a_query_g1 = None, # [u_i(tau)]_1 per wire from the setup, [A]_1 is then one MSM over the witness
+        b_query_g2 = None, # [v_i(tau)]_2 per wire from the setup, [B]_2 is then one MSM over the witness
+        backend = None, # curve arithmetic backend for the MSMs (see Curve.py), py_ecc if not given
+        domain = None, # evaluation domain of the QAP (see Domain.py), x = 1..n if not given
+        h_mode = "division", # "division" (polynomial division by t) or "coset" (FFTs, needs the roots of unity domain)
+        pool = None # MsmPool (see Parallel.py) to compute the MSMs on several processes, serial if not given
+    ):
+        self.alpha_g1 = alpha_g1
+        self.beta_g2 = beta_g2
+        self.g1_srs = g1_srs
+        self.g2_srs = g2_srs
+        self.t_tau_srs = t_tau_srs
+        self.psis = psis
+        self.a_query_g1 = a_query_g1
+        self.b_query_g2 = b_query_g2
+
+        self.backend = backend
+        self.domain = domain if domain is not None else IntegerDomain(len(g1_srs))
+
+        if h_mode not in ["division", "coset"]:
+            raise ValueError(f"Unknown h mode {h_mode}, expected 'division' or 'coset'")
+        if h_mode == "coset" and self.domain.name != "roots":
+            raise ValueError("The coset h mode needs the roots of unity domain")
+        self.h_mode = h_mode
+
+        self.num_wires = len(left_polys)
+        # coefficient matrices (one column per wire, lowest power first) as limb arrays (see Field.py),
+        # so combining them with a witness is a compiled matrix vector product
+        self.left_coeffs = FieldArray.from_ints(self.__coeff_matrix(left_polys))
+        self.right_coeffs = FieldArray.from_ints(self.__coeff_matrix(right_polys))
+        self.out_coeffs = FieldArray.from_ints(self.__coeff_matrix(out_polys))
+
+        if h_mode == "division":
+            self.t_poly = galois.Poly(self.domain.vanishing_coeffs(), field=self.GF)
+        else:
+            self.t_coset_inv = pow(self.domain.vanishing_at(MULTIPLICATIVE_GENERATOR), -1, curve_order)
+
+        # the srs's are copied into the pool's shared memory once, not per proof,
+        # without pool lazily decoded ones (see Keys.py) are decoded once
+        self.pool = pool
+        self.__shared = []
+        # with the query points the coefficient form srs's are not needed for A and B
+        a_points = a_query_g1 if a_query_g1 is not None else g1_srs
+        b_points = b_query_g2 if b_query_g2 is not None else g2_srs
+        if pool is not None:
+            self.__shared = [pool.share(points) for points in [a_points, b_points, psis, t_tau_srs]]
+            self.a_points, self.b_points, self.psi_points, self.t_tau_points = self.__shared
+        else:
+            self.a_points, self.b_points, self.psi_points, self.t_tau_points = [
+                list(points) for points in [a_points, b_points, psis, t_tau_srs]
+            ]
+        # shifted srs points of prove_batch, built by its first call
+        self.__batch_msms = None
+
+    """
+    Returns the three curve points making up the proof for the witness
+    """
+    def prove(self, witness, allowFalseWitness=False):
+        return self.commit(witness, self.compute_h_coeffs(witness, allowFalseWitness))
+
+    """
+    Returns the proofs of many witnesses (a 2d witness matrix, one witness per row).
+    The witnesses' L, R and O polynomials are one matrix product of the coefficient matrices
+    with the witness matrix, h of all witnesses is computed with one batch of FFTs over all
+    their polynomials (in coset h mode, with polynomial division it's divided per witness)
+    and every srs' MSMs of all witnesses run in one pass (see BatchMsm in Msm.py),
+    its shifted points are computed by the first batch and kept for all further ones
+    """
+    def prove_batch(self, witnesses, allowFalseWitness=False):
+        witnesses = [self.__witness_ints(witness) for witness in witnesses]
+        if len(witnesses) == 0:
+            return []
+
+        L, R, O = self.__combine_batch(witnesses)
+        h_coeffs = self.__compute_h_coeffs_batch(L, R, O, allowFalseWitness)
+
+        num_witnesses = len(witnesses)
+        if self.a_query_g1 is not None:
+            a_scalars = witnesses
+        else:
+            a_scalars = [self.__srs_order(L[:, k], len(self.g1_srs)) for k in range(num_witnesses)]
+        if self.b_query_g2 is not None:
+            b_scalars = witnesses
+        else:
+            b_scalars = [self.__srs_order(R[:, k], len(self.g2_srs)) for k in range(num_witnesses)]
+        # cut like zip in msm, with allowFalseWitness h can have more coefficients than the srs
+        t_scalars = [self.__pad(h, len(self.t_tau_srs))[:len(self.t_tau_srs)] for h in h_coeffs]
+
+        scalars = [a_scalars, b_scalars, witnesses, t_scalars]
+        if self.pool is not None:
+            # the pool computes all MSMs of the batch in parallel
+            points = [self.a_points, self.b_points, self.psi_points, self.t_tau_points]
+            sums = self.pool.msm_many([(p, vector) for p, vectors in zip(points, scalars) for vector in vectors])
+            A_msms, B_msms, psi_sums, h_t_tau_sums = [
+                sums[i * num_witnesses:(i + 1) * num_witnesses] for i in range(4)
+            ]
+        else:
+            if self.__batch_msms is None:
+                self.__batch_msms = [
+                    BatchMsm(points, backend=self.backend)
+                    for points in [self.a_points, self.b_points, self.psi_points, self.t_tau_points]
+                ]
+            A_msms, B_msms, psi_sums, h_t_tau_sums = [
+                batch_msm.msm(vectors) for batch_msm, vectors in zip(self.__batch_msms, scalars)
+            ]
+
+        return [
+            {
+                "A": add(self.alpha_g1, A_msms[k]),
+                "B": add(self.beta_g2, B_msms[k]),
+                "C": add(psi_sums[k], h_t_tau_sums[k])
+            }
+            for k in range(num_witnesses)
+        ]
+
+    """
+    Computes the proof's curve points from the witness and the coefficients of h
+    """
+    def commit(self, witness, h_coeffs):
+        witness = self.__witness_ints(witness)
+
+        if self.a_query_g1 is not None:
+            a_scalars = witness
+        else:
+            a_scalars = self.__srs_order(self.__combine(self.left_coeffs, witness), len(self.g1_srs))
+        if self.b_query_g2 is not None:
+            b_scalars = witness
+        else:
+            b_scalars = self.__srs_order(self.__combine(self.right_coeffs, witness), len(self.g2_srs))
+
+        # the MSMs of A, B and C are independent of each other
+        A_msm, B_msm, psi_sum, h_t_tau_sum = self.__compute_msms([
+            (self.a_points, a_scalars),
+            (self.b_points, b_scalars),
+            (self.psi_points, witness),
+            (self.t_tau_points, self.__pad(h_coeffs, len(self.t_tau_srs))),
+        ])
+
+        return {
+            "A": add(self.alpha_g1, A_msm),
+            "B": add(self.beta_g2, B_msm),
+            # Combine both terms of C (None being the point at infinity)
+            "C": add(psi_sum, h_t_tau_sum)
+        }
+
+    """
+    Computes the (coefficients of the) h(tau)t(tau) polynimal
+    and checks it's division remainder for validation of witness
+    """
+    def compute_h_coeffs(self, witness, allowFalseWitness=False):
+        witness = self.__witness_ints(witness)
+        L, R, O = [self.__combine(coeffs, witness) for coeffs in [self.left_coeffs, self.right_coeffs, self.out_coeffs]]
 
+        if self.h_mode == "coset":
+            return self.__compute_h_coeffs_coset(L, R, O, allowFalseWitness)
+        return self.__compute_h_coeffs_division(L, R, O, allowFalseWitness)
+
+    def __compute_h_coeffs_division(self, L, R, O, allowFalseWitness):
+        L_poly, R_poly, O_poly = [galois.Poly(self.GF(list(coeffs)), order="asc") for coeffs in [L, R, O]]
+        numerator = L_poly * R_poly - O_poly
+
+        h_poly, remainder = divmod(numerator, self.t_poly)
+
+        # Check for remainer (not 0 => invalid witness)
+        if (not allowFalseWitness and (not np.all(remainder.coeffs == 0))):
+            raise ValueError("Invalid witness! (has devision remainder)")
+
+        return h_poly.coeffs
+
+    """
+    Computes the coefficients of h with FFTs over the roots of unity domain:
+    L, R and O are evaluated on a coset of the domain, where t(x) = x^n - 1 is a nonzero constant,
+    so the division is pointwise and h is recovered with one inverse NTT
+    """
+    def __compute_h_coeffs_coset(self, L, R, O, allowFalseWitness):
+        [h_coeffs] = self.__compute_h_coeffs_coset_batch(
+            *[coeffs.reshape(-1, 1) for coeffs in [L, R, O]], allowFalseWitness
+        )
+        return h_coeffs
+
+    """
+    h of all witnesses from their L, R and O coefficient matrices (one column per witness, lowest power first),
+    in coset h mode with one batch of FFTs over all columns, with polynomial division per witness
+    """
+    def __compute_h_coeffs_batch(self, L, R, O, allowFalseWitness):
+        if self.h_mode == "coset":
+            return self.__compute_h_coeffs_coset_batch(L, R, O, allowFalseWitness)
+        return [
+            self.__compute_h_coeffs_division(L[:, k], R[:, k], O[:, k], allowFalseWitness)
+            for k in range(L.shape[1])
+        ]
+
+    def __compute_h_coeffs_coset_batch(self, L, R, O, allowFalseWitness):
+        num_witnesses = L.shape[1]
+        L_cols, R_cols, O_cols = [slice(i * num_witnesses, (i + 1) * num_witnesses) for i in range(3)]
+        coeffs = np.concatenate([L, R, O], axis=1)
+
+        # t divides L * R - O exactly iff it vanishes on all points of the domain
+        evals = self.domain.evaluate(coeffs)
+        remainder = (evals[:, L_cols] * evals[:, R_cols] - evals[:, O_cols]) % curve_order
+        if (not allowFalseWitness and np.any(remainder != 0)):
+            message = "Invalid witness! (has devision remainder)"
+            if num_witnesses > 1:
+                invalid = np.nonzero(np.any(remainder != 0, axis=0))[0]
+                message += f", witnesses {invalid.tolist()} of the batch"
+            raise ValueError(message)
+
+        coset_evals = self.domain.coset_evaluate(coeffs)
+        h_evals = ((coset_evals[:, L_cols] * coset_evals[:, R_cols] - coset_evals[:, O_cols]) * self.t_coset_inv) % curve_order
+
+        h_coeffs = self.domain.coset_interpolate(h_evals)
+        return [self.__trimmed(h_coeffs[:, k]) for k in range(num_witnesses)]
+
+    """
+    Coefficients (lowest power first) highest power first without leading zeros, as galois would return them
+    """
+    @staticmethod
+    def __trimmed(coeffs):
+        nonzero = np.nonzero(coeffs)[0]
+        degree = nonzero[-1] if len(nonzero) > 0 else 0
+        return coeffs[degree::-1]
+
+    """
+    Computes the (points, scalars) MSMs, in parallel if there is a pool
+    """
+    def __compute_msms(self, jobs):
+        if self.pool is not None:
+            return self.pool.msm_many(jobs)
+        return [msm(points, scalars, backend=self.backend) for points, scalars in jobs]
+
+    def __coeff_matrix(self, polys):
+        matrix = np.zeros((self.domain.size, len(polys)), dtype=object)
+        for i, poly in enumerate(polys):
+            # plain ndarray view of python ints, indexing galois arrays element wise is slow
+            coeffs = poly.coeffs.view(np.ndarray)[::-1]
+            matrix[:len(coeffs), i] = coeffs
+        return matrix
+
+    def __witness_ints(self, witness):
+        if len(witness) != self.num_wires:
+            raise ValueError(f"Witness has {len(witness)} values, the circuit has {self.num_wires} wires")
+        return np.array([int(value) % curve_order for value in witness], dtype=object)
+
+    """
+    L, R and O of all witnesses as (coefficients x witnesses) matrices of python ints,
+    one matrix product each of the coefficient matrix with the witness matrix
     """
-    Takes as input the witness to prove with,
-    aswell as the needed curve scalars,
-    evaluated qap polynomials and the two srs's from the setup
+    def __combine_batch(self, witnesses):
+        witness_matrix = FieldArray.from_ints(np.stack(witnesses, axis=1))
+        return [coeffs.matmul(witness_matrix).to_ints() for coeffs in [self.left_coeffs, self.right_coeffs, self.out_coeffs]]
+
+    """
+    sum(witness_i * poly_i) as array of python int coefficients (lowest power first)
+    """
+    @staticmethod
+    def __combine(coeffs, witness):
+        return coeffs.matvec(witness).to_ints()
+
+    """
+    Coefficients (lowest power first) in the order of the srs (highest power first) of the given length
+    """
+    @classmethod
+    def __srs_order(cls, coeffs, length):
+        coeffs = coeffs[::-1]
+        if len(coeffs) > length:
+            # only zero coefficients beyond the srs
+            coeffs = coeffs[len(coeffs) - length:]
+        return cls.__pad(coeffs, length)
+
     """
+    Pads coefficients (highest power first) with leading 0-coefficients to the given length
+    """
+    @staticmethod
+    def __pad(coeffs, length):
+        if len(coeffs) < length:
+            coeffs = np.concatenate([np.zeros(length - len(coeffs), dtype=coeffs.dtype), coeffs])
+        return coeffs
+
+    """
+    Frees the srs's in the pool's shared memory
+    """
+    def close(self):
+        for shared in self.__shared:
+            shared.close()
+        self.__shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+"""
+One-shot prover: takes as input the witness to prove with,
+aswell as the needed curve scalars,
+evaluated qap polynomials and the two srs's from the setup
+and computes the proof for this single witness (see CircuitProver for many witnesses)
+"""
+class Prover:
+    GF = LazyField()
+
     def __init__(
         self,
         witness: np.ndarray,
@@ -22,13 +341,19 @@ class Prover:
         g2_srs,
         t_tau_srs,
         psis,
-        allowFalseWitness = False # True here allows testing the Verifier with a false witness
+        allowFalseWitness = False, # True here allows testing the Verifier with a false witness
+        a_query_g1 = None, # [u_i(tau)]_1 per wire from the setup, [A]_1 is then one MSM over the witness
+        b_query_g2 = None, # [v_i(tau)]_2 per wire from the setup, [B]_2 is then one MSM over the witness
+        backend = None, # curve arithmetic backend for the MSMs (see Curve.py), py_ecc if not given
+        domain = None, # evaluation domain of the QAP (see Domain.py), x = 1..n if not given
+        h_mode = "division", # "division" (polynomial division by t) or "coset" (FFTs, needs the roots of unity domain)
+        pool = None # MsmPool (see Parallel.py) to compute the MSMs on several processes, serial if not given
     ):
         self.witness = witness
         self.left_polys = left_polys
         self.right_polys = right_polys
         self.out_polys = out_polys
-        
+
         self.alpha_g1 = alpha_g1
         self.beta_g2 = beta_g2
         self.g1_srs = g1_srs
@@ -38,124 +363,21 @@ class Prover:
 
         self.allowFalseWitness = allowFalseWitness
 
-        self.A_1 = self.__compute_AB(self.alpha_g1, self.g1_srs, self.left_polys)
-        self.B_2 = self.__compute_AB(self.beta_g2, self.g2_srs, self.right_polys)
-
-        self.h_coeffs = self.__compute_h_coeffs()
-        self.C_1 = self.__compute_C()
-
-    """
-    Can construct both the [A]_1 point (with alpha_g1, srs_g1 and left_polys)
-    and the [B]_2 point (with beta_g2, srs_g2 and right_polys)
-    """
-    def __compute_AB(self, scalar, srs, polys):        
-        # Start with zero polynomial
-        res_poly = None
-        
-        for i, witness_val in enumerate(self.witness):
-            poly = polys[i]
-            
-            mul_poly = poly * self.GF(int(witness_val))
-            
-            if res_poly is None:
-                res_poly = mul_poly
-            else:
-                res_poly = res_poly + mul_poly
-        
-        coeffs = res_poly.coeffs
-        
-        srs_len = len(srs)
-        
-        # Pad with 0-coefficients if necessary (galois shortens polynomials with 0-coefficients)
-        if len(coeffs) < srs_len:
-            coeffs = np.concatenate([np.zeros(srs_len - len(coeffs), dtype=coeffs.dtype), coeffs])
-        
-        acc = None
-        for coeff, srs_element in zip(coeffs, srs):
-            term = multiply(srs_element, int(coeff) % curve_order)
-            acc = term if acc is None else add(acc, term)
-        
-        
-        return add(scalar, acc) if acc is not None else scalar
-    
-    """
-    Computes the (coefficients of the) h(tau)t(tau) polynimal
-    and checks it's division remainder for validation of witness
-    """
-    def __compute_h_coeffs(self):
-        """
-        Computes sum(witness_i * poly(x)) per given polynomial array
-        """
-        def compute_poly(polys):
-            res_poly = None
+        with CircuitProver(
+            left_polys, right_polys, out_polys, alpha_g1, beta_g2, g1_srs, g2_srs, t_tau_srs, psis,
+            a_query_g1=a_query_g1, b_query_g2=b_query_g2,
+            backend=backend, domain=domain, h_mode=h_mode, pool=pool
+        ) as circuit_prover:
+            self.domain = circuit_prover.domain
+            self.h_mode = circuit_prover.h_mode
 
-            for i, witness_val in enumerate(self.witness):
-                poly = polys[i]
-                scaled = poly * self.GF(int(witness_val))
-                res_poly = scaled if res_poly is None else res_poly + scaled
+            self.h_coeffs = circuit_prover.compute_h_coeffs(witness, allowFalseWitness)
+            proof = circuit_prover.commit(witness, self.h_coeffs)
 
-            return res_poly
-            
-        L_poly = compute_poly(self.left_polys)
-        R_poly = compute_poly(self.right_polys)
-        O_poly = compute_poly(self.out_polys)
+        self.A_1 = proof["A"]
+        self.B_2 = proof["B"]
+        self.C_1 = proof["C"]
 
-        numerator = L_poly * R_poly - O_poly
-        
-        # Compute t(x)
-        num_constraints = len(self.g1_srs)
-        roots = self.GF(np.arange(1, num_constraints + 1))
-        t_poly = galois.Poly([1], field=self.GF)
-
-        for root in roots:
-            t_poly = t_poly * galois.Poly([1, -root], field=self.GF)
-        
-        h_poly, remainder = divmod(numerator, t_poly)
-        
-        # Check for remainer (not 0 => invalid witness)
-        if (not self.allowFalseWitness and (not np.all(remainder.coeffs == 0))):
-            raise ValueError("Invalid witness! (has devision remainder)")
-        
-        return h_poly.coeffs
-    
-    """
-    Computes the C_1 point
-    """
-    def __compute_C(self):
-        # First term: 
-        psi_sum = None # representing the neutral element on ell. curve ("point at inf")
-        
-        for i, witness_val in enumerate(self.witness):
-            term = multiply(self.psis[i], int(witness_val) % curve_order)
-            psi_sum = term if psi_sum is None else add(psi_sum, term)
-        
-        # Second term:
-        
-        srs_len = len(self.t_tau_srs)
-        
-        # Pad with 0-coefficients if necessary
-        h_coeffs = self.h_coeffs
-        # TODO: Generalize this into a class aux method
-        if len(h_coeffs) < srs_len:
-            h_coeffs = np.concatenate([
-                np.zeros(srs_len - len(h_coeffs), dtype=h_coeffs.dtype), 
-                h_coeffs
-            ])
-        
-        h_t_tau_sum = None
-
-        for coeff, srs_element in zip(h_coeffs, self.t_tau_srs):
-            term = multiply(srs_element, int(coeff) % curve_order)
-            h_t_tau_sum = term if h_t_tau_sum is None else add(h_t_tau_sum, term)
-        
-        # Combine both terms
-        if psi_sum is None:
-            return h_t_tau_sum
-        elif h_t_tau_sum is None:
-            return psi_sum
-        else:
-            return add(psi_sum, h_t_tau_sum)
-        
     """
     Returns the three curve points making up the proof
     """
@@ -165,4 +387,3 @@ class Prover:
             "B": self.B_2,
             "C": self.C_1
         }
-
@@ -1,57 +1,133 @@
-#Inputs L, R, O, a, curve_order/prime_p
+#Inputs L, R, O, curve_order/prime_p
 
 from py_ecc.bn128 import G1, G2, curve_order
 import numpy as np
 import galois
-import functools as ft
+import warnings
+
+from Domain import get_domain
+from FieldContext import get_field
+from Sparse import SparseMatrix
+from QapCache import QapCache, default_cache
 
 """
 For transforming a R1CS (given as its three matrices) into a QAP
+The matrices can be dense NumPy arrays or sparse (see Sparse.py: CSR/COO matrices
+or lists of (row, col, value) triples), they're kept sparse in any case.
+The evaluation domain is either "integers" (x = 1..n) or "roots" (n-th roots of unity).
+The interpolated polynomials are looked up in / stored to a QapCache (see QapCache.py),
+the default one if not given, cache=False disables it.
+The QAP is circuit data only (U, V, W and t), the witness dependent h is computed by the Prover,
+check(witness) validates a witness against the QAP for debugging
 """
 class QAP:
 
-    def __init__(self, L, R, O, witness, c_order):
+    def __init__(self, L, R, O, c_order, domain="integers", cache=None, num_wires=None):
         self.curve_order = c_order
-        self.L = (L + self.curve_order) % self.curve_order
-        self.R = (R + self.curve_order) % self.curve_order
-        self.O = (O + self.curve_order) % self.curve_order
-        self.witness = witness
 
-        self.GF = galois.GF(self.curve_order)
+        self.L = SparseMatrix.from_any(L, self.curve_order)
+        self.R = SparseMatrix.from_any(R, self.curve_order)
+        self.O = SparseMatrix.from_any(O, self.curve_order)
 
+        # all three matrices share the number of constraints (rows) and wires (columns)
+        num_constraints = max(m.shape[0] for m in [self.L, self.R, self.O])
+        # unused trailing wires aren't visible in sparse input, num_wires gives them
+        num_wires = max([num_wires or 0] + [m.shape[1] for m in [self.L, self.R, self.O]])
+        self.L = self.L.resized((num_constraints, num_wires))
+        self.R = self.R.resized((num_constraints, num_wires))
+        self.O = self.O.resized((num_constraints, num_wires))
 
-        self.L_galois = self.GF(L)
-        self.R_galois = self.GF(R)
-        self.O_galois = self.GF(O)
+        self.GF = get_field(self.curve_order)
+        self.domain = get_domain(domain, num_constraints)
 
-        self.U_polys = np.apply_along_axis(self.__interpolate_column, 0, self.L_galois)
-        self.V_polys = np.apply_along_axis(self.__interpolate_column, 0, self.R_galois)
-        self.W_polys = np.apply_along_axis(self.__interpolate_column, 0, self.O_galois)
+        self.cache = cache if cache is not None else default_cache()
+        cached = self.__load_cached()
+        if cached is not None:
+            self.U_coeffs, self.V_coeffs, self.W_coeffs, t_coeffs = cached
+        else:
+            self.U_coeffs = self.__interpolate(self.L)
+            self.V_coeffs = self.__interpolate(self.R)
+            self.W_coeffs = self.__interpolate(self.O)
+            t_coeffs = self.domain.vanishing_coeffs()
+            self.__store_cached(t_coeffs)
 
-        self.qap_1 = self.__inner_product_polynomials_with_witness(self.U_polys, witness)
-        self.qap_2 = self.__inner_product_polynomials_with_witness(self.V_polys, witness)
-        self.qap_3 = self.__inner_product_polynomials_with_witness(self.W_polys, witness)
+        self.U_polys = self.__to_polys(self.U_coeffs)
+        self.V_polys = self.__to_polys(self.V_coeffs)
+        self.W_polys = self.__to_polys(self.W_coeffs)
+        self.t = galois.Poly(self.GF(t_coeffs))
 
-        self.t = self.__get_t()
-        self.h = (self.qap_1 * self.qap_2 - self.qap_3) // self.t
+    """
+    The witness' QAP polynomials A(x), B(x) and C(x), i.e. sum(witness_i * poly_i) of U, V and W
+    """
+    def combine(self, witness):
+        if len(witness) != self.L.shape[1]:
+            raise ValueError(f"Witness has {len(witness)} values, the circuit has {self.L.shape[1]} wires")
+        return [self.__combine_with_witness(matrix, witness) for matrix in [self.L, self.R, self.O]]
 
-        self.__print_qap_check()
-    
-    def __interpolate_column(self, col):
-        xs = self.GF(np.arange(1, self.L.shape[0]))
-        return galois.lagrange_poly(xs, col)
-
-    def __get_t(self):
-        t_rows = self.GF(np.arange(1, self.L.shape[0]))
-        t = 1
-        for i in t_rows:
-            t *= galois.Poly([1, self.curve_order - i], field=self.GF)
-        return t
+    """
+    Debug check of a witness: whether t(x) divides A(x)B(x) - C(x),
+    i.e. whether the prover will find a h(x) with A(x)B(x) = C(x) + h(x)t(x)
+    """
+    def check(self, witness):
+        A, B, C = self.combine(witness)
+        return (A * B - C) % self.t == 0
     
-    def __print_qap_check(self):
-        print("QAP formula true?", self.qap_1 * self.qap_2 == self.qap_3 + self.h * self.t)
+    """
+    Interpolates every column of the matrix to a polynomial over the evaluation domain,
+    returns their coefficients (lowest power first) as one column per matrix column,
+    columns without any nonzero entry are zero without interpolating
+    """
+    def __interpolate(self, matrix):
+        nonzero_columns = matrix.nonzero_columns()
+        index = {col: i for i, col in enumerate(nonzero_columns)}
+        entries = [(row, index[col], value) for row, col, value in matrix.triples()]
+
+        coeffs = np.zeros((self.domain.size, matrix.shape[1]), dtype=object)
+        if len(nonzero_columns) > 0:
+            coeffs[:, nonzero_columns] = self.domain.interpolate_sparse(entries, len(nonzero_columns))
+        return coeffs
+
+    def __to_polys(self, coeffs):
+        polys = np.empty(coeffs.shape[1], dtype=object)
+        for col in range(coeffs.shape[1]):
+            if np.any(coeffs[:, col] != 0):
+                polys[col] = self.__to_poly(coeffs[:, col])
+            else:
+                polys[col] = galois.Poly.Zero(field=self.GF)
+        return polys
+
+    def __cache_key(self):
+        return QapCache.key(self.L, self.R, self.O, self.curve_order, self.domain.name)
+
+    def __load_cached(self):
+        if self.cache is False:
+            return None
+        entry = self.cache.get(self.__cache_key(), self.curve_order)
+        if entry is None or entry["domain"] != self.domain.name or len(entry["t"]) != self.domain.size + 1:
+            return None
+        return [np.array(entry[name], dtype=object).reshape(self.domain.size, -1) for name in ["U", "V", "W"]] + [entry["t"]]
+
+    def __store_cached(self, t_coeffs):
+        if self.cache is False:
+            return
+        try:
+            self.cache.put(
+                self.__cache_key(), self.curve_order, self.domain.name,
+                self.U_coeffs.tolist(), self.V_coeffs.tolist(), self.W_coeffs.tolist(), t_coeffs
+            )
+        except OSError as e:
+            # the cache only saves time, a read-only or full disk must not stop the QAP
+            warnings.warn(f"Could not store the QAP in the cache: {e}", RuntimeWarning)
+
+    """
+    sum(witness_i * poly_i) of the matrix' column polynomials.
+    As interpolation is linear, this is the interpolation of the
+    matrix vector product, which only needs the nonzero entries of the matrix
+    """
+    def __combine_with_witness(self, matrix, witness):
+        evaluations = matrix.matvec(witness, self.curve_order)
+        entries = [(row, 0, value) for row, value in enumerate(evaluations) if value != 0]
+        return self.__to_poly(self.domain.interpolate_sparse(entries, 1)[:, 0])
 
-    def __inner_product_polynomials_with_witness(self, polys, witness):
-        mul_ = lambda x, y: x * y
-        sum_ = lambda x, y: x + y
-        return ft.reduce(sum_, map(mul_, polys, witness))
\ No newline at end of file
+    def __to_poly(self, coeffs):
+        return galois.Poly(self.GF(list(coeffs)), order="asc")
@@ -0,0 +1,191 @@
+import hashlib
+import os
+import struct
+import warnings
+
+"""
+Content addressed on-disk cache of interpolated QAPs.
+An entry is keyed by the SHA-256 of the R1CS matrices (their nonzero entries),
+the field modulus and the evaluation domain, and holds the coefficient matrices
+of the U, V and W polynomials and the coefficients of t(x).
+Entries are evicted least recently used first once the cache exceeds max_bytes.
+
+file format (version 1), all integers little-endian:
+header:  magic (4 bytes), format version (u16), 2 bytes padding,
+         field modulus (32 bytes), domain size (u32), number of wires (u32),
+         domain name (16 bytes, ascii, zero padded)
+body:    U, V and W coefficient matrices, domain size rows (lowest power first) times
+         number of wires columns, row major, 32 bytes per coefficient,
+         then the domain size + 1 coefficients of t(x), highest power first
+"""
+
+CACHE_FORMAT_VERSION = 1
+CACHE_MAGIC = b"ZKQC"
+COEFF_BYTES = 32
+
+CACHE_HEADER = struct.Struct("<4sH2x32sII16s")
+
+# default location and size, can be changed with the environment variables
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zk-snark-system", "qap")
+DEFAULT_MAX_BYTES = 2**30
+
+
+def _encode_ints(values):
+    return b"".join(int(value).to_bytes(COEFF_BYTES, "little") for value in values)
+
+def _decode_ints(data):
+    return [int.from_bytes(data[i:i + COEFF_BYTES], "little") for i in range(0, len(data), COEFF_BYTES)]
+
+
+class QapCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    """
+    Cache key of the R1CS (SparseMatrix's, see Sparse.py) with the field modulus and the domain name
+    """
+    @staticmethod
+    def key(L, R, O, modulus, domain_name):
+        digest = hashlib.sha256()
+        digest.update(CACHE_MAGIC + struct.pack("<H", CACHE_FORMAT_VERSION))
+        digest.update(modulus.to_bytes(COEFF_BYTES, "little") + domain_name.encode("ascii"))
+        for matrix in [L, R, O]:
+            digest.update(struct.pack("<QQ", *matrix.shape))
+            for row, col, value in sorted(matrix.triples()):
+                digest.update(struct.pack("<QQ", row, col) + value.to_bytes(COEFF_BYTES, "little"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".qap")
+
+    """
+    Returns the entry {"U", "V", "W": lists of rows of coefficients, "t": coefficients, "domain": name}
+    or None if there is none (or it's unreadable, then it's removed).
+    The cache only saves time, so errors of the file system are a miss with a RuntimeWarning
+    """
+    def get(self, key, modulus):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            warnings.warn(f"Could not read the QAP cache: {e}", RuntimeWarning)
+            return None
+
+        try:
+            entry = self.__decode(data, modulus)
+        except ValueError:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                warnings.warn(f"Could not remove the broken QAP cache entry: {e}", RuntimeWarning)
+            return None
+
+        # the modification time is the recency of the LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process since it was read, the entry read is still valid
+            pass
+        except OSError as e:
+            warnings.warn(f"Could not update the QAP cache entry's recency: {e}", RuntimeWarning)
+        return entry
+
+    """
+    Stores the coefficient matrices (lists of rows, domain size x number of wires)
+    and t's coefficients, then evicts the least recently used entries beyond max_bytes
+    """
+    def put(self, key, modulus, domain_name, U, V, W, t):
+        os.makedirs(self.directory, exist_ok=True)
+        size, num_wires = len(U), len(U[0]) if len(U) > 0 else 0
+
+        parts = [CACHE_HEADER.pack(
+            CACHE_MAGIC, CACHE_FORMAT_VERSION, modulus.to_bytes(COEFF_BYTES, "little"),
+            size, num_wires, domain_name.encode("ascii")
+        )]
+        for matrix in [U, V, W]:
+            parts.append(_encode_ints(value for row in matrix for value in row))
+        parts.append(_encode_ints(t))
+
+        # written under a temporary name, so readers never see half an entry
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.replace(tmp_path, path)
+
+        self.evict(keep=path)
+
+    """
+    Removes the least recently used entries until the cache fits into max_bytes,
+    the entry at keep is only removed if it alone exceeds max_bytes
+    """
+    def evict(self, keep=None):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".qap"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    # removed by another process meanwhile
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep and total - size > 0:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".qap"):
+                    os.remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def __decode(data, modulus):
+        if len(data) < CACHE_HEADER.size:
+            raise ValueError("Cache entry too short")
+        magic, version, raw_modulus, size, num_wires, raw_name = CACHE_HEADER.unpack_from(data, 0)
+        if magic != CACHE_MAGIC or version != CACHE_FORMAT_VERSION:
+            raise ValueError("Not a cache entry of this format version")
+        if int.from_bytes(raw_modulus, "little") != modulus:
+            raise ValueError("Cache entry of another field")
+
+        matrix_bytes = size * num_wires * COEFF_BYTES
+        if len(data) != CACHE_HEADER.size + 3 * matrix_bytes + (size + 1) * COEFF_BYTES:
+            raise ValueError("Cache entry has the wrong size")
+
+        entry = {"domain": raw_name.rstrip(b"\0").decode("ascii")}
+        offset = CACHE_HEADER.size
+        for name in ["U", "V", "W"]:
+            values = _decode_ints(data[offset:offset + matrix_bytes])
+            entry[name] = [values[row * num_wires:(row + 1) * num_wires] for row in range(size)]
+            offset += matrix_bytes
+        entry["t"] = _decode_ints(data[offset:])
+        return entry
+
+
+"""
+The cache QAP uses unless told otherwise, in ZK_QAP_CACHE_DIR (limited to ZK_QAP_CACHE_MAX_BYTES)
+or ~/.cache/zk-snark-system/qap
+"""
+def default_cache():
+    return QapCache(
+        os.environ.get("ZK_QAP_CACHE_DIR", DEFAULT_CACHE_DIR),
+        int(os.environ.get("ZK_QAP_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    )
@@ -1,12 +1,67 @@
-from py_ecc.bn128 import G1, G2, multiply, curve_order
+from py_ecc.bn128 import G1, G2, curve_order
 import numpy as np
+import hashlib
+import json
+import os
 import random
-import galois
 
-class Setup:
-    # finite field over which G1, G2 and G12 are defined
-    GF = galois.GF(curve_order)
+from Curve import default_backend
+from FixedBase import FixedBaseTable, fixed_base_window
+from Domain import IntegerDomain
+from Field import FieldArray
+from Keys import KeyWriter, ProvingKey
+
+"""
+Returns a random interger between zero and the G1/G2-curve order (exclusive)
+"""
+def _random_scalar():
+    return random.randint(1, curve_order - 1) # Must not be 0
+
+"""
+The fixed-base tables of G1 and G2 for all points of a setup with n constraints and m wires,
+their windows picked from the number of points (at most max_window wide) if table_window isn't given
+"""
+def _build_tables(backend, n, m, table_window=None, max_window=None):
+    def window(num_points):
+        if table_window is not None:
+            return table_window
+        if max_window is not None:
+            return fixed_base_window(num_points, max_window=max_window)
+        return fixed_base_window(num_points)
+
+    g1_table = FixedBaseTable(backend.g1, G1, window(2 * n + 3 * m + 1))
+    g2_table = FixedBaseTable(backend.g2, G2, window(n + m + 1))
+    return g1_table, g2_table
+
+"""
+Number of coefficients of the longest polynomial, as galois removes leading zero-coefficients
+"""
+def _num_coeffs(polys):
+    return max([1] + [len(poly.coeffs) for poly in polys])
 
+"""
+Coefficients (lowest power first) of the polynomials as rows of num_coeffs python ints,
+rows of shorter polynomials padded with zeros
+"""
+def _coeff_matrix(polys, num_coeffs):
+    coeffs = np.zeros((len(polys), num_coeffs), dtype=object)
+    for i, poly in enumerate(polys):
+        poly_coeffs = poly.coeffs.view(np.ndarray)[::-1]
+        coeffs[i, :len(poly_coeffs)] = poly_coeffs
+    return coeffs
+
+"""
+The scalars of the psi_i = (alpha * v_i(tau) + beta * u_i(tau) + w_i(tau))G_1
+from the evaluations of the left (u), right (v) and out (w) polynomials
+"""
+def _psi_scalars(alpha, beta, left_evals, right_evals, out_evals):
+    return [
+        (alpha * val_right + beta * val_left + val_out) % curve_order
+        for val_left, val_right, val_out in zip(left_evals, right_evals, out_evals)
+    ]
+
+
+class Setup:
     """
     Takes the R1CS as a already interpolated QAP (2d array of coefficients)
     to construct the trusted setup
@@ -19,95 +74,116 @@ class Setup:
         right_polys: np.ndarray, # polynomials of the right factor of the qap,
         tau=None, # for determinstic tesing
         alpha=None, # for determinstic tesing
-        beta=None # for determinstic tesing
+        beta=None, # for determinstic tesing
+        backend=None, # curve arithmetic backend (see Curve.py), py_ecc if not given
+        table_window=None, # window width of the fixed-base tables, picked from the circuit size if not given
+        domain=None, # evaluation domain of the QAP (see Domain.py), x = 1..n if not given
+        coeffs=None, # coefficient matrices [left, right, out] of the polynomials as QAP.U_coeffs etc., read from the polynomials if not given
+        timer=None # called as timer(phase, fn, *args) for every phase, must return fn(*args), e.g. to time them (see bench/bench_suite.py)
     ):
         self.out_polys = out_polys
         self.left_polys = left_polys
         self.right_polys = right_polys
+        self.coeffs = coeffs
+        self.backend = backend if backend is not None else default_backend
+        self.timer = timer
         
         ### to be kept private
         # for powers of tau
         
-        self.tau = tau if tau is not None else self.__get_random_scalar()
-        self.tau_GF = self.GF(self.tau)
+        self.tau = tau if tau is not None else _random_scalar()
 
         # for multiplication with the QAP matrices
-        self.alpha = alpha if alpha is not None else self.__get_random_scalar()
-        self.beta = beta if beta is not None else self.__get_random_scalar()
+        self.alpha = alpha if alpha is not None else _random_scalar()
+        self.beta = beta if beta is not None else _random_scalar()
         ###
 
         self.num_polys = len(self.out_polys)
-        
-        # as galois removes zero-coefficients in their poly type,
-        # we must go through all of them to find the maximal degree
-        max_coeff = 1
-        for poly_array in [self.out_polys, self.left_polys, self.right_polys]:
-            for poly in poly_array:
-                max_coeff = max(max_coeff, len(poly.coeffs))
-        
-        self.num_constraints = max_coeff
+
+        # as galois removes leading zero-coefficients in their poly type,
+        # the matrix is as wide as the longest polynomial, which gives the degree without a domain
+        qap_coeffs = self.__phase("qap_coeffs", self.__qap_coeff_matrix)
+        self.num_constraints = domain.size if domain is not None else qap_coeffs.shape[1]
+        self.domain = domain if domain is not None else IntegerDomain(self.num_constraints)
         self.poly_degree = self.num_constraints - 1
 
+        # tau^0 .. tau^(n-1), shared by the srs's, t(tau) * tau^i and the QAP evaluation
+        self.tau_powers = self.__phase("tau_powers", self.__get_tau_powers)
+
+        # all G1 and G2 points of the setup are multiples of the generators,
+        # so one precomputed table per generator serves all of them
+        self.g1_table, self.g2_table = self.__phase(
+            "tables", _build_tables, self.backend, self.num_constraints, self.num_polys, table_window
+        )
+
+        self.g1_srs = self.__phase("g1_srs", self.__get_srs, self.g1_table)
+        self.g2_srs = self.__phase("g2_srs", self.__get_srs, self.g2_table)
+
+        self.alpha_g1, self.beta_g1 = self.__phase("alpha_beta_g1", self.g1_table.multiply_all, [self.alpha, self.beta])
+        [self.beta_g2] = self.__phase("beta_g2", self.g2_table.multiply_all, [self.beta])
 
-        self.g1_srs = self.__get_srs(G1)
-        self.g2_srs = self.__get_srs(G2)
+        t_tau_scalars = self.__phase("t_tau", self.__get_t_tau_scalars)
+        self.t_tau_srs = self.__phase("t_tau_srs", self.g1_table.multiply_all, t_tau_scalars)
 
-        self.alpha_g1 = multiply(G1, self.alpha)
-        self.beta_g1 = multiply(G1, self.beta)
-        self.beta_g2 = multiply(G2, self.beta)
+        left_evals, right_evals, out_evals = self.__phase("qap_eval", self.__evaluate_qap_polys, qap_coeffs)
+        psi_scalars = self.__phase("psi_scalars", _psi_scalars, self.alpha, self.beta, left_evals, right_evals, out_evals)
+        self.psis = self.__phase("psis", self.g1_table.multiply_all, psi_scalars)
 
-        self.t_tau_srs = self.__build_aux_poly()
-        self.psis = self.__evaluate_qap_polys()
+        # per wire query points, so the prover gets [A]_1 and [B]_2 with one MSM over the witness
+        self.a_query_g1 = self.__phase("a_query_g1", self.g1_table.multiply_all, left_evals)
+        self.b_query_g1 = self.__phase("b_query_g1", self.g1_table.multiply_all, right_evals)
+        self.b_query_g2 = self.__phase("b_query_g2", self.g2_table.multiply_all, right_evals)
+
+    def __phase(self, name, fn, *args):
+        if self.timer is None:
+            return fn(*args)
+        return self.timer(name, fn, *args)
+
+    def __get_tau_powers(self):
+        tau_powers = [1]
+        for _ in range(self.num_constraints - 1):
+            tau_powers.append((tau_powers[-1] * self.tau) % curve_order)
+        return tau_powers
 
     """
     Calulates the structure reference string; powers of tau in a elliptic curve group
-    Needs to be passed the max polynomial degree of the QAP,
-    to calculate enough powers of tau
+    Needs to be passed the fixed-base table of the group's generator
     """
-    def __get_srs(self, generator):
-        return [
-            multiply(generator, int(pow(self.tau, i, curve_order)))
-            for i in range(self.num_constraints - 1,-1,-1)
-        ]
+    def __get_srs(self, table):
+        return table.multiply_all(self.tau_powers[::-1])
 
     """
-    Calculates t(tau) for the auxilary polynomial t(x) = (x-1)(x-2)...(x-n)
-    and returns the srs for it
+    Calculates t(tau) for the auxilary polynomial of the domain,
+    e.g. t(x) = (x-1)(x-2)...(x-n), and returns the scalars t(tau) * tau^i of its srs
     """
-    def __build_aux_poly(self):
-        t_xs = self.GF(np.arange(1, self.num_constraints + 1))
-        t_tau_GF = np.prod(self.tau_GF - t_xs)
+    def __get_t_tau_scalars(self):
+        t_tau = self.domain.vanishing_at(self.tau)
 
         return [
-            multiply(G1, int((self.tau_GF**i) * t_tau_GF))
-            for i in range(self.num_constraints - 2, -1, -1)
+            (tau_power * t_tau) % curve_order
+            for tau_power in self.tau_powers[:self.num_constraints - 1][::-1]
         ]
 
     """
-    Evaluates the QAP's polynomials at tau and constructs
-    their linear combination as corresponding G1 curve point row wise
-    G1(alpha * left_poly_i(tau) + beta * left_poly_i(tau) + out_poly_i(tau))
+    Stacks the coefficients (lowest power first) of all left, right and out polynomials
+    into one matrix with a row per polynomial, rows of shorter polynomials padded with zeros.
+    Given coefficient matrices (one column per polynomial) are just transposed and stacked
     """
-    def __evaluate_qap_polys(self):
-        psis = []
-        
-        for i in range(self.num_polys):
-            
-            
-            val_left = self.__poly_eval_mod(self.left_polys[i], self.tau, curve_order)
-            val_right = self.__poly_eval_mod(self.right_polys[i], self.tau, curve_order)
-            val_out = self.__poly_eval_mod(self.out_polys[i], self.tau, curve_order)
-            
-            # Psi_i = (alph*v_i(tau) + beta*u_i(tau) + w_i(tau))G_1
-            combined = (
-                self.alpha * val_right +
-                self.beta * val_left +
-                val_out
-            ) % curve_order
-            
-            psis.append(multiply(G1, combined))
-        
-        return psis
+    def __qap_coeff_matrix(self):
+        if self.coeffs is not None:
+            return FieldArray.from_ints(np.concatenate([np.asarray(coeffs, dtype=object).T for coeffs in self.coeffs]))
+
+        polys = [poly for polys in [self.left_polys, self.right_polys, self.out_polys] for poly in polys]
+        return FieldArray.from_ints(_coeff_matrix(polys, _num_coeffs(polys)))
+
+    """
+    Evaluates the QAP's polynomials at tau as one matrix vector product
+    of their coefficient matrix with the powers of tau,
+    returns the lists u_i(tau), v_i(tau) and w_i(tau) (left, right and out)
+    """
+    def __evaluate_qap_polys(self, qap_coeffs):
+        evals = qap_coeffs.matvec(self.tau_powers[:qap_coeffs.shape[1]]).to_ints().tolist()
+        return [evals[i * self.num_polys:(i + 1) * self.num_polys] for i in range(3)]
 
     """
     Returns the necesarry parts of the setup for prover and verifier as dict
@@ -121,22 +197,225 @@ class Setup:
             "g2_srs": self.g2_srs,
             "t_tau_srs": self.t_tau_srs,
             "psis": self.psis,
+            "a_query_g1": self.a_query_g1,
+            "b_query_g1": self.b_query_g1,
+            "b_query_g2": self.b_query_g2,
+        }
+
+
+"""
+Setup for circuits too large to hold the whole proving key in memory:
+the points are computed in chunks of chunk_size and every chunk is written
+directly into a proving key file (see Keys.py), so only the fixed-base tables
+and one chunk are in memory at a time.
+The progress is recorded next to the key file (path + ".progress"), so an interrupted
+setup is resumed from the last completed chunk by calling write_key with the same path.
+The progress file holds tau, alpha and beta until the key is finished and must be
+kept as secret as the setup itself, it's deleted when the key is complete
+"""
+class StreamingSetup:
+    # scalar field elements per batch when evaluating the QAP polynomials (64 bytes each)
+    EVAL_BATCH_ELEMENTS = 2**20
+    # the fixed-base tables hold about 2^w * 254 / w points, their window would otherwise grow with the circuit
+    MAX_TABLE_WINDOW = 10
+
+    def __init__(
+        self,
+        out_polys: np.ndarray,
+        left_polys: np.ndarray,
+        right_polys: np.ndarray,
+        tau=None, # for determinstic tesing
+        alpha=None, # for determinstic tesing
+        beta=None, # for determinstic tesing
+        backend=None, # curve arithmetic backend (see Curve.py), py_ecc if not given
+        table_window=None, # window width of the fixed-base tables, picked from the circuit size if not given
+        domain=None, # evaluation domain of the QAP (see Domain.py), x = 1..n if not given
+        chunk_size=1024 # points computed and written at once
+    ):
+        self.out_polys = out_polys
+        self.left_polys = left_polys
+        self.right_polys = right_polys
+        self.backend = backend if backend is not None else default_backend
+        self.table_window = table_window
+        self.chunk_size = chunk_size
+
+        self.tau = tau
+        self.alpha = alpha
+        self.beta = beta
+
+        self.num_polys = len(self.out_polys)
+        # galois strips leading zero-coefficients, the longest polynomial gives the degree
+        self.num_coeffs = _num_coeffs([poly for polys in self.__qap_polys() for poly in polys])
+        self.num_constraints = domain.size if domain is not None else self.num_coeffs
+        self.domain = domain if domain is not None else IntegerDomain(self.num_constraints)
+
+    """
+    Computes the setup into a proving key file at path, resuming it if a progress file is found.
+    progress is called with (chunks done, number of chunks) after every chunk.
+    The progress file (path + ".progress") holds the toxic waste tau, alpha and beta in plain text,
+    anyone who can read it can forge proofs: it's only readable by its owner (mode 0600),
+    is deleted once the key is complete and must be deleted by hand if a setup is abandoned.
+    Returns the loaded proving key
+    """
+    def write_key(self, path, progress=None):
+        progress_path = path + ".progress"
+        state = self.__load_progress(progress_path)
+        if state is not None and not os.path.exists(path):
+            # the key file is gone, only the secrets of the progress are reused
+            state["done"] = []
+        resume = state is not None and os.path.exists(path)
+        if state is None:
+            state = {
+                "circuit": self.__circuit_hash(),
+                "tau": str(self.tau if self.tau is not None else _random_scalar()),
+                "alpha": str(self.alpha if self.alpha is not None else _random_scalar()),
+                "beta": str(self.beta if self.beta is not None else _random_scalar()),
+                "done": [],
+            }
+
+        self.tau, self.alpha, self.beta = [int(state[name]) for name in ["tau", "alpha", "beta"]]
+        n, m = self.num_constraints, self.num_polys
+        counts = {
+            "alpha_g1": 1, "beta_g1": 1, "beta_g2": 1,
+            "g1_srs": n, "g2_srs": n, "t_tau_srs": n - 1,
+            "psis": m, "a_query_g1": m, "b_query_g1": m, "b_query_g2": m,
         }
-    
+
+        with KeyWriter(ProvingKey, path, counts, resume=resume) as writer:
+            self.__save_progress(progress_path, state)
+            self.__build_tables()
+            self.t_tau = self.domain.vanishing_at(self.tau)
+
+            jobs = self.__jobs()
+            done = set(state["done"])
+            for i, (job_id, job) in enumerate(jobs):
+                if job_id not in done:
+                    for name, start, points in job():
+                        writer.write(name, start, points)
+                    # the chunk is on disk before it's recorded as done
+                    writer.flush()
+                    state["done"].append(job_id)
+                    self.__save_progress(progress_path, state)
+                if progress is not None:
+                    progress(i + 1, len(jobs))
+
+            writer.finish()
+
+        os.remove(progress_path)
+        return ProvingKey.load(path)
+
     """
-    Horner's polynomial evaluation algorithm with modular arithmetic
+    The chunks of the setup as (id, job) pairs, a job returns (section, start, points) writes
     """
-    @staticmethod
-    def __poly_eval_mod(poly_obj, x, mod):
-        coeffs = poly_obj.coeffs
-        
-        res = 0
-        for coeff in coeffs:
-            res = (res * x + int(coeff)) % mod
-        return res
+    def __jobs(self):
+        n, m = self.num_constraints, self.num_polys
+        jobs = [("points", self.__single_points)]
+        for name, count in [("g1_srs", n), ("g2_srs", n), ("t_tau_srs", n - 1), ("wires", m)]:
+            for start in range(0, count, self.chunk_size):
+                stop = min(start + self.chunk_size, count)
+                job = {
+                    "g1_srs": lambda start=start, stop=stop: self.__srs_chunk("g1_srs", self.g1_table, start, stop),
+                    "g2_srs": lambda start=start, stop=stop: self.__srs_chunk("g2_srs", self.g2_table, start, stop),
+                    "t_tau_srs": lambda start=start, stop=stop: self.__t_tau_chunk(start, stop),
+                    "wires": lambda start=start, stop=stop: self.__wires_chunk(start, stop),
+                }[name]
+                jobs.append((f"{name}:{start}", job))
+        return jobs
+
+    def __single_points(self):
+        alpha_g1, beta_g1 = self.g1_table.multiply_all([self.alpha, self.beta])
+        [beta_g2] = self.g2_table.multiply_all([self.beta])
+        return [("alpha_g1", 0, [alpha_g1]), ("beta_g1", 0, [beta_g1]), ("beta_g2", 0, [beta_g2])]
+
+    """
+    Points start .. stop - 1 of an srs, highest power of tau first
+    """
+    def __srs_chunk(self, name, table, start, stop):
+        return [(name, start, table.multiply_all(self.__tau_powers_desc(self.num_constraints - 1, start, stop)))]
+
+    def __t_tau_chunk(self, start, stop):
+        powers = self.__tau_powers_desc(self.num_constraints - 2, start, stop)
+        return [("t_tau_srs", start, self.g1_table.multiply_all([(power * self.t_tau) % curve_order for power in powers]))]
+
+    """
+    tau^(top - start) down to tau^(top - stop + 1)
+    """
+    def __tau_powers_desc(self, top, start, stop):
+        powers = [pow(self.tau, top - stop + 1, curve_order)]
+        for _ in range(stop - start - 1):
+            powers.append((powers[-1] * self.tau) % curve_order)
+        return powers[::-1]
+
+    """
+    The per wire points psi_i, [u_i(tau)]_1, [v_i(tau)]_1 and [v_i(tau)]_2 of wires start .. stop - 1
+    """
+    def __wires_chunk(self, start, stop):
+        left_evals, right_evals, out_evals = [self.__evaluate(polys[start:stop]) for polys in self.__qap_polys()]
+        psi_scalars = _psi_scalars(self.alpha, self.beta, left_evals, right_evals, out_evals)
+        return [
+            ("psis", start, self.g1_table.multiply_all(psi_scalars)),
+            ("a_query_g1", start, self.g1_table.multiply_all(left_evals)),
+            ("b_query_g1", start, self.g1_table.multiply_all(right_evals)),
+            ("b_query_g2", start, self.g2_table.multiply_all(right_evals)),
+        ]
+
+    """
+    Evaluates the polynomials at tau, in batches of rows of a coefficient matrix (see Field.py)
+    """
+    def __evaluate(self, polys):
+        rows_per_batch = max(1, self.EVAL_BATCH_ELEMENTS // self.num_coeffs)
+        evals = []
+        for batch_start in range(0, len(polys), rows_per_batch):
+            batch = polys[batch_start:batch_start + rows_per_batch]
+            coeffs = _coeff_matrix(batch, self.num_coeffs)
+            evals += FieldArray.from_ints(coeffs).evaluate(self.tau).to_ints().tolist()
+        return evals
+
+    def __build_tables(self):
+        self.g1_table, self.g2_table = _build_tables(
+            self.backend, self.num_constraints, self.num_polys, self.table_window, max_window=self.MAX_TABLE_WINDOW
+        )
+
+    def __qap_polys(self):
+        return [self.left_polys, self.right_polys, self.out_polys]
+
+    """
+    Fingerprint of the circuit, domain and chunking, so a progress file is only resumed for the same setup
+    """
+    def __circuit_hash(self):
+        digest = hashlib.sha256()
+        digest.update(f"{self.domain.name}:{self.num_constraints}:{self.num_polys}:{self.chunk_size}".encode())
+        for polys in self.__qap_polys():
+            for poly in polys:
+                digest.update(b";" + ",".join(str(int(c)) for c in poly.coeffs).encode())
+        return digest.hexdigest()
+
+    def __load_progress(self, progress_path):
+        if not os.path.exists(progress_path):
+            return None
+        with open(progress_path) as f:
+            state = json.load(f)
+        if state["circuit"] != self.__circuit_hash():
+            raise ValueError(f"{progress_path} belongs to the setup of another circuit or chunk size")
+        for name in ["tau", "alpha", "beta"]:
+            value = getattr(self, name)
+            if value is not None and int(state[name]) != value:
+                raise ValueError(f"{progress_path} was started with another {name}")
+        return state
+
     """
-    Returns a random interger between zero and the G1/G2-curve order (exclusive)
+    Replaces the progress file atomically, so an interruption never leaves it half written.
+    It's created readable by its owner only, as it holds the secrets of the setup
     """
     @staticmethod
-    def __get_random_scalar():
-        return random.randint(1, curve_order - 1) # Must not be 0
\ No newline at end of file
+    def __save_progress(progress_path, state):
+        tmp_path = progress_path + ".tmp"
+        if os.path.exists(tmp_path):
+            # left over by an interruption, possibly with a wider mode, which os.open keeps
+            os.remove(tmp_path)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, progress_path)
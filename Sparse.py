@@ -0,0 +1,131 @@
+import numpy as np
+
+"""
+Sparse representation of a R1CS matrix, storing only the nonzero entries column wise.
+Can be built from a dense NumPy array, a list of (row, col, value) triples
+or a CSR/COO matrix (anything with tocoo(), e.g. from scipy.sparse,
+or with row/col/data resp. indptr/indices/data arrays)
+"""
+class SparseMatrix:
+
+    """
+    Takes the shape (rows, cols) and a dict col -> {row: value},
+    values must already be reduced modulo the field order and nonzero
+    """
+    def __init__(self, shape, columns):
+        self.shape = tuple(shape)
+        self.columns = columns
+
+    """
+    Converts any of the supported input formats, reducing all values modulo the field order.
+    Duplicate entries of triples/COO input are summed up.
+    The shape is taken from the input if it has one, otherwise it must be given
+    or is derived from the largest indices
+    """
+    @classmethod
+    def from_any(cls, matrix, modulus, shape=None):
+        if isinstance(matrix, SparseMatrix):
+            return matrix
+
+        if isinstance(matrix, np.ndarray):
+            return cls.from_dense(matrix, modulus)
+
+        if hasattr(matrix, "tocoo"):
+            shape = matrix.shape
+            matrix = matrix.tocoo()
+
+        if hasattr(matrix, "row") and hasattr(matrix, "col") and hasattr(matrix, "data"):
+            triples = zip(matrix.row, matrix.col, matrix.data)
+            shape = shape if shape is not None else getattr(matrix, "shape", None)
+        elif hasattr(matrix, "indptr") and hasattr(matrix, "indices") and hasattr(matrix, "data"):
+            triples = cls.__csr_triples(matrix.indptr, matrix.indices, matrix.data)
+            shape = shape if shape is not None else getattr(matrix, "shape", None)
+        else:
+            triples = matrix
+
+        return cls.from_triples(triples, modulus, shape)
+
+    @classmethod
+    def from_dense(cls, matrix, modulus):
+        matrix = np.array(matrix, dtype=object) % modulus
+        columns = {}
+        for row, col in zip(*np.nonzero(matrix)):
+            columns.setdefault(int(col), {})[int(row)] = int(matrix[row, col])
+        return cls(matrix.shape, columns)
+
+    @classmethod
+    def from_triples(cls, triples, modulus, shape=None):
+        columns = {}
+        num_rows = num_cols = 0
+        for row, col, value in triples:
+            row, col = int(row), int(col)
+            num_rows = max(num_rows, row + 1)
+            num_cols = max(num_cols, col + 1)
+
+            column = columns.setdefault(col, {})
+            column[row] = (column.get(row, 0) + int(value)) % modulus
+
+        # drop entries that are zero (or summed up to zero)
+        columns = {
+            col: {row: value for row, value in column.items() if value != 0}
+            for col, column in columns.items()
+        }
+        columns = {col: column for col, column in columns.items() if len(column) > 0}
+
+        if shape is None:
+            shape = (num_rows, num_cols)
+        elif num_rows > shape[0] or num_cols > shape[1]:
+            raise ValueError(f"Entry at ({num_rows - 1}, {num_cols - 1}) is outside of the shape {shape}")
+
+        return cls(shape, columns)
+
+    @staticmethod
+    def __csr_triples(indptr, indices, data):
+        for row in range(len(indptr) - 1):
+            for k in range(indptr[row], indptr[row + 1]):
+                yield row, indices[k], data[k]
+
+    """
+    Returns a copy with (at least) the given shape, e.g. to pad it with zero rows
+    """
+    def resized(self, shape):
+        if shape[0] < self.shape[0] or shape[1] < self.shape[1]:
+            raise ValueError(f"Can not shrink matrix of shape {self.shape} to {shape}")
+        return SparseMatrix(shape, self.columns)
+
+    @property
+    def nnz(self):
+        return sum(len(column) for column in self.columns.values())
+
+    """
+    Indices of all columns with at least one nonzero entry, ascending
+    """
+    def nonzero_columns(self):
+        return sorted(self.columns)
+
+    """
+    All nonzero entries as (row, col, value) triples
+    """
+    def triples(self):
+        for col, column in self.columns.items():
+            for row, value in column.items():
+                yield row, col, value
+
+    """
+    Matrix vector product modulo the field order, as list of python ints
+    """
+    def matvec(self, vector, modulus):
+        res = [0] * self.shape[0]
+        for col, column in self.columns.items():
+            factor = int(vector[col])
+            if factor == 0:
+                continue
+            for row, value in column.items():
+                res[row] += value * factor
+        return [value % modulus for value in res]
+
+    def to_dense(self):
+        dense = np.zeros(self.shape, dtype=object)
+        for row, col, value in self.triples():
+            dense[row, col] = value
+        return dense
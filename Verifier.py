@@ -1,32 +1,141 @@
-from py_ecc.bn128 import pairing, G2
+from py_ecc.bn128 import G2, multiply, neg, is_on_curve, b, b2
+import secrets
+
+from Msm import msm
+from Pairing import miller_loop, final_exponentiate, g2_lines, multi_pairing_check
+
+"""
+The parts of the verification that only depend on the setup, computed once and reused for every proof:
+e(alpha_1, beta_2) and the Miller loop lines of the fixed G2 points G2 and beta_2
+"""
+class PreparedVerificationKey:
+    def __init__(self, alpha_1, beta_2):
+        if not is_on_curve(alpha_1, b) or not is_on_curve(beta_2, b2):
+            raise ValueError("Invalid verification key - point is not on the curve")
+
+        self.alpha_1 = alpha_1
+        self.beta_2 = beta_2
+
+        self.g2_lines = g2_lines(G2)
+        self.beta_lines = g2_lines(beta_2)
+        self.alpha_beta = final_exponentiate(miller_loop([(alpha_1, self.beta_lines)]))
+
+    """
+    Prepares a VerificationKey (or ProvingKey) of Keys.py
+    """
+    @classmethod
+    def from_key(cls, key):
+        return cls(key.alpha_g1, key.beta_g2)
 
 """
 Takes as input the A, B and C points (aka the proof) from the prover
-and the alpha and beta curve points from the setup
+and the alpha and beta curve points from the setup,
+or instead of them the PreparedVerificationKey of the setup
 """
 class Verifier:
     def __init__(self,
         A,
         B,
         C,
-        alpha_1,
-        beta_2
+        alpha_1 = None,
+        beta_2 = None,
+        prepared_key = None # PreparedVerificationKey, saves preparing alpha_1 and beta_2 per proof
     ):
         self.A = A
         self.B = B
         self.C = C
+
+        self.prepared_key = prepared_key
+        if prepared_key is not None:
+            alpha_1, beta_2 = prepared_key.alpha_1, prepared_key.beta_2
         self.alpha_1 = alpha_1
         self.beta_2 = beta_2
 
         self.isValid = self.verify()
 
     """
-    Builds both sides of the verifing equation and checks if they're equal
+    Checks e(A, B) == e(alpha_1, beta_2) * e(C, G2).
+    With a prepared key as e(A, B) * e(-C, G2) == e(alpha_1, beta_2) against the cached right hand side,
+    otherwise as e(A, B) * e(-C, G2) * e(-alpha_1, beta_2) == 1.
+    Either way all Miller loops share a single final exponentiation
     """
     def verify(self):
-        left = pairing(self.B, self.A)
+        if self.prepared_key is None:
+            return multi_pairing_check([
+                (self.A, self.B),
+                (neg(self.C), G2),
+                (neg(self.alpha_1), self.beta_2),
+            ])
+
+        left = final_exponentiate(miller_loop([
+            (self.A, self.B),
+            (neg(self.C), self.prepared_key.g2_lines),
+        ]))
 
-        right_1 = pairing(self.beta_2, self.alpha_1)
-        right_2 = pairing(G2, self.C)
+        return left == self.prepared_key.alpha_beta
+
+
+"""
+Verifies many proofs (dicts with the A, B and C points, as returned by Prover.get_proof)
+under the same setup at once. With random scalars r_i the proofs are combined to
+prod e(r_i * A_i, B_i) == e(sum(r_i) * alpha_1, beta_2) * e(sum(r_i * C_i), G2),
+checked as one product of Miller loops with a single final exponentiation.
+An invalid proof lets the batch fail except with probability about 2^-128,
+the proofs are then verified one by one to find the invalid ones
+"""
+class BatchVerifier:
+    RANDOMIZER_BITS = 128
 
-        return left == right_1 * right_2
\ No newline at end of file
+    def __init__(self,
+        proofs,
+        alpha_1 = None,
+        beta_2 = None,
+        prepared_key = None
+    ):
+        self.proofs = proofs
+
+        if prepared_key is None:
+            prepared_key = PreparedVerificationKey(alpha_1, beta_2)
+        self.prepared_key = prepared_key
+
+        self.isValid = self.verify()
+        # validity per proof
+        self.results = [True] * len(proofs) if self.isValid else self.__verify_each()
+
+    """
+    Checks the randomized combination of all proofs
+    """
+    def verify(self):
+        if len(self.proofs) == 0:
+            return True
+
+        randomizers = [secrets.randbelow(2**self.RANDOMIZER_BITS - 1) + 1 for _ in self.proofs]
+
+        pairs = [
+            (multiply(proof["A"], r), proof["B"])
+            for proof, r in zip(self.proofs, randomizers)
+        ]
+        # move the right hand side over, so the product must be 1
+        pairs.append((neg(multiply(self.prepared_key.alpha_1, sum(randomizers))), self.prepared_key.beta_lines))
+        pairs.append((neg(msm([proof["C"] for proof in self.proofs], randomizers)), self.prepared_key.g2_lines))
+
+        try:
+            return multi_pairing_check(pairs)
+        except ValueError:
+            # a point is not on the curve
+            return False
+
+    def __verify_each(self):
+        results = []
+        for proof in self.proofs:
+            try:
+                results.append(Verifier(proof["A"], proof["B"], proof["C"], prepared_key=self.prepared_key).isValid)
+            except ValueError:
+                results.append(False)
+        return results
+
+    """
+    Indices of the proofs that failed verification
+    """
+    def invalid_proofs(self):
+        return [i for i, valid in enumerate(self.results) if not valid]
\ No newline at end of file
@@ -0,0 +1,76 @@
+import argparse
+import time
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from Setup import Setup
+from Prover import Prover, CircuitProver
+from Curve import JacobianBackend
+from bench_sparse import chain_circuit
+from bench_service import chain_witness
+
+"""
+Time per proof for many witnesses of the chain circuit (roots of unity domain, coset h mode):
+a new Prover per witness, a CircuitProver proving them one by one and prove_batch in batches.
+The first batch also computes the shifted srs points of the batch MSMs, which all further
+batches reuse, so it's reported separately
+"""
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log-n", type=int, default=7)
+    parser.add_argument("--witnesses", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--skip-loop", action="store_true", help="skip the one-by-one flows")
+    args = parser.parse_args()
+
+    backend = JacobianBackend()
+    n = 2**args.log_n
+    L, R, O, _ = chain_circuit(n)
+    qap = QAP(L, R, O, curve_order, domain="roots", cache=False)
+    setup_data = Setup(qap.W_polys, qap.U_polys, qap.V_polys, backend=backend, domain=qap.domain).get_setup()
+    witnesses = [chain_witness(n, start) for start in range(2, args.witnesses + 2)]
+
+    setup_args = [qap.U_polys, qap.V_polys, qap.W_polys] + [
+        setup_data[name] for name in ["alpha_g1", "beta_g2", "g1_srs", "g2_srs", "t_tau_srs", "psis"]
+    ]
+    kwargs = {
+        "a_query_g1": setup_data["a_query_g1"], "b_query_g2": setup_data["b_query_g2"],
+        "backend": backend, "domain": qap.domain, "h_mode": "coset"
+    }
+
+    print(f"--- n = {n}, {args.witnesses} witnesses, batches of {args.batch_size} ---")
+    print(f"{'flow':>24} {'per proof [s]':>14}")
+
+    if not args.skip_loop:
+        start = time.perf_counter()
+        one_shot = [Prover(witness, *setup_args, **kwargs).get_proof() for witness in witnesses]
+        print(f"{'Prover per witness':>24} {(time.perf_counter() - start) / len(witnesses):>14.3f}")
+
+        circuit_prover = CircuitProver(*setup_args, **kwargs)
+        start = time.perf_counter()
+        looped = [circuit_prover.prove(witness) for witness in witnesses]
+        print(f"{'CircuitProver.prove':>24} {(time.perf_counter() - start) / len(witnesses):>14.3f}")
+        assert looped == one_shot
+
+    circuit_prover = CircuitProver(*setup_args, **kwargs)
+    batches = [witnesses[i:i + args.batch_size] for i in range(0, len(witnesses), args.batch_size)]
+    proofs = []
+    for i, batch in enumerate(batches):
+        start = time.perf_counter()
+        proofs += circuit_prover.prove_batch(batch)
+        label = "prove_batch (first)" if i == 0 else f"prove_batch ({i + 1})"
+        print(f"{label:>24} {(time.perf_counter() - start) / len(batch):>14.3f}")
+    if not args.skip_loop:
+        assert proofs == looped
+
+if __name__ == "__main__":
+    main()
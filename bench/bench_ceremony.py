@@ -0,0 +1,65 @@
+import argparse
+import time
+from py_ecc.bn128 import G2, neg
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Ceremony import PowersOfTau, verify_contribution
+from Curve import JacobianBackend
+from Pairing import multi_pairing_check
+from Parallel import MsmPool
+
+"""
+Local simulation of a powers of tau ceremony: every contributor rescales the powers
+with a random secret and the next one verifies the contribution before building on it.
+The batched check (random linear combinations, one product of six pairings) is compared
+against checking every consecutive pair of G1 powers with its own pairing check
+(estimated from --naive-samples pairs)
+"""
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    res = fn(*args, **kwargs)
+    return res, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--powers", type=int, default=256)
+    parser.add_argument("--contributors", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes for the rescaling, 0 = serial")
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--naive-samples", type=int, default=2)
+    args = parser.parse_args()
+
+    backend = JacobianBackend()
+    pool = MsmPool(workers=args.workers, backend=backend) if args.workers > 0 else None
+
+    powers = PowersOfTau.new(args.powers)
+    print(f"--- {args.contributors} contributors, {args.powers} powers in G1 and G2 ---")
+    print(f"{'contributor':>11} {'contribute [s]':>15} {'verify [s]':>11}")
+    try:
+        for k in range(args.contributors):
+            updated, t_contribute = timed(powers.contribute, backend=backend, pool=pool, chunk_size=args.chunk_size)
+            valid, t_verify = timed(verify_contribution, powers, updated, backend=backend)
+            assert valid, f"contribution {k + 1} rejected"
+            print(f"{k + 1:>11} {t_contribute:>15.2f} {t_verify:>11.2f}")
+            powers = updated
+    finally:
+        if pool is not None:
+            pool.close()
+
+    g1, g2 = powers.g1_powers, powers.g2_powers
+    start = time.perf_counter()
+    for i in range(args.naive_samples):
+        assert multi_pairing_check([(g1[i + 1], G2), (neg(g1[i]), g2[1])])
+    per_pair = (time.perf_counter() - start) / args.naive_samples
+    print(f"pairwise check of the G1 powers: {per_pair:.2f} s per pair, ~{per_pair * (args.powers - 1):.1f} s for all")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import random
+import time
+import galois
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Field import FieldArray
+from FieldContext import get_field
+
+"""
+Throughput of element wise scalar field operations on n elements:
+galois' GF(curve_order) arrays (object arrays of python ints) against the limb arrays
+of Field.py, plus batch evaluation of many polynomials at one point.
+Conversions from/to python ints are timed separately, they're paid once per array
+"""
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=10**6)
+    parser.add_argument("--polys", type=int, default=1000, help="polynomials for the batch evaluation")
+    parser.add_argument("--degree", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"--- Building Galois field on {curve_order} ---")
+    GF = get_field()
+
+    rng = random.Random(0)
+    a = [rng.randrange(1, curve_order) for _ in range(args.n)]
+    b = [rng.randrange(1, curve_order) for _ in range(args.n)]
+
+    # compile the kernels before timing
+    FieldArray.from_ints(a[:2]).inverse().to_ints()
+
+    (ga, gb), t_galois_in = timed(lambda: (GF(a), GF(b)))
+    (fa, fb), t_field_in = timed(lambda: (FieldArray.from_ints(a), FieldArray.from_ints(b)))
+    print(f"from ints:  galois {t_galois_in:8.3f} s, limbs {t_field_in:8.3f} s")
+
+    print(f"{'op (n=' + str(args.n) + ')':>14} {'galois [s]':>11} {'limbs [s]':>10} {'speedup':>8}")
+    for name, galois_op, field_op in [
+        ("add", lambda: ga + gb, lambda: fa + fb),
+        ("sub", lambda: ga - gb, lambda: fa - fb),
+        ("mul", lambda: ga * gb, lambda: fa * fb),
+        ("inverse", lambda: ga ** -1, lambda: fa.inverse()),
+    ]:
+        expected, t_galois = timed(galois_op)
+        res, t_field = timed(field_op)
+        assert [int(x) for x in expected[:100]] == list(res[:100].to_ints()), f"{name} differs from galois"
+        print(f"{name:>14} {t_galois:>11.3f} {t_field:>10.3f} {t_galois / t_field:>7.1f}x")
+
+    _, t_field_out = timed(fa.to_ints)
+    print(f"to ints:    limbs {t_field_out:8.3f} s")
+
+    coeffs = [[rng.randrange(curve_order) for _ in range(args.degree)] for _ in range(args.polys)]
+    x = rng.randrange(curve_order)
+    polys = [galois.Poly(GF(row[::-1])) for row in coeffs]
+    limbs = FieldArray.from_ints(coeffs)
+    expected, t_galois = timed(lambda: [int(poly(x)) for poly in polys])
+    res, t_field = timed(limbs.evaluate, x)
+    assert expected == list(res.to_ints()), "batch evaluation differs from galois"
+    print(f"evaluating {args.polys} polys of {args.degree} coeffs: galois {t_galois:.3f} s, "
+        f"limbs {t_field:.3f} s, {t_galois / t_field:.1f}x")
+
+if __name__ == "__main__":
+    main()
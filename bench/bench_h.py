@@ -0,0 +1,64 @@
+import argparse
+import time
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from Setup import Setup
+from Prover import CircuitProver
+from Curve import JacobianBackend
+from FieldContext import get_field
+from bench_sparse import chain_circuit
+
+"""
+Compares computing h(x) in the Prover by polynomial division
+against coset FFTs, for the chain circuit over the roots of unity domain
+"""
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=4)
+    parser.add_argument("--max-log", type=int, default=9)
+    args = parser.parse_args()
+
+    print(f"--- Building Galois field on {curve_order} ---")
+    GF = get_field()
+    backend = JacobianBackend()
+
+    print(f"{'n':>6} {'division [s]':>13} {'coset [s]':>10} {'speedup':>8}")
+    for log_n in range(args.min_log, args.max_log + 1):
+        n = 2**log_n
+        L, R, O, witness = chain_circuit(n)
+        witness = GF(witness)
+        qap = QAP(L, R, O, curve_order, domain="roots", cache=False)
+        setup_data = Setup(qap.W_polys, qap.U_polys, qap.V_polys, backend=backend, domain=qap.domain).get_setup()
+
+        provers = {}
+        for h_mode in ["division", "coset"]:
+            provers[h_mode] = CircuitProver(
+                qap.U_polys, qap.V_polys, qap.W_polys,
+                setup_data["alpha_g1"], setup_data["beta_g2"], setup_data["g1_srs"],
+                setup_data["g2_srs"], setup_data["t_tau_srs"], setup_data["psis"],
+                backend=backend, domain=qap.domain, h_mode=h_mode
+            )
+
+        # time only the h computation of the already constructed provers
+        h_division, t_division = timed(provers["division"].compute_h_coeffs, witness)
+        h_coset, t_coset = timed(provers["coset"].compute_h_coeffs, witness)
+        assert list(h_division) == list(h_coset), "h differs"
+        print(f"{n:>6} {t_division:>13.3f} {t_coset:>10.3f} {t_division / t_coset:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
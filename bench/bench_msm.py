@@ -0,0 +1,116 @@
+import argparse
+import random
+import time
+from py_ecc.bn128 import G1, G2, add, curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Msm import msm, naive_msm, msm_in_group, set_scalar_stats_hook, SMALL_SCALAR_BOUND
+from Curve import JacobianBackend, PyEccBackend
+
+"""
+Compares the bucket method MSM against the naive loop
+of one scalar multiplication per term, for 2^min_log to 2^max_log terms.
+With --scalars witness the scalars look like a witness (half zeros, a quarter ones,
+small values and a few full size field elements) and the classifying msm is
+compared against the bucket method over all terms instead
+"""
+
+"""
+Scalars with the class mix of a witness dominated by boolean and small range wires
+"""
+def witness_scalars(rng, n):
+    scalars = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.5:
+            scalars.append(0)
+        elif r < 0.75:
+            scalars.append(1)
+        elif r < 0.95:
+            scalars.append(rng.randint(2, SMALL_SCALAR_BOUND - 1))
+        else:
+            scalars.append(rng.randint(0, curve_order - 1))
+    return scalars
+
+"""
+The bucket method over all non-zero terms, without classifying the scalars first
+"""
+def unclassified_msm(points, scalars, backend):
+    group = backend.group_of(points[0])
+    terms = [(group.from_affine(point), scalar) for point, scalar in zip(points, scalars) if scalar != 0]
+    return group.to_affine(msm_in_group(group, terms))
+
+"""
+Builds n distinct points G, 2G, 3G, ... with one addition each
+"""
+def get_points(generator, n):
+    points = [generator]
+    for _ in range(n - 1):
+        points.append(add(points[-1], generator))
+    return points
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=8)
+    parser.add_argument("--max-log", type=int, default=14)
+    parser.add_argument("--group", choices=["g1", "g2"], default="g1")
+    parser.add_argument("--backend", choices=["py_ecc", "jacobian", "jacobian-no-glv"], default="jacobian")
+    parser.add_argument("--skip-naive", action="store_true")
+    parser.add_argument("--scalars", choices=["random", "witness"], default="random")
+    args = parser.parse_args()
+
+    generator = G1 if args.group == "g1" else G2
+    backend = {
+        "py_ecc": PyEccBackend,
+        "jacobian": JacobianBackend,
+        "jacobian-no-glv": lambda: JacobianBackend(glv=False),
+    }[args.backend]()
+    rng = random.Random(0)
+    all_points = get_points(generator, 2**args.max_log)
+
+    if args.scalars == "witness":
+        stats = []
+        set_scalar_stats_hook(stats.append)
+        print(f"{'terms':>8} {'zero':>6} {'one':>6} {'small':>6} {'large':>6} {'bucket [s]':>12} {'classified [s]':>15} {'speedup':>8}")
+        for log_n in range(args.min_log, args.max_log + 1):
+            n = 2**log_n
+            points = all_points[:n]
+            scalars = witness_scalars(rng, n)
+
+            expected, t_bucket = timed(unclassified_msm, points, scalars, backend)
+            res, t_classified = timed(msm, points, scalars, None, backend)
+            assert res == expected, "classified MSM differs from the bucket method"
+            counts = stats[-1]
+            print(f"{n:>8} {counts['zero']:>6} {counts['one']:>6} {counts['small']:>6} {counts['large']:>6} "
+                f"{t_bucket:>12.3f} {t_classified:>15.3f} {t_bucket / t_classified:>7.1f}x")
+        return
+
+    print(f"{'terms':>8} {'naive [s]':>12} {'bucket [s]':>12} {'speedup':>8}")
+    for log_n in range(args.min_log, args.max_log + 1):
+        n = 2**log_n
+        points = all_points[:n]
+        scalars = [rng.randint(0, curve_order - 1) for _ in range(n)]
+
+        res, t_bucket = timed(msm, points, scalars, None, backend)
+        if args.skip_naive:
+            print(f"{n:>8} {'-':>12} {t_bucket:>12.3f} {'-':>8}")
+            continue
+
+        expected, t_naive = timed(naive_msm, points, scalars)
+        assert res == expected, "MSM result differs from naive loop"
+        print(f"{n:>8} {t_naive:>12.3f} {t_bucket:>12.3f} {t_naive / t_bucket:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import time
+from py_ecc.bn128 import G1, G2, multiply, neg, pairing as py_ecc_pairing
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Pairing import pairing, multi_pairing_check
+
+"""
+Latency of the verifying equation e(A, B) == e(alpha_1, beta_2) * e(C, G2) of one synthetic proof:
+three py_ecc pairings (the original Verifier), three pairings of Pairing.py
+and one multi pairing check with a single final exponentiation
+"""
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        res = fn()
+    return res, (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-py-ecc", action="store_true", help="skip the slow py_ecc pairings")
+    args = parser.parse_args()
+
+    a, b, alpha, beta = 1234567, 7654321, 3, 5
+    A, B, C = multiply(G1, a), multiply(G2, b), multiply(G1, a * b - alpha * beta)
+    alpha_1, beta_2 = multiply(G1, alpha), multiply(G2, beta)
+
+    variants = {
+        "3 pairings (py_ecc)": lambda: py_ecc_pairing(B, A) == py_ecc_pairing(beta_2, alpha_1) * py_ecc_pairing(G2, C),
+        "3 pairings": lambda: pairing(A, B) == pairing(alpha_1, beta_2) * pairing(C, G2),
+        "multi pairing check": lambda: multi_pairing_check([(A, B), (neg(C), G2), (neg(alpha_1), beta_2)]),
+    }
+    if args.skip_py_ecc:
+        del variants["3 pairings (py_ecc)"]
+
+    print(f"{'variant':>20} {'latency [s]':>12} {'speedup':>8}")
+    baseline = None
+    for name, fn in variants.items():
+        valid, elapsed = timed(fn, args.repeat)
+        assert valid
+        baseline = baseline if baseline is not None else elapsed
+        print(f"{name:>20} {elapsed:>12.3f} {baseline / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
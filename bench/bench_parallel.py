@@ -0,0 +1,66 @@
+import argparse
+import os
+import time
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from Setup import Setup
+from Prover import Prover
+from Parallel import MsmPool
+from Curve import JacobianBackend
+from FieldContext import get_field
+from bench_sparse import chain_circuit
+
+"""
+Scaling of the prover's MSMs with the number of worker processes of an MsmPool,
+for the chain circuit over the roots of unity domain with the coset h mode
+"""
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log-n", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"--- Building Galois field on {curve_order} ---")
+    GF = get_field()
+    backend = JacobianBackend()
+
+    n = 2**args.log_n
+    L, R, O, witness = chain_circuit(n)
+    witness = GF(witness)
+    qap = QAP(L, R, O, curve_order, domain="roots", cache=False)
+    setup_data = Setup(qap.W_polys, qap.U_polys, qap.V_polys, backend=backend, domain=qap.domain).get_setup()
+
+    def prove(pool):
+        start = time.perf_counter()
+        proof = Prover(
+            witness, qap.U_polys, qap.V_polys, qap.W_polys,
+            setup_data["alpha_g1"], setup_data["beta_g2"], setup_data["g1_srs"],
+            setup_data["g2_srs"], setup_data["t_tau_srs"], setup_data["psis"],
+            a_query_g1=setup_data["a_query_g1"], b_query_g2=setup_data["b_query_g2"],
+            backend=backend, domain=qap.domain, h_mode="coset", pool=pool
+        ).get_proof()
+        return proof, time.perf_counter() - start
+
+    expected, serial = prove(None)
+    print(f"n = {n}, {os.cpu_count()} cores, serial prover: {serial:.2f} s")
+
+    print(f"{'workers':>7} {'prover [s]':>11} {'speedup':>8}")
+    for workers in args.workers:
+        with MsmPool(workers=workers, backend=backend) as pool:
+            # first run starts the worker processes
+            prove(pool)
+            proof, elapsed = prove(pool)
+        assert proof == expected, "proof differs"
+        print(f"{workers:>7} {elapsed:>11.2f} {serial / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
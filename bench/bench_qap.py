@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+import numpy as np
+import galois
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Domain import IntegerDomain, RootsOfUnityDomain
+from FieldContext import get_field
+
+"""
+Compares the QAP interpolation of one R1CS matrix (n constraints x m wires)
+column by column with galois.lagrange_poly over x = 1..n
+against one batched inverse NTT over the roots of unity
+"""
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - start
+
+"""
+Random R1CS matrix with a few nonzero entries per row
+"""
+def random_matrix(rng, n, m, per_row=3):
+    matrix = np.zeros((n, m), dtype=object)
+    for row in range(n):
+        for col in rng.sample(range(m), min(per_row, m)):
+            matrix[row, col] = rng.randint(1, curve_order - 1)
+    return matrix
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=4)
+    parser.add_argument("--max-log", type=int, default=9)
+    parser.add_argument("--wires", type=int, default=None, help="number of columns, n if not given")
+    parser.add_argument("--skip-lagrange", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"--- Building Galois field on {curve_order} ---")
+    GF = get_field()
+
+    print(f"{'n':>6} {'m':>6} {'lagrange [s]':>13} {'intt [s]':>10} {'speedup':>8}")
+    for log_n in range(args.min_log, args.max_log + 1):
+        n = 2**log_n
+        m = args.wires or n
+        matrix = random_matrix(rng, n, m)
+
+        _, t_ntt = timed(RootsOfUnityDomain(n).interpolate, matrix)
+        if args.skip_lagrange:
+            print(f"{n:>6} {m:>6} {'-':>13} {t_ntt:>10.3f} {'-':>8}")
+            continue
+
+        xs = GF(IntegerDomain(n).points())
+        lagrange = lambda: np.apply_along_axis(lambda col: galois.lagrange_poly(xs, col), 0, GF(matrix))
+        _, t_lagrange = timed(lagrange)
+        print(f"{n:>6} {m:>6} {t_lagrange:>13.3f} {t_ntt:>10.3f} {t_lagrange / t_ntt:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import tempfile
+import time
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from QapCache import QapCache
+from bench_sparse import chain_circuit
+
+"""
+QAP construction of the chain circuit (see bench_sparse.py) without the cache,
+on a cold cache (interpolating and storing the entry) and on a warm one (reading it).
+"""
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    res = fn(*args, **kwargs)
+    return res, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=6)
+    parser.add_argument("--max-log", type=int, default=9)
+    parser.add_argument("--domain", choices=["integers", "roots"], default="roots")
+    args = parser.parse_args()
+
+    print(f"{'n':>6} {'no cache [s]':>13} {'cold [s]':>9} {'warm [s]':>9} {'entry [MB]':>11}")
+    for log_n in range(args.min_log, args.max_log + 1):
+        n = 2**log_n
+        L, R, O, _ = chain_circuit(n)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = QapCache(tmp_dir)
+            uncached, t_uncached = timed(QAP, L, R, O, curve_order, domain=args.domain, cache=False)
+            _, t_cold = timed(QAP, L, R, O, curve_order, domain=args.domain, cache=cache)
+            warm, t_warm = timed(QAP, L, R, O, curve_order, domain=args.domain, cache=cache)
+            assert all(np.array_equal(getattr(warm, name), getattr(uncached, name)) for name in ["U_coeffs", "V_coeffs", "W_coeffs"])
+
+            entry_bytes = sum(os.path.getsize(os.path.join(tmp_dir, name)) for name in os.listdir(tmp_dir))
+        print(f"{n:>6} {t_uncached:>13.2f} {t_cold:>9.2f} {t_warm:>9.2f} {entry_bytes / 2**20:>11.1f}")
+
+if __name__ == "__main__":
+    main()
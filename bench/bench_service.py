@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from Setup import Setup
+from Prover import Prover, CircuitProver
+from Curve import JacobianBackend
+from FieldContext import get_field
+from prover_service import ProverService
+from bench_sparse import chain_circuit
+
+"""
+Proofs per second for many witnesses of the chain circuit:
+the one-shot flow (a new Prover per witness, as in pipeline.py),
+a warm CircuitProver and the prover service on a unix socket with several clients.
+A one-shot run of pipeline.py also starts a new interpreter, which has to build the Galois field,
+its cost is measured once in a subprocess
+"""
+
+def chain_witness(n, start):
+    witness = [1, start]
+    for i in range(n):
+        witness.append(((witness[i + 1] + 1) * witness[i + 1]) % curve_order)
+    return witness
+
+def rate(fn, num_requests):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return num_requests / elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log-n", type=int, default=6)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--skip-startup", action="store_true", help="skip measuring the interpreter startup")
+    args = parser.parse_args()
+
+    startup = None
+    if not args.skip_startup:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import Prover"], cwd=parent_dir, check=True)
+        startup = time.perf_counter() - start
+
+    print(f"--- Building Galois field on {curve_order} ---")
+    GF = get_field()
+    backend = JacobianBackend()
+
+    n = 2**args.log_n
+    L, R, O, witness = chain_circuit(n)
+    qap = QAP(L, R, O, curve_order, domain="roots", cache=False)
+    setup_data = Setup(qap.W_polys, qap.U_polys, qap.V_polys, backend=backend, domain=qap.domain).get_setup()
+    witnesses = [chain_witness(n, start) for start in range(2, args.requests + 2)]
+
+    setup_args = [
+        setup_data["alpha_g1"], setup_data["beta_g2"], setup_data["g1_srs"],
+        setup_data["g2_srs"], setup_data["t_tau_srs"], setup_data["psis"]
+    ]
+
+    queries = {"a_query_g1": setup_data["a_query_g1"], "b_query_g2": setup_data["b_query_g2"]}
+
+    def one_shot():
+        for witness in witnesses:
+            Prover(witness, qap.U_polys, qap.V_polys, qap.W_polys, *setup_args, **queries,
+                backend=backend, domain=qap.domain, h_mode="coset")
+
+    circuit_prover = CircuitProver(qap.U_polys, qap.V_polys, qap.W_polys, *setup_args, **queries,
+        backend=backend, domain=qap.domain, h_mode="coset")
+
+    def warm():
+        for witness in witnesses:
+            circuit_prover.prove(witness)
+
+    service = ProverService(circuit_prover, threads=args.clients)
+    tmp_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp_dir.name, "prover.sock")
+    server_thread = threading.Thread(target=service.serve_unix, args=(path,))
+    server_thread.start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+
+    def client(requests):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+            connection.sendall("".join(json.dumps(request) + "\n" for request in requests).encode("utf-8"))
+            connection.shutdown(socket.SHUT_WR)
+            with connection.makefile("r", encoding="utf-8") as responses:
+                for line in responses:
+                    assert "proof" in json.loads(line), line
+
+    def via_service():
+        requests = [{"id": i, "witness": [str(w) for w in witness]} for i, witness in enumerate(witnesses)]
+        threads = [
+            threading.Thread(target=client, args=(requests[i::args.clients],))
+            for i in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    print(f"n = {n}, {args.requests} witnesses")
+    print(f"{'flow':>26} {'proofs/s':>9}")
+    one_shot_rate = rate(one_shot, args.requests)
+    if startup is not None:
+        process_rate = 1 / (startup + 1 / one_shot_rate)
+        print(f"{'one-shot process':>26} {process_rate:>9.4f} (startup {startup:.1f} s)")
+    print(f"{'one-shot Prover':>26} {one_shot_rate:>9.2f}")
+    warm_rate = rate(warm, args.requests)
+    print(f"{'warm CircuitProver':>26} {warm_rate:>9.2f} ({warm_rate / one_shot_rate:.1f}x)")
+    service_rate = rate(via_service, args.requests)
+    label = f"service, {args.clients} clients"
+    print(f"{label:>26} {service_rate:>9.2f} ({service_rate / one_shot_rate:.1f}x)")
+
+    service.shutdown()
+    server_thread.join()
+    tmp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import random
+import time
+from py_ecc.bn128 import G1, G2, curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Curve import JacobianBackend, PyEccBackend
+from FixedBase import FixedBaseTable, fixed_base_window
+
+"""
+Compares the SRS generation of the Setup with one independent scalar multiplication
+per point against the shared fixed-base tables, per SRS component.
+A circuit with n constraints and m = n wires needs n points for g1_srs and g2_srs,
+n - 1 points for t_tau_srs and m points for psis
+"""
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return res, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=4)
+    parser.add_argument("--max-log", type=int, default=10)
+    parser.add_argument("--backend", choices=["py_ecc", "jacobian"], default="jacobian")
+    parser.add_argument("--window", type=int, default=None)
+    args = parser.parse_args()
+
+    backend = JacobianBackend() if args.backend == "jacobian" else PyEccBackend()
+    rng = random.Random(0)
+
+    print(f"{'n':>6} {'component':>10} {'plain [s]':>10} {'table [s]':>10} {'speedup':>8}")
+    for log_n in range(args.min_log, args.max_log + 1):
+        n = 2**log_n
+        components = {
+            "g1_srs": (G1, n),
+            "g2_srs": (G2, n),
+            "t_tau_srs": (G1, n - 1),
+            "psis": (G1, n),
+        }
+
+        g1_window = args.window or fixed_base_window(3 * n + 1)
+        g2_window = args.window or fixed_base_window(n + 1)
+        g1_table, t_g1 = timed(FixedBaseTable, backend.g1, G1, g1_window)
+        g2_table, t_g2 = timed(FixedBaseTable, backend.g2, G2, g2_window)
+        print(f"{n:>6} {'G1 table':>10} {'':>10} {t_g1:>10.3f} {'w=' + str(g1_window):>8}")
+        print(f"{n:>6} {'G2 table':>10} {'':>10} {t_g2:>10.3f} {'w=' + str(g2_window):>8}")
+
+        for name, (generator, count) in components.items():
+            group = backend.group_of(generator)
+            table = g1_table if generator is G1 else g2_table
+            base = group.from_affine(generator)
+            scalars = [rng.randint(1, curve_order - 1) for _ in range(count)]
+
+            plain = lambda: group.batch_to_affine([group.multiply(base, s) for s in scalars])
+            expected, t_plain = timed(plain)
+            res, t_table = timed(table.multiply_all, scalars)
+            assert res == expected, f"{name} differs"
+
+            print(f"{n:>6} {name:>10} {t_plain:>10.3f} {t_table:>10.3f} {t_plain / t_table:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Sparse import SparseMatrix
+from Domain import RootsOfUnityDomain
+
+"""
+Peak memory of holding a synthetic R1CS sparse vs. dense and of building
+the witness-combined QAP polynomials from it over the roots of unity domain.
+The circuit is a chain of squarings w_(i+2) = w_(i+1) * w_(i+1)
+plus the constant wire added to every left factor, so n constraints use n + 2 wires
+"""
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    res = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return res, elapsed, peak
+
+def chain_circuit(n):
+    L = [(i, i + 1, 1) for i in range(n)] + [(i, 0, 1) for i in range(n)]
+    R = [(i, i + 1, 1) for i in range(n)]
+    O = [(i, i + 2, 1) for i in range(n)]
+
+    witness = [1, 3]
+    for i in range(n):
+        witness.append(((witness[i + 1] + 1) * witness[i + 1]) % curve_order)
+    return L, R, O, witness
+
+def build_sparse(L, R, O, shape):
+    return [SparseMatrix.from_any(m, curve_order, shape) for m in [L, R, O]]
+
+def combined_polys(matrices, witness, domain):
+    res = []
+    for matrix in matrices:
+        evaluations = matrix.matvec(witness, curve_order)
+        entries = [(row, 0, value) for row, value in enumerate(evaluations) if value != 0]
+        res.append(domain.interpolate_sparse(entries, 1))
+    return res
+
+def mb(num_bytes):
+    return f"{num_bytes / 2**20:10.1f} MB"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--constraints", type=int, default=100_000)
+    parser.add_argument("--max-dense", type=int, default=2_000, help="largest size to actually allocate densely")
+    args = parser.parse_args()
+
+    n = args.constraints
+    shape = (n, n + 2)
+    L, R, O, witness = chain_circuit(n)
+    nnz = len(L) + len(R) + len(O)
+    print(f"--- {n} constraints, {n + 2} wires, {nnz} nonzero entries ---")
+
+    matrices, t_sparse, peak_sparse = measure(build_sparse, L, R, O, shape)
+    print(f"sparse R1CS:        {mb(peak_sparse)} peak, {t_sparse:.2f}s")
+
+    if n <= args.max_dense:
+        _, t_dense, peak_dense = measure(lambda: [m.to_dense() for m in matrices])
+        print(f"dense R1CS:         {mb(peak_dense)} peak, {t_dense:.2f}s")
+    else:
+        # one 8 byte pointer per entry of the three object arrays
+        print(f"dense R1CS:         {mb(3 * shape[0] * shape[1] * 8)} (estimated, not allocated)")
+
+    domain = RootsOfUnityDomain(n)
+    _, t_polys, peak_polys = measure(combined_polys, matrices, witness, domain)
+    print(f"L, R, O polynomials: {mb(peak_polys)} peak, {t_polys:.2f}s (domain size {domain.size})")
+
+if __name__ == "__main__":
+    main()
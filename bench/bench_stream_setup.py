@@ -0,0 +1,73 @@
+import argparse
+import resource
+import subprocess
+import tempfile
+import time
+import galois
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Setup import Setup, StreamingSetup
+from Keys import ProvingKey
+from Curve import JacobianBackend
+from Domain import IntegerDomain
+from FieldContext import get_field
+
+"""
+Peak RSS of the in-memory Setup (saved as proving key afterwards) against the
+StreamingSetup writing the key chunk by chunk, for n constraints and n wires.
+Every run is a fresh process, so the peaks don't mix. The wire polynomials are
+constants, the setup cost is in the n-point srs's and per wire points either way
+"""
+
+def run(mode, log_n, chunk_size, path):
+    GF = get_field()
+    n = 2**log_n
+    polys = [galois.Poly([i + 1], field=GF) for i in range(n)]
+    kwargs = {"backend": JacobianBackend(), "domain": IntegerDomain(n)}
+
+    start = time.perf_counter()
+    if mode == "memory":
+        setup = Setup(polys, polys, polys, **kwargs)
+        ProvingKey.from_setup(setup.get_setup()).save(path)
+    else:
+        StreamingSetup(polys, polys, polys, chunk_size=chunk_size, **kwargs).write_key(path).close()
+    elapsed = time.perf_counter() - start
+
+    # kilobytes on linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed} {peak}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=8)
+    parser.add_argument("--max-log", type=int, default=12)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        mode, log_n = args.child
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(mode, int(log_n), args.chunk_size, os.path.join(tmp_dir, "proving.key"))
+        return
+
+    print(f"{'n':>7} {'mode':>10} {'time [s]':>9} {'peak RSS [MB]':>14}")
+    for log_n in range(args.min_log, args.max_log + 1):
+        for mode in ["memory", "streaming"]:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(log_n), "--chunk-size", str(args.chunk_size)],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            elapsed, peak = float(out[-2]), float(out[-1])
+            print(f"{2**log_n:>7} {mode:>10} {elapsed:>9.2f} {peak:>14.1f}")
+
+if __name__ == "__main__":
+    main()
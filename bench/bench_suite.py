@@ -0,0 +1,259 @@
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import time
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from Setup import Setup
+from Prover import CircuitProver
+from Verifier import Verifier, PreparedVerificationKey
+from Msm import msm
+from Curve import JacobianBackend, PyEccBackend
+from FieldContext import get_field
+from bench_sparse import chain_circuit
+
+"""
+Times every phase of the pipeline for synthetic circuits of 2^min-log .. 2^max-log constraints
+over the roots of unity domain (coset h mode) and writes the results as JSON, e.g.
+
+python3 bench/bench_suite.py --max-log 10 --output before.json
+python3 bench/bench_suite.py --max-log 10 --output after.json --compare before.json
+
+phases (seconds, the minimum over --repeat runs):
+qap                      interpolating the QAP (without the QAP cache)
+setup                    the whole Setup
+setup.<phase>            every phase of that Setup, recorded through its timer argument:
+                         qap_coeffs, tau_powers, tables (the fixed-base tables), g1_srs, g2_srs,
+                         alpha_beta_g1, beta_g2, t_tau (the scalars t(tau) * tau^i), t_tau_srs,
+                         qap_eval (the QAP's polynomials at tau), psi_scalars, psis,
+                         a_query_g1, b_query_g1 and b_query_g2
+prover.preprocess        building the CircuitProver
+prover.h                 h of the witness
+prover.msm_<component>   each MSM of the proof on its own
+prove                    a whole proof of the warm CircuitProver
+verify.prepare           preparing the verification key
+verify                   verifying the proof with the prepared key
+
+circuits (n constraints):
+chain    w_(i+2) = (w_(i+1) + 1) * w_(i+1), see bench_sparse.py
+sparse   random constraints, each multiplying two random linear combinations of up to
+         3 earlier wires into a new wire (n / 4 public input wires)
+range    range checks of 64 bit values: 64 boolean constraints b * b = b per value
+         and one recomposing it, sum(2^i * b_i) * 1 = value
+"""
+
+SPARSE_TERMS = 3
+RANGE_BITS = 64
+
+"""
+n random constraints, returns the R1CS as (row, column, value) triples and a satisfying witness
+"""
+def sparse_circuit(n, seed=0):
+    rng = random.Random(seed)
+    num_inputs = max(1, n // 4)
+    witness = [1] + [rng.randint(1, curve_order - 1) for _ in range(num_inputs)]
+
+    L, R, O = [], [], []
+    for row in range(n):
+        factors = []
+        for matrix in [L, R]:
+            value = 0
+            for col in rng.sample(range(len(witness)), min(SPARSE_TERMS, len(witness))):
+                coeff = rng.randint(1, curve_order - 1)
+                matrix.append((row, col, coeff))
+                value += coeff * witness[col]
+            factors.append(value % curve_order)
+        O.append((row, len(witness), 1))
+        witness.append((factors[0] * factors[1]) % curve_order)
+    return L, R, O, witness
+
+"""
+Range checks with n constraints in total: 64 bits and their recomposition per value
+(the last value gets the remaining constraints), wires 1, then per value: value, bits
+"""
+def range_circuit(n, seed=0):
+    rng = random.Random(seed)
+    witness = [1]
+    L, R, O = [], [], []
+    row = 0
+    while row < n:
+        num_bits = min(RANGE_BITS, n - row - 1)
+        bits = [rng.randint(0, 1) for _ in range(num_bits)]
+        value_wire = len(witness)
+        witness += [sum(bit << i for i, bit in enumerate(bits))] + bits
+
+        for i in range(num_bits):
+            bit_wire = value_wire + 1 + i
+            L.append((row, bit_wire, 1))
+            R.append((row, bit_wire, 1))
+            O.append((row, bit_wire, 1))
+            row += 1
+
+        L += [(row, value_wire + 1 + i, 2**i) for i in range(num_bits)]
+        R.append((row, 0, 1))
+        O.append((row, value_wire, 1))
+        row += 1
+    return L, R, O, witness
+
+CIRCUITS = {
+    "chain": lambda n: chain_circuit(n),
+    "sparse": sparse_circuit,
+    "range": range_circuit,
+}
+
+class PhaseTimer:
+    def __init__(self):
+        self.phases = {}
+
+    """
+    Runs fn, records its time under name (keeping the minimum) and returns its result
+    """
+    def time(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        res = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.phases[name] = min(elapsed, self.phases.get(name, elapsed))
+        return res
+
+def run_circuit(name, log_n, backend, timer):
+    n = 2**log_n
+    L, R, O, witness = CIRCUITS[name](n)
+    num_wires = len(witness)
+
+    qap = timer.time("qap", QAP, L, R, O, curve_order, domain="roots", cache=False, num_wires=num_wires)
+    assert qap.check(witness), f"{name} witness doesn't satisfy its QAP"
+
+    setup_data = timer.time(
+        "setup", lambda: Setup(
+            qap.W_polys, qap.U_polys, qap.V_polys, backend=backend, domain=qap.domain,
+            coeffs=[qap.U_coeffs, qap.V_coeffs, qap.W_coeffs],
+            timer=lambda phase, fn, *args: timer.time(f"setup.{phase}", fn, *args)
+        ).get_setup()
+    )
+
+    circuit_prover = timer.time(
+        "prover.preprocess", CircuitProver,
+        qap.U_polys, qap.V_polys, qap.W_polys,
+        *[setup_data[name] for name in ["alpha_g1", "beta_g2", "g1_srs", "g2_srs", "t_tau_srs", "psis"]],
+        a_query_g1=setup_data["a_query_g1"], b_query_g2=setup_data["b_query_g2"],
+        backend=backend, domain=qap.domain, h_mode="coset"
+    )
+    h_coeffs = timer.time("prover.h", circuit_prover.compute_h_coeffs, witness)
+
+    # the MSMs of CircuitProver.commit
+    witness_ints = [value % curve_order for value in witness]
+    t_tau_srs = setup_data["t_tau_srs"]
+    h_scalars = [0] * (len(t_tau_srs) - len(h_coeffs)) + [int(c) for c in h_coeffs]
+    for component, points, scalars in [
+        ("a_query_g1", setup_data["a_query_g1"], witness_ints),
+        ("b_query_g2", setup_data["b_query_g2"], witness_ints),
+        ("psis", setup_data["psis"], witness_ints),
+        ("t_tau_srs", t_tau_srs, h_scalars),
+    ]:
+        timer.time(f"prover.msm_{component}", msm, points, scalars, backend=backend)
+
+    proof = timer.time("prove", circuit_prover.prove, witness)
+
+    prepared_key = timer.time("verify.prepare", PreparedVerificationKey, setup_data["alpha_g1"], setup_data["beta_g2"])
+    verifier = timer.time("verify", Verifier, proof["A"], proof["B"], proof["C"], prepared_key=prepared_key)
+    assert verifier.isValid, f"{name} proof is invalid"
+
+    return {"circuit": name, "log_n": log_n, "constraints": n, "wires": num_wires, "domain_size": qap.domain.size}
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=parent_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+"""
+Prints the phases of both runs side by side for every circuit and size they share,
+marking phases slower than the baseline by more than threshold (a fraction)
+"""
+def compare(baseline, results, threshold):
+    base = {(res["circuit"], res["log_n"]): res["phases"] for res in baseline["results"]}
+    print(f"{'circuit':>8} {'n':>6} {'phase':>22} {'base [s]':>10} {'new [s]':>10} {'ratio':>7}")
+    regressions = 0
+    for res in results:
+        base_phases = base.get((res["circuit"], res["log_n"]))
+        if base_phases is None:
+            continue
+        for phase, elapsed in res["phases"].items():
+            if phase not in base_phases:
+                continue
+            ratio = elapsed / base_phases[phase] if base_phases[phase] > 0 else float("inf")
+            mark = "  slower" if ratio > 1 + threshold else ""
+            regressions += mark != ""
+            print(f"{res['circuit']:>8} {res['constraints']:>6} {phase:>22} {base_phases[phase]:>10.3f} {elapsed:>10.3f} {ratio:>6.2f}x{mark}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-log", type=int, default=4)
+    parser.add_argument("--max-log", type=int, default=8, help="up to 16, the larger sizes take hours in pure python")
+    parser.add_argument("--circuits", default="chain,sparse,range", help=f"comma separated of {', '.join(CIRCUITS)}")
+    parser.add_argument("--backend", choices=["py_ecc", "jacobian"], default="jacobian")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size, the fastest time of each phase is kept")
+    parser.add_argument("--output", default=None, help="JSON file for the results, printed if not given")
+    parser.add_argument("--compare", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown over the baseline reported as regression")
+    args = parser.parse_args()
+
+    circuits = args.circuits.split(",")
+    for name in circuits:
+        if name not in CIRCUITS:
+            parser.error(f"unknown circuit {name}, expected one of {', '.join(CIRCUITS)}")
+
+    backend = JacobianBackend() if args.backend == "jacobian" else PyEccBackend()
+    get_field()
+
+    results = []
+    for name in circuits:
+        for log_n in range(args.min_log, args.max_log + 1):
+            timer = PhaseTimer()
+            for _ in range(args.repeat):
+                res = run_circuit(name, log_n, backend, timer)
+            res["phases"] = timer.phases
+            results.append(res)
+            print(f"{name} n = {2**log_n}: prove {timer.phases['prove']:.3f}s, setup {timer.phases['setup']:.3f}s", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        print(f"--- {regressions} phases slower than the baseline by more than {args.threshold:.0%} ---")
+
+if __name__ == "__main__":
+    main()
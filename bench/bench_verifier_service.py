@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from Setup import Setup
+from Prover import CircuitProver
+from Keys import ProvingKey, point_to_json
+from Curve import JacobianBackend
+from bench_sparse import chain_circuit
+from bench_service import chain_witness
+
+"""
+Latency and throughput of verifier_service.py on a unix socket under a local load generator:
+clients concurrent connections, each sending its next proof as soon as the last one is answered.
+Without coalescing (a batch per proof) every proof needs its own final exponentiation,
+with a window the proofs waiting meanwhile share one batched pairing check.
+Verifying doesn't depend on the circuit's size, so the proofs are of a small chain circuit
+"""
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+async def load(path, requests, clients):
+    latencies = []
+
+    async def client(lines):
+        reader, writer = await asyncio.open_unix_connection(path)
+        for line in lines:
+            start = time.perf_counter()
+            writer.write((line + "\n").encode("utf-8"))
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            assert response["valid"], response
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(requests[i::clients]) for i in range(clients)])
+    return latencies, time.perf_counter() - start
+
+def run(key_path, requests, clients, window_ms, max_batch, workers):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "verifier.sock")
+        server = subprocess.Popen([
+            sys.executable, os.path.join(parent_dir, "verifier_service.py"), "--key", key_path, "--socket", path,
+            "--window-ms", str(window_ms), "--max-batch", str(max_batch), "--workers", str(workers)
+        ], stderr=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(path):
+                time.sleep(0.05)
+            return asyncio.run(load(path, requests, clients))
+        finally:
+            server.terminate()
+            server.wait()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--proofs", type=int, default=8, help="distinct proofs the requests cycle through")
+    args = parser.parse_args()
+
+    backend = JacobianBackend()
+    n = 8
+    L, R, O, _ = chain_circuit(n)
+    qap = QAP(L, R, O, curve_order, domain="roots", cache=False)
+    setup_data = Setup(qap.W_polys, qap.U_polys, qap.V_polys, backend=backend, domain=qap.domain).get_setup()
+    circuit_prover = CircuitProver(
+        qap.U_polys, qap.V_polys, qap.W_polys,
+        *[setup_data[name] for name in ["alpha_g1", "beta_g2", "g1_srs", "g2_srs", "t_tau_srs", "psis"]],
+        a_query_g1=setup_data["a_query_g1"], b_query_g2=setup_data["b_query_g2"],
+        backend=backend, domain=qap.domain
+    )
+    proofs = circuit_prover.prove_batch([chain_witness(n, start) for start in range(2, args.proofs + 2)])
+    requests = [
+        json.dumps({"id": i, "proof": {name: point_to_json(point) for name, point in proofs[i % len(proofs)].items()}})
+        for i in range(args.requests)
+    ]
+
+    configs = [
+        ("no coalescing", 0, 1),
+        (f"window {args.window_ms:g} ms", args.window_ms, args.max_batch),
+    ]
+
+    print(f"--- {args.requests} requests, {args.clients} clients, {args.workers} worker processes ---")
+    print(f"{'flow':>16} {'p50 [ms]':>9} {'p99 [ms]':>9} {'proofs/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        key_path = os.path.join(tmp_dir, "key.vk")
+        ProvingKey.from_setup(setup_data).verification_key().save(key_path)
+
+        for label, window_ms, max_batch in configs:
+            latencies, elapsed = run(key_path, requests, args.clients, window_ms, max_batch, args.workers)
+            print(f"{label:>16} {percentile(latencies, 50) * 1000:>9.0f} {percentile(latencies, 99) * 1000:>9.0f} "
+                  f"{len(latencies) / elapsed:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import random
+import time
+from py_ecc.bn128 import G1, G2, multiply, curve_order
+
+# for class import from parent dir
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Verifier import Verifier, BatchVerifier, PreparedVerificationKey
+
+"""
+Compares the throughput of verifying N proofs one by one against batch verification
+(speedups relative to single verification with a prepared key).
+The proofs are synthetic but valid: A = a * G1, B = b * G2 and C = (a * b - alpha * beta) * G1
+satisfy e(A, B) == e(alpha_1, beta_2) * e(C, G2), so no circuit or Setup is needed
+"""
+
+def random_proofs(n, alpha, beta, rng):
+    proofs = []
+    for _ in range(n):
+        a = rng.randint(1, curve_order - 1)
+        b = rng.randint(1, curve_order - 1)
+        proofs.append({
+            "A": multiply(G1, a),
+            "B": multiply(G2, b),
+            "C": multiply(G1, (a * b - alpha * beta) % curve_order),
+        })
+    return proofs
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16, 256])
+    parser.add_argument("--single-samples", type=int, default=2,
+        help="proofs verified one by one to estimate the single verification rate")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    alpha, beta = rng.randint(1, curve_order - 1), rng.randint(1, curve_order - 1)
+    alpha_1, beta_2 = multiply(G1, alpha), multiply(G2, beta)
+
+    proofs = random_proofs(max(args.sizes + [args.single_samples]), alpha, beta, rng)
+
+    start = time.perf_counter()
+    for proof in proofs[:args.single_samples]:
+        assert Verifier(proof["A"], proof["B"], proof["C"], alpha_1, beta_2).isValid
+    single = (time.perf_counter() - start) / args.single_samples
+    print(f"single verification: {single:.2f} s per proof, {1 / single:.3f} proofs/s")
+
+    start = time.perf_counter()
+    prepared_key = PreparedVerificationKey(alpha_1, beta_2)
+    print(f"preparing the key: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    for proof in proofs[:args.single_samples]:
+        assert Verifier(proof["A"], proof["B"], proof["C"], prepared_key=prepared_key).isValid
+    prepared = (time.perf_counter() - start) / args.single_samples
+    print(f"single verification with prepared key: {prepared:.2f} s per proof, {1 / prepared:.3f} proofs/s")
+
+    print(f"{'N':>5} {'batch [s]':>10} {'proofs/s':>9} {'speedup':>8}")
+    for n in args.sizes:
+        start = time.perf_counter()
+        assert BatchVerifier(proofs[:n], prepared_key=prepared_key).isValid
+        elapsed = time.perf_counter() - start
+        print(f"{n:>5} {elapsed:>10.2f} {n / elapsed:>9.3f} {prepared * n / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,106 @@
+import argparse
 import pickle
-import galois
+import time
+import numpy as np
 from py_ecc.bn128 import curve_order
 
 from test.utils import project_path
 
 """
 Runs the whole proving protocol with the example qap and some
-command line output to follow along
+command line output to follow along,
+--check validates the witness against the QAP before proving (for debugging)
 """
 
-print("--- Importing Setup, Prover, Verifier ---")
+parser = argparse.ArgumentParser()
+parser.add_argument("--check", action="store_true", help="check that the witness satisfies the QAP before proving")
+args = parser.parse_args()
+
+# R1CS of the example in test/example_qap.py
+L = np.array([
+    [0, 0, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, curve_order-5, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 1],
+])
+
+R = np.array([
+    [0, 0, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, 1, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+])
+
+O = np.array([
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0, 0, 1],
+    [0, 1, 0, 0, 0, curve_order-1, 0],
+])
+
+print("--- Importing QAP, Setup, Prover, Verifier ---")
+from Qap import QAP
 from Setup import Setup
 from Prover import Prover
 from Verifier import Verifier
+from FieldContext import get_field
 
+# the pickled witness is an array of the field, so it's built before loading it
 print(f"--- Building Galois field on {curve_order} ---")
-GF = galois.GF(curve_order)
+start = time.perf_counter()
+GF = get_field()
+print(f"Field built in {time.perf_counter() - start:.3f} s")
 
 with open(project_path("test", "qap_data.pkl"), "rb") as f:
     data = pickle.load(f)
 
+print("--- Interpolating the QAP ---")
+
+# the interpolated polynomials are cached by the R1CS (see QapCache.py), a rerun skips the interpolation
+pipeline_start = start = time.perf_counter()
+qap = QAP(L, R, O, curve_order)
+print(f"QAP built in {time.perf_counter() - start:.3f} s")
+
+if args.check:
+    print("QAP formula true?", qap.check(data["correct_witness"]))
+
 print("--- Constructing the Trusted Setup ---")
 
+start = time.perf_counter()
 setup = Setup(
-    out_polys=data["out_polys"],
-    left_polys=data["left_polys"],
-    right_polys=data["right_polys"],
+    out_polys=qap.W_polys,
+    left_polys=qap.U_polys,
+    right_polys=qap.V_polys,
+    domain=qap.domain,
+    coeffs=[qap.U_coeffs, qap.V_coeffs, qap.W_coeffs],
 )
 
-print(f"Setup built with tau = {setup.tau}")
+print(f"Setup built with tau = {setup.tau} in {time.perf_counter() - start:.3f} s")
 
 print("--- Constructing the Prover ---")
 
+start = time.perf_counter()
 prover = Prover(
     witness=data["correct_witness"],
-    left_polys=data["left_polys"],
-    right_polys=data["right_polys"],
-    out_polys=data["out_polys"],
+    left_polys=qap.U_polys,
+    right_polys=qap.V_polys,
+    out_polys=qap.W_polys,
     alpha_g1=setup.alpha_g1,
     beta_g2=setup.beta_g2,
     g1_srs=setup.g1_srs,
     g2_srs=setup.g2_srs,
     t_tau_srs=setup.t_tau_srs,
     psis=setup.psis,
+    a_query_g1=setup.a_query_g1,
+    b_query_g2=setup.b_query_g2,
+    domain=qap.domain,
 )
 
-print(f"Prover constructed with witness = {data["correct_witness"]} and\nA = {prover.A_1}\nB = {prover.B_2}\nC = {prover.C_1}")
+print(f"Prover constructed in {time.perf_counter() - start:.3f} s with witness = {data['correct_witness']} and\nA = {prover.A_1}\nB = {prover.B_2}\nC = {prover.C_1}")
 
 print("--- Starting Verifier ---")
 
+start = time.perf_counter()
 verifier = Verifier(
     A=prover.A_1,
     B=prover.B_2,
@@ -57,4 +109,5 @@ verifier = Verifier(
     beta_2=setup.beta_g2
 )
 
-print(f"Verifier states that proof is: {verifier.isValid}")
\ No newline at end of file
+print(f"Verifier states that proof is: {verifier.isValid} ({time.perf_counter() - start:.3f} s)")
+print(f"--- {time.perf_counter() - pipeline_start:.3f} s from the R1CS to the verified proof ---")
\ No newline at end of file
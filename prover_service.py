@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import pickle
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from Keys import point_to_json
+
+"""
+Long running prover for one circuit and setup, which keeps a CircuitProver warm
+and answers proof requests as JSON lines, on stdin/stdout or on a unix socket:
+
+request:  {"id": 1, "witness": [1, 35, 3, 9, 27, 30, 35]}
+response: {"id": 1, "proof": {"A": [x, y], "B": [[x0, x1], [y0, y1]], "C": [x, y]}}
+      or  {"id": 1, "error": "Invalid witness! (has devision remainder)"}
+
+Requests are handled concurrently, responses are written as soon as they are done,
+so they can arrive out of order and have to be matched by their id.
+Points are encoded as in Keys.point_to_json
+"""
+
+class ProverService:
+    def __init__(self, circuit_prover, threads=4):
+        self.circuit_prover = circuit_prover
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+
+    """
+    Answers a single request line
+    """
+    def handle(self, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            proof = self.circuit_prover.prove(request["witness"])
+            response = {"id": request_id, "proof": {name: point_to_json(point) for name, point in proof.items()}}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e) or type(e).__name__}
+        return json.dumps(response)
+
+    """
+    Handles every line of the iterable concurrently and passes each response line to write
+    """
+    def serve_lines(self, lines, write):
+        lock = threading.Lock()
+
+        def respond(line):
+            response = self.handle(line)
+            with lock:
+                write(response + "\n")
+
+        pending = set()
+        for line in lines:
+            if not line.strip():
+                continue
+            future = self.executor.submit(respond, line)
+            pending.add(future)
+            future.add_done_callback(pending.discard)
+        wait(list(pending))
+
+    def serve_stdio(self):
+        def write(response):
+            sys.stdout.write(response)
+            sys.stdout.flush()
+
+        self.serve_lines(sys.stdin, write)
+
+    """
+    Serves every connection to the unix socket at path in its own thread, until shutdown()
+    """
+    def serve_unix(self, path):
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                service.serve_lines(
+                    (raw.decode("utf-8") for raw in self.rfile),
+                    lambda response: self.wfile.write(response.encode("utf-8"))
+                )
+
+        if os.path.exists(path):
+            os.remove(path)
+        self.server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            os.remove(path)
+
+    def shutdown(self):
+        self.server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proves witnesses for one circuit as JSON lines service")
+    parser.add_argument("--qap", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "test", "qap_data.pkl"),
+        help="pickle with the left_polys, right_polys and out_polys of the circuit")
+    parser.add_argument("--key", help="proving key file (see Keys.py), runs a new Setup if not given")
+    parser.add_argument("--save-key", help="where to save the proving key of the new Setup")
+    parser.add_argument("--socket", help="unix socket to listen on, stdin/stdout if not given")
+    parser.add_argument("--threads", type=int, default=4, help="requests handled at the same time")
+    parser.add_argument("--workers", type=int, default=0,
+        help="worker processes for the MSMs (see Parallel.py), 0 computes them in the request threads")
+    parser.add_argument("--domain", default="integers", help="evaluation domain the qap was interpolated on")
+    parser.add_argument("--h-mode", default="division")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    log("--- Importing Prover ---")
+    from Setup import Setup
+    from Prover import CircuitProver
+    from Keys import ProvingKey
+    from Curve import JacobianBackend
+    from Domain import get_domain
+    from Parallel import MsmPool
+    from FieldContext import get_field
+
+    # the pickled polynomials are over the scalar field, which is only built on first use
+    get_field()
+    with open(args.qap, "rb") as f:
+        data = pickle.load(f)
+
+    backend = JacobianBackend()
+
+    key = ProvingKey.load(args.key) if args.key is not None else None
+
+    # x = 1..n by default, as in Setup and Prover
+    domain = None
+    if args.domain != "integers":
+        if key is not None:
+            num_constraints = len(key.g1_srs)
+        else:
+            num_constraints = max(
+                len(poly.coeffs)
+                for polys in [data["left_polys"], data["right_polys"], data["out_polys"]]
+                for poly in polys
+            )
+        domain = get_domain(args.domain, num_constraints)
+
+    if key is None:
+        log("--- No proving key given, constructing a new Setup ---")
+        key = ProvingKey.from_setup(Setup(
+            out_polys=data["out_polys"],
+            left_polys=data["left_polys"],
+            right_polys=data["right_polys"],
+            backend=backend,
+            domain=domain
+        ).get_setup())
+        if args.save_key is not None:
+            key.save(args.save_key)
+            key.verification_key().save(args.save_key + ".vk")
+            log(f"Keys saved to {args.save_key} and {args.save_key}.vk")
+
+    pool = MsmPool(workers=args.workers, backend=backend) if args.workers > 0 else None
+    circuit_prover = CircuitProver(
+        data["left_polys"], data["right_polys"], data["out_polys"],
+        key.alpha_g1, key.beta_g2, key.g1_srs, key.g2_srs, key.t_tau_srs, key.psis,
+        a_query_g1=key.a_query_g1, b_query_g2=key.b_query_g2,
+        backend=backend, domain=domain, h_mode=args.h_mode, pool=pool
+    )
+
+    service = ProverService(circuit_prover, threads=args.threads)
+    try:
+        if args.socket is not None:
+            log(f"--- Listening on {args.socket} ---")
+            service.serve_unix(args.socket)
+        else:
+            log("--- Reading requests from stdin ---")
+            service.serve_stdio()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        circuit_prover.close()
+        if pool is not None:
+            pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import pickle
+import unittest
+from py_ecc.bn128 import G1, G2, multiply, curve_order
+from utils import project_path
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Ceremony import PowersOfTau, verify_contribution
+from Setup import Setup
+from Curve import JacobianBackend
+from Parallel import MsmPool
+from FieldContext import get_field
+
+class TestCeremony(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = JacobianBackend()
+        cls.secrets = [7, 11, 13]
+        cls.num_powers = 6
+
+        # local simulation of three contributors, each building on the previous powers
+        cls.rounds = [PowersOfTau.new(cls.num_powers)]
+        for secret in cls.secrets:
+            cls.rounds.append(cls.rounds[-1].contribute(secret, backend=cls.backend, chunk_size=4))
+
+    """
+    Checks that the final powers are the powers of the product of all secrets
+    """
+    def test_00_powers_of_combined_secret(self):
+        tau = 7 * 11 * 13
+        final = self.rounds[-1]
+        self.assertEqual(final.g1_powers, [multiply(G1, tau**i) for i in range(self.num_powers)])
+        self.assertEqual(final.g2_powers, [multiply(G2, tau**i) for i in range(self.num_powers)])
+        self.assertEqual(final.contributions, [multiply(G2, secret) for secret in self.secrets])
+
+    """
+    Checks the consistency checks of every contribution of the simulation
+    """
+    def test_01_verify_contributions(self):
+        for previous, updated in zip(self.rounds[:-1], self.rounds[1:]):
+            self.assertTrue(verify_contribution(previous, updated, backend=self.backend))
+
+        # a contribution has to build on the previous powers
+        self.assertFalse(verify_contribution(self.rounds[2], self.rounds[1].contribute(5, backend=self.backend)))
+
+    """
+    Checks that malformed powers are detected
+    """
+    def test_02_malformed_powers(self):
+        final = self.rounds[-1]
+
+        g1_powers = list(final.g1_powers)
+        g1_powers[3] = multiply(g1_powers[3], 2)
+        self.assertFalse(PowersOfTau(g1_powers, final.g2_powers, final.contributions).is_well_formed(self.backend))
+
+        g2_powers = list(final.g2_powers)
+        g2_powers[2], g2_powers[4] = g2_powers[4], g2_powers[2]
+        self.assertFalse(PowersOfTau(final.g1_powers, g2_powers, final.contributions).is_well_formed(self.backend))
+
+        # [s]_2 not matching the rescaling
+        forged = PowersOfTau(final.g1_powers, final.g2_powers, final.contributions[:-1] + [multiply(G2, 17)])
+        self.assertFalse(verify_contribution(self.rounds[-2], forged, backend=self.backend))
+
+    """
+    Checks the rescaling on a process pool and the srs's in the order of the Setup
+    """
+    def test_03_pool_and_srs(self):
+        with MsmPool(workers=2, backend=self.backend, min_chunk=2) as pool:
+            updated = self.rounds[-2].contribute(13, pool=pool)
+        self.assertEqual(updated.g1_powers, self.rounds[-1].g1_powers)
+        self.assertEqual(updated.g2_powers, self.rounds[-1].g2_powers)
+
+        # the pickled polynomials are over the scalar field, which is only built on first use
+        get_field()
+        with open(project_path("test", "qap_data.pkl"), "rb") as f:
+            data = pickle.load(f)
+        setup = Setup(
+            out_polys=data["out_polys"],
+            left_polys=data["left_polys"],
+            right_polys=data["right_polys"],
+            tau=7 * 11 * 13,
+            backend=self.backend
+        )
+        srs = self.rounds[-1].srs(setup.num_constraints)
+        self.assertEqual(srs["g1_srs"], setup.g1_srs)
+        self.assertEqual(srs["g2_srs"], setup.g2_srs)
+
+        with self.assertRaises(ValueError):
+            self.rounds[-1].srs(self.num_powers + 1)
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestCeremony)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
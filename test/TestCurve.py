@@ -0,0 +1,105 @@
+import random
+import unittest
+from py_ecc.bn128 import G1, G2, multiply, add, double, neg, curve_order, field_modulus
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Curve import JacobianBackend, PyEccBackend, FqOps, Fq2Ops, batch_inverse
+
+class TestCurve(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = random.Random(7)
+        cls.backend = JacobianBackend()
+
+    """
+    Checks the group law of the Jacobian backend against py_ecc's affine one in G1 and G2
+    """
+    def test_00_group_law_matches_py_ecc(self):
+        for generator in [G1, G2]:
+            group = self.backend.group_of(generator)
+            p_affine = multiply(generator, 5)
+            q_affine = multiply(generator, 11)
+            p = group.multiply(group.from_affine(generator), 5)
+            q = group.from_affine(q_affine)
+
+            self.assertEqual(group.to_affine(group.add(p, q)), add(p_affine, q_affine))
+            self.assertEqual(group.to_affine(group.add(q, p)), add(p_affine, q_affine))
+            self.assertEqual(group.to_affine(group.add(p, p)), double(p_affine))
+            self.assertEqual(group.to_affine(group.double(p)), double(p_affine))
+            self.assertEqual(group.to_affine(group.neg(p)), neg(p_affine))
+
+            # P + (-P) and the neutral element
+            self.assertIsNone(group.to_affine(group.add(p, group.neg(p))))
+            self.assertEqual(group.to_affine(group.add(group.zero, p)), p_affine)
+            self.assertEqual(group.to_affine(group.add(p, group.zero)), p_affine)
+
+    """
+    Checks scalar multiplication including the edge cases 0, 1 and curve_order - 1
+    """
+    def test_01_multiply_matches_py_ecc(self):
+        scalars = [0, 1, 2, curve_order - 1, curve_order, self.rng.randint(0, curve_order - 1)]
+        for generator in [G1, G2]:
+            group = self.backend.group_of(generator)
+            base = group.from_affine(generator)
+            for scalar in scalars:
+                self.assertEqual(
+                    group.to_affine(group.multiply(base, scalar)),
+                    multiply(generator, scalar % curve_order)
+                )
+
+    """
+    Checks that normalizing many points with one inversion
+    gives the same points as normalizing them one by one
+    """
+    def test_02_batch_to_affine(self):
+        for generator in [G1, G2]:
+            group = self.backend.group_of(generator)
+            base = group.from_affine(generator)
+            points = [group.multiply(base, k) for k in [3, 0, 7, 1]]
+
+            self.assertEqual(
+                group.batch_to_affine(points),
+                [multiply(generator, 3), None, multiply(generator, 7), generator]
+            )
+            self.assertEqual(group.batch_to_affine([]), [])
+
+    """
+    Checks Montgomery's batch inversion in Fq and Fq2
+    """
+    def test_03_batch_inverse(self):
+        elements = [self.rng.randint(1, field_modulus - 1) for _ in range(5)]
+        for element, inverse in zip(elements, batch_inverse(FqOps, elements)):
+            self.assertEqual(FqOps.mul(element, inverse), 1)
+
+        elements = [(self.rng.randint(1, field_modulus - 1), self.rng.randint(0, field_modulus - 1)) for _ in range(5)]
+        for element, inverse in zip(elements, batch_inverse(Fq2Ops, elements)):
+            self.assertEqual(Fq2Ops.mul(element, inverse), (1, 0))
+
+    """
+    Checks that the reference backend is plain py_ecc arithmetic
+    """
+    def test_04_py_ecc_backend(self):
+        group = PyEccBackend().group_of(G2)
+        self.assertEqual(group.multiply(G2, 9), multiply(G2, 9))
+        self.assertEqual(group.batch_to_affine([G2, None]), [G2, None])
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestCurve)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+    
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,120 @@
+import random
+import unittest
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Domain import ntt, intt, root_of_unity, get_domain, IntegerDomain, RootsOfUnityDomain
+
+class TestDomain(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = random.Random(5)
+
+    """
+    Evaluates a polynomial given by its coefficients (lowest power first) at x
+    """
+    @staticmethod
+    def eval_asc(coeffs, x):
+        res = 0
+        for coeff in reversed(list(coeffs)):
+            res = (res * x + int(coeff)) % curve_order
+        return res
+
+    """
+    Checks that the roots of unity have exactly the requested order
+    """
+    def test_00_root_of_unity(self):
+        for n in [1, 2, 8, 2**28]:
+            omega = root_of_unity(n)
+            self.assertEqual(pow(omega, n, curve_order), 1)
+            if n > 1:
+                self.assertEqual(pow(omega, n // 2, curve_order), curve_order - 1)
+
+        with self.assertRaises(ValueError):
+            root_of_unity(6)
+        with self.assertRaises(ValueError):
+            root_of_unity(2**29)
+
+    """
+    Checks the NTT against direct evaluation and the inverse NTT as its inverse
+    """
+    def test_01_ntt_roundtrip(self):
+        n = 16
+        omega = root_of_unity(n)
+        coeffs = [self.rng.randint(0, curve_order - 1) for _ in range(n)]
+
+        evaluations = ntt(coeffs, omega)
+        for i in range(n):
+            self.assertEqual(evaluations[i], self.eval_asc(coeffs, pow(omega, i, curve_order)))
+
+        self.assertEqual(list(intt(evaluations, omega)), coeffs)
+
+    """
+    Checks that a whole matrix is interpolated column by column in one pass,
+    padded with zero rows up to the next power of two
+    """
+    def test_02_batched_interpolation(self):
+        domain = RootsOfUnityDomain(5)
+        self.assertEqual(domain.size, 8)
+
+        matrix = np.array([
+            [self.rng.randint(0, curve_order - 1) for _ in range(3)]
+            for _ in range(5)
+        ], dtype=object)
+        coeffs = domain.interpolate(matrix)
+        self.assertEqual(coeffs.shape, (8, 3))
+
+        points = domain.points()
+        for col in range(3):
+            for row in range(8):
+                expected = matrix[row, col] if row < 5 else 0
+                self.assertEqual(self.eval_asc(coeffs[:, col], points[row]), expected)
+
+        self.assertTrue(np.all(domain.evaluate(coeffs)[:5] == matrix))
+
+    """
+    Checks t(x) of both domains: coefficients and evaluation agree and t vanishes on the domain
+    """
+    def test_03_vanishing_polynomials(self):
+        for domain in [IntegerDomain(4), RootsOfUnityDomain(4)]:
+            coeffs = domain.vanishing_coeffs()
+            self.assertEqual(len(coeffs), domain.size + 1)
+
+            for point in domain.points():
+                self.assertEqual(domain.vanishing_at(point), 0)
+
+            x = self.rng.randint(0, curve_order - 1)
+            self.assertEqual(self.eval_asc(reversed(coeffs), x), domain.vanishing_at(x))
+
+        self.assertEqual(IntegerDomain(4).vanishing_at(7), 6 * 5 * 4 * 3)
+
+    """
+    Checks the lookup of domains by name
+    """
+    def test_04_get_domain(self):
+        self.assertIsInstance(get_domain("integers", 3), IntegerDomain)
+        self.assertIsInstance(get_domain("roots", 3), RootsOfUnityDomain)
+        with self.assertRaises(ValueError):
+            get_domain("cosets", 3)
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestDomain)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+    
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
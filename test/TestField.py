@@ -0,0 +1,109 @@
+import random
+import unittest
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Field import FieldArray
+
+class TestField(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # deterministic "random" elements, plus the edge cases
+        rng = random.Random(16)
+        edge = [0, 1, 2, curve_order - 1, curve_order - 2, 2**32 - 1, 2**32, 2**224]
+        cls.a = edge + [rng.randrange(curve_order) for _ in range(200)]
+        cls.b = list(reversed(edge)) + [rng.randrange(curve_order) for _ in range(200)]
+        cls.A = FieldArray.from_ints(cls.a)
+        cls.B = FieldArray.from_ints(cls.b)
+
+    """
+    Checks the conversion from and back to python ints, also of unreduced and negative ints
+    """
+    def test_00_round_trip(self):
+        self.assertEqual(list(self.A.to_ints()), self.a)
+        self.assertEqual(list(FieldArray.from_ints([curve_order, curve_order + 3, -1]).to_ints()), [0, 3, curve_order - 1])
+
+        matrix = FieldArray.from_ints([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(matrix.to_ints().tolist(), [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(list(matrix[:, 1].to_ints()), [2, 5])
+
+    """
+    Checks the element wise operations against python ints modulo the curve order
+    """
+    def test_01_arithmetic(self):
+        pairs = list(zip(self.a, self.b))
+        self.assertEqual(list((self.A + self.B).to_ints()), [(x + y) % curve_order for x, y in pairs])
+        self.assertEqual(list((self.A - self.B).to_ints()), [(x - y) % curve_order for x, y in pairs])
+        self.assertEqual(list((self.A * self.B).to_ints()), [(x * y) % curve_order for x, y in pairs])
+        self.assertEqual(list((-self.A).to_ints()), [-x % curve_order for x in self.a])
+
+        # a single int is broadcast
+        self.assertEqual(list((self.A * 7).to_ints()), [(x * 7) % curve_order for x in self.a])
+        self.assertEqual(list((1 - self.A).to_ints()), [(1 - x) % curve_order for x in self.a])
+        self.assertTrue(all(self.A == self.a))
+
+    """
+    Checks the batch inversion, which must refuse zero
+    """
+    def test_02_inverse(self):
+        nonzero = [x for x in self.a if x != 0]
+        inverses = FieldArray.from_ints(nonzero).inverse()
+        self.assertEqual(list(inverses.to_ints()), [pow(x, -1, curve_order) for x in nonzero])
+
+        with self.assertRaises(ZeroDivisionError):
+            FieldArray.from_ints([3, 0, 5]).inverse()
+
+    """
+    Checks the batch polynomial evaluation and the matrix vector product, including a shape mismatch
+    """
+    def test_03_evaluate_and_matvec(self):
+        rows = [self.a[:10], self.b[:10], [0] * 10]
+        x = self.a[20]
+        expected = [sum(c * pow(x, i, curve_order) for i, c in enumerate(row)) % curve_order for row in rows]
+        self.assertEqual(list(FieldArray.from_ints(rows).evaluate(x).to_ints()), expected)
+
+        vector = [0, 1, curve_order - 1, 0, 5, 0, 0, 0, 0, self.a[30]]
+        expected = [sum(c * v for c, v in zip(row, vector)) % curve_order for row in rows]
+        self.assertEqual(list(FieldArray.from_ints(rows).matvec(vector).to_ints()), expected)
+
+        # a vector of another length than the rows must not be read past or cut off
+        for wrong in [vector + [1] * 6, vector[:9], [vector, vector]]:
+            with self.assertRaises(ValueError):
+                FieldArray.from_ints(rows).matvec(wrong)
+
+    """
+    Checks the matrix product against python ints, including zero entries and a shape mismatch
+    """
+    def test_04_matmul(self):
+        left = [self.a[:6], [0] * 6, self.b[:6], [0, 0, 1, 0, curve_order - 1, 0]]
+        right = [self.a[10 + 3 * i:13 + 3 * i] for i in range(6)]
+        expected = [
+            [sum(left[r][i] * right[i][c] for i in range(6)) % curve_order for c in range(3)]
+            for r in range(4)
+        ]
+        self.assertEqual(FieldArray.from_ints(left).matmul(right).to_ints().tolist(), expected)
+
+        with self.assertRaises(ValueError):
+            FieldArray.from_ints(left).matmul(left)
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestField)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from py_ecc.bn128 import G1, G2, multiply, curve_order
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from FixedBase import FixedBaseTable, fixed_base_window
+from Curve import JacobianBackend, PyEccBackend
+
+class TestFixedBase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = random.Random(3)
+        cls.scalars = [0, 1, 2, 15, 16, curve_order - 1, curve_order, cls.rng.randint(0, curve_order - 1)]
+
+    """
+    Checks table multiplication against py_ecc for several window widths in G1 and G2
+    """
+    def test_00_matches_py_ecc(self):
+        backend = JacobianBackend()
+        for generator in [G1, G2]:
+            expected = [multiply(generator, s % curve_order) for s in self.scalars]
+            for window in [1, 4, 7]:
+                table = FixedBaseTable(backend.group_of(generator), generator, window)
+                self.assertEqual(table.multiply_all(self.scalars), expected)
+
+    """
+    Checks the table with py_ecc's affine backend and a base other than the generator
+    """
+    def test_01_py_ecc_backend(self):
+        base = multiply(G1, 12345)
+        table = FixedBaseTable(PyEccBackend().g1, base, 3)
+        self.assertEqual(
+            table.multiply_all(self.scalars),
+            [multiply(base, s % curve_order) for s in self.scalars]
+        )
+
+    """
+    Checks that more multiplications lead to wider windows
+    """
+    def test_02_window_choice(self):
+        self.assertLessEqual(fixed_base_window(1), fixed_base_window(1000))
+        self.assertLess(fixed_base_window(10), fixed_base_window(100000))
+        self.assertLessEqual(fixed_base_window(10**9, max_window=8), 8)
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestFixedBase)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+    
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,93 @@
+import random
+import unittest
+from py_ecc.bn128 import G1, G2, multiply, curve_order, field_modulus
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Glv import BETA, LAMBDA, A1, B1, A2, B2, decompose, endomorphism
+from Curve import JacobianBackend
+from Msm import msm, naive_msm
+
+class TestGlv(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # deterministic "random" points and scalars
+        cls.rng = random.Random(15)
+        cls.backend = JacobianBackend()
+        cls.group = cls.backend.g1
+
+        cls.points = [multiply(G1, cls.rng.randint(1, curve_order - 1)) for _ in range(8)]
+        cls.edge_scalars = [0, 1, 2, curve_order - 1, curve_order - 2, curve_order, LAMBDA, curve_order - LAMBDA]
+
+    """
+    Checks the constants: cube roots of unity, phi(P) = lambda * P and the lattice basis
+    """
+    def test_00_constants(self):
+        self.assertEqual(pow(BETA, 3, field_modulus), 1)
+        self.assertEqual(pow(LAMBDA, 3, curve_order), 1)
+        self.assertEqual((A1 + B1 * LAMBDA) % curve_order, 0)
+        self.assertEqual((A2 + B2 * LAMBDA) % curve_order, 0)
+
+        for point in [G1] + self.points[:2]:
+            self.assertEqual(endomorphism(point), multiply(point, LAMBDA))
+        self.assertIsNone(endomorphism(None))
+
+    """
+    Checks that k = k1 + k2 * lambda with halves of at most 128 bits, for random and edge case scalars
+    """
+    def test_01_decompose(self):
+        scalars = self.edge_scalars + [self.rng.randint(0, curve_order - 1) for _ in range(200)]
+        for k in scalars:
+            k1, k2 = decompose(k)
+            self.assertEqual((k1 + k2 * LAMBDA) % curve_order, k % curve_order)
+            self.assertLessEqual(abs(k1).bit_length(), 128)
+            self.assertLessEqual(abs(k2).bit_length(), 128)
+
+        self.assertEqual(decompose(0), (0, 0))
+
+    """
+    Checks the GLV scalar multiplication against py_ecc's for random and edge case scalars
+    """
+    def test_02_multiply_matches_py_ecc(self):
+        scalars = self.edge_scalars + [self.rng.randint(0, curve_order - 1) for _ in range(20)]
+        for point in [G1, self.points[0]]:
+            for k in scalars:
+                res = self.group.to_affine(self.group.multiply(self.group.from_affine(point), k))
+                self.assertEqual(res, multiply(point, k % curve_order))
+
+        # the point at infinity stays there
+        self.assertTrue(self.group.is_zero(self.group.multiply(self.group.zero, 5)))
+
+    """
+    Checks the MSM with GLV split terms against the naive loop, also with edge case scalars
+    """
+    def test_03_msm_matches_naive(self):
+        points = self.points + self.points[:len(self.edge_scalars)]
+        scalars = [self.rng.randint(0, curve_order - 1) for _ in self.points] + self.edge_scalars
+        self.assertEqual(msm(points, scalars, backend=self.backend), naive_msm(points, scalars))
+
+        # lambda and -lambda split into (0, +-1), so the sum cancels out
+        self.assertIsNone(msm([G1, G1], [LAMBDA, curve_order - LAMBDA], backend=self.backend))
+
+        # G2 has no endomorphism in this backend and is unaffected
+        self.assertEqual(msm([G2, G2], [curve_order - 1, 3], backend=self.backend), multiply(G2, 2))
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestGlv)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
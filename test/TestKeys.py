@@ -0,0 +1,151 @@
+import os
+import pickle
+import tempfile
+import unittest
+from py_ecc.bn128 import curve_order
+from utils import project_path
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Setup import Setup
+from Prover import Prover
+from Keys import ProvingKey, VerificationKey, PointSection, HEADER, SECTION
+from Curve import JacobianBackend
+from FieldContext import get_field
+
+class TestKeys(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the pickled polynomials are over the scalar field, which is only built on first use
+        get_field()
+        with open(project_path("test", "qap_data.pkl"), "rb") as f:
+            cls.data = pickle.load(f)
+
+        cls.setup_data = Setup(
+            out_polys=cls.data["out_polys"],
+            left_polys=cls.data["left_polys"],
+            right_polys=cls.data["right_polys"],
+            tau=7,
+            alpha=3,
+            beta=5,
+            backend=JacobianBackend()
+        ).get_setup()
+
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.pk_path = os.path.join(cls.tmp_dir.name, "proving.key")
+        cls.vk_path = os.path.join(cls.tmp_dir.name, "verification.key")
+
+        cls.pk = ProvingKey.from_setup(cls.setup_data)
+        cls.pk.save(cls.pk_path)
+        cls.pk.verification_key().save(cls.vk_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    """
+    Checks that a saved and loaded proving key holds exactly the points of the setup
+    """
+    def test_00_proving_key_round_trip(self):
+        with ProvingKey.load(self.pk_path) as pk:
+            loaded = pk.get_setup()
+            self.assertEqual(set(loaded), set(self.setup_data))
+            for name, points in self.setup_data.items():
+                if isinstance(points, list):
+                    self.assertIsInstance(loaded[name], PointSection)
+                    self.assertEqual(len(loaded[name]), len(points))
+                    self.assertEqual(list(loaded[name]), points)
+                    self.assertEqual(loaded[name][1:], points[1:])
+                    self.assertEqual(loaded[name][-1], points[-1])
+                else:
+                    self.assertEqual(loaded[name], points)
+            pk.validate()
+
+    """
+    Checks the verification key round trip and the file size of the fixed-width format
+    """
+    def test_01_verification_key_round_trip(self):
+        with VerificationKey.load(self.vk_path) as vk:
+            self.assertEqual(vk.alpha_g1, self.setup_data["alpha_g1"])
+            self.assertEqual(vk.beta_g2, self.setup_data["beta_g2"])
+
+        # header, two section entries, one G1 and one G2 point
+        self.assertEqual(os.path.getsize(self.vk_path), HEADER.size + 2 * SECTION.size + 64 + 128)
+
+    """
+    Checks that the point at infinity survives the round trip
+    """
+    def test_02_point_at_infinity(self):
+        setup_data = dict(self.setup_data)
+        setup_data["psis"] = [None] + setup_data["psis"][1:]
+        path = os.path.join(self.tmp_dir.name, "infinity.key")
+        ProvingKey.from_setup(setup_data).save(path)
+
+        with ProvingKey.load(path) as pk:
+            self.assertIsNone(pk.psis[0])
+            self.assertEqual(pk.psis[1:], setup_data["psis"][1:])
+
+    """
+    Checks that the prover gives the same proof with a memory mapped key
+    """
+    def test_03_prove_with_loaded_key(self):
+        def prove(key):
+            return Prover(
+                witness=self.data["correct_witness"],
+                left_polys=self.data["left_polys"],
+                right_polys=self.data["right_polys"],
+                out_polys=self.data["out_polys"],
+                alpha_g1=key["alpha_g1"],
+                beta_g2=key["beta_g2"],
+                g1_srs=key["g1_srs"],
+                g2_srs=key["g2_srs"],
+                t_tau_srs=key["t_tau_srs"],
+                psis=key["psis"],
+                backend=JacobianBackend()
+            ).get_proof()
+
+        with ProvingKey.load(self.pk_path) as pk:
+            self.assertEqual(prove(pk.get_setup()), prove(self.setup_data))
+
+    """
+    Checks that wrong or damaged files are rejected
+    """
+    def test_04_rejects_invalid_files(self):
+        with open(self.pk_path, "rb") as f:
+            content = f.read()
+
+        def write(name, data):
+            path = os.path.join(self.tmp_dir.name, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            return path
+
+        # a verification key is no proving key
+        with self.assertRaises(ValueError):
+            ProvingKey.load(self.vk_path)
+        with self.assertRaises(ValueError):
+            ProvingKey.load(write("empty.key", b""))
+        with self.assertRaises(ValueError):
+            ProvingKey.load(write("truncated.key", content[:-1]))
+        with self.assertRaises(ValueError):
+            ProvingKey.load(write("version.key", content[:4] + b"\x63\x00" + content[6:]))
+
+        # a point that is not on the curve
+        damaged = bytearray(content)
+        damaged[-1] ^= 1
+        with ProvingKey.load(write("damaged.key", bytes(damaged))) as pk:
+            with self.assertRaises(ValueError):
+                pk.validate()
+
+def run_tests():
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestKeys)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,142 @@
+import random
+import unittest
+from py_ecc.bn128 import G1, G2, multiply, curve_order
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Msm import msm, naive_msm, window_size, set_scalar_stats_hook, SMALL_SCALAR_BOUND, BatchMsm
+from Curve import JacobianBackend
+
+class TestMsm(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # deterministic "random" points and scalars
+        cls.rng = random.Random(42)
+
+        cls.g1_points = [multiply(G1, cls.rng.randint(1, 1000)) for _ in range(40)]
+        cls.g2_points = [multiply(G2, cls.rng.randint(1, 1000)) for _ in range(12)]
+
+    def random_scalars(self, n):
+        return [self.rng.randint(0, curve_order - 1) for _ in range(n)]
+
+    """
+    Checks that the bucket method matches the naive loop in G1
+    """
+    def test_00_g1_matches_naive(self):
+        scalars = self.random_scalars(len(self.g1_points))
+        self.assertEqual(
+            msm(self.g1_points, scalars),
+            naive_msm(self.g1_points, scalars)
+        )
+
+    """
+    Checks that the bucket method matches the naive loop in G2
+    """
+    def test_01_g2_matches_naive(self):
+        scalars = self.random_scalars(len(self.g2_points))
+        self.assertEqual(
+            msm(self.g2_points, scalars),
+            naive_msm(self.g2_points, scalars)
+        )
+
+    """
+    Checks the edge cases of scalars (0, 1, -1 and unreduced ones) and points at infinity
+    """
+    def test_02_edge_cases(self):
+        points = self.g1_points[:6] + [None]
+        scalars = [0, 1, curve_order - 1, curve_order, curve_order + 5, 2, 7]
+        self.assertEqual(msm(points, scalars), naive_msm(points, scalars))
+
+        # sums cancelling out to the point at infinity
+        self.assertIsNone(msm([G1, G1], [1, curve_order - 1]))
+        self.assertIsNone(msm([], []))
+        self.assertIsNone(msm([G1], [0]))
+
+    """
+    Checks that the result does not depend on the window size
+    """
+    def test_03_explicit_windows(self):
+        points = self.g1_points[:10]
+        scalars = self.random_scalars(len(points))
+        expected = naive_msm(points, scalars)
+
+        for c in [1, 2, 5, 8]:
+            self.assertEqual(msm(points, scalars, window=c), expected)
+
+        self.assertGreater(window_size(2**14), window_size(2**8))
+
+    """
+    Checks that the Jacobian backend gives the same points as the py_ecc one
+    """
+    def test_04_jacobian_backend(self):
+        backend = JacobianBackend()
+        for points in [self.g1_points, self.g2_points]:
+            scalars = self.random_scalars(len(points))
+            self.assertEqual(
+                msm(points, scalars, backend=backend),
+                naive_msm(points, scalars)
+            )
+
+        self.assertIsNone(msm([G1, G1], [1, curve_order - 1], backend=backend))
+
+    """
+    Checks the classification of the scalars into zeros, ones, small and large ones
+    and that mixing all classes still gives the naive sum
+    """
+    def test_05_scalar_classes(self):
+        stats = []
+        set_scalar_stats_hook(stats.append)
+        try:
+            points = self.g1_points[:12] + [None]
+            scalars = [0, curve_order, 1, curve_order + 1, 1, 2, 7, SMALL_SCALAR_BOUND - 1,
+                SMALL_SCALAR_BOUND, curve_order - 1] + self.random_scalars(2) + [5]
+            for backend in [None, JacobianBackend()]:
+                self.assertEqual(msm(points, scalars, backend=backend), naive_msm(points, scalars))
+
+            # the random scalars are large with overwhelming probability
+            self.assertEqual(stats[-1], {"zero": 3, "one": 3, "small": 3, "large": 4})
+
+            self.assertEqual(msm(self.g2_points[:3], [1, 1, 3]), naive_msm(self.g2_points[:3], [1, 1, 3]))
+            self.assertEqual(stats[-1], {"zero": 0, "one": 2, "small": 1, "large": 0})
+        finally:
+            set_scalar_stats_hook(None)
+
+    """
+    Checks the MSMs of several scalar vectors over the same points in G1 (GLV) and G2,
+    with and without backend and with an explicit window
+    """
+    def test_06_batch_msm(self):
+        for points in [self.g1_points[:10] + [None], self.g2_points[:5] + [None]]:
+            vectors = [
+                self.random_scalars(len(points)),
+                [0] * len(points),
+                [1, 2, curve_order - 1, curve_order] + [0] * (len(points) - 4),
+                self.random_scalars(len(points)),
+            ]
+            expected = [naive_msm(points, scalars) for scalars in vectors]
+            for backend, window in [(None, None), (JacobianBackend(), None), (JacobianBackend(), 5)]:
+                self.assertEqual(BatchMsm(points, backend=backend, window=window).msm(vectors), expected)
+
+        self.assertEqual(BatchMsm([None, None]).msm([[1, 2]]), [None])
+        with self.assertRaises(ValueError):
+            BatchMsm(self.g1_points[:3]).msm([[1, 2]])
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestMsm)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+    
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
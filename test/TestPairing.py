@@ -0,0 +1,74 @@
+import unittest
+from py_ecc.bn128 import G1, G2, FQ, FQ12, multiply, neg, curve_order, pairing as py_ecc_pairing
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Pairing import pairing, miller_loop, final_exponentiate, g2_lines, multi_pairing_check
+
+class TestPairing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.P = multiply(G1, 1234567)
+        cls.Q = multiply(G2, 7654321)
+
+    """
+    Checks the pairing against py_ecc's
+    """
+    def test_00_matches_py_ecc(self):
+        self.assertEqual(pairing(self.P, self.Q), py_ecc_pairing(self.Q, self.P))
+
+    """
+    Checks bilinearity with a product of Miller loops and one final exponentiation,
+    e(a * P, Q) * e(-P, a * Q) == 1
+    """
+    def test_01_product_of_miller_loops(self):
+        a = curve_order - 5
+        pairs = [(multiply(self.P, a), self.Q), (neg(self.P), multiply(self.Q, a))]
+        self.assertEqual(final_exponentiate(miller_loop(pairs)), FQ12.one())
+
+        pairs[0] = (multiply(self.P, a + 1), self.Q)
+        self.assertNotEqual(final_exponentiate(miller_loop(pairs)), FQ12.one())
+
+    """
+    Checks that precomputed lines give the same Miller loop as the G2 point
+    """
+    def test_02_precomputed_lines(self):
+        self.assertEqual(miller_loop([(self.P, g2_lines(self.Q))]), miller_loop([(self.P, self.Q)]))
+
+    """
+    Checks pairs with the point at infinity and points not on the curve
+    """
+    def test_03_edge_cases(self):
+        self.assertEqual(miller_loop([(None, self.Q), (self.P, None)]), FQ12.one())
+        self.assertEqual(miller_loop([]), FQ12.one())
+
+        with self.assertRaises(ValueError):
+            miller_loop([((FQ(1), FQ(1)), self.Q)])
+
+    """
+    Checks the product check with the verifying equation of a synthetic proof,
+    e(A, B) * e(-C, G2) * e(-alpha, beta) == 1 for C = (a * b - alpha * beta) * G1
+    """
+    def test_04_multi_pairing_check(self):
+        a, b, alpha, beta = 11, 13, 3, 5
+        A, B = multiply(G1, a), multiply(G2, b)
+        alpha_1, beta_2 = multiply(G1, alpha), multiply(G2, beta)
+        C = multiply(G1, a * b - alpha * beta)
+
+        self.assertTrue(multi_pairing_check([(A, B), (neg(C), G2), (neg(alpha_1), beta_2)]))
+        self.assertFalse(multi_pairing_check([(A, B), (C, G2), (neg(alpha_1), beta_2)]))
+        self.assertTrue(multi_pairing_check([]))
+
+def run_tests():
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestPairing)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,134 @@
+import pickle
+import random
+import unittest
+from py_ecc.bn128 import G1, G2, multiply, curve_order
+from utils import project_path
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Parallel import MsmPool
+from Msm import msm
+from Setup import Setup
+from Prover import Prover, CircuitProver
+from Curve import JacobianBackend, PyEccBackend
+from FieldContext import get_field
+
+"""
+Type of the G1 group of a worker's backend
+"""
+def _worker_g1_type():
+    import Parallel
+    return type(Parallel._worker_backend.g1)
+
+class TestParallel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = random.Random(11)
+        cls.backend = JacobianBackend()
+        # small chunks, so even these short MSMs are split across the workers
+        cls.pool = MsmPool(workers=3, backend=cls.backend, min_chunk=4)
+
+        cls.g1_points = [multiply(G1, cls.rng.randint(1, curve_order - 1)) for _ in range(20)]
+        cls.g2_points = [multiply(G2, cls.rng.randint(1, curve_order - 1)) for _ in range(10)]
+        cls.g1_points[3] = None
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def random_scalars(self, n):
+        scalars = [self.rng.randint(0, curve_order - 1) for _ in range(n)]
+        scalars[1] = 0
+        return scalars
+
+    """
+    Checks the chunked MSMs against the serial MSM, in G1 and G2 at once
+    """
+    def test_00_matches_serial_msm(self):
+        g1_scalars = self.random_scalars(len(self.g1_points))
+        g2_scalars = self.random_scalars(len(self.g2_points))
+
+        results = self.pool.msm_many([(self.g1_points, g1_scalars), (self.g2_points, g2_scalars)])
+
+        self.assertEqual(results, [msm(self.g1_points, g1_scalars), msm(self.g2_points, g2_scalars)])
+        self.assertIsNone(self.pool.msm(self.g1_points, [0] * len(self.g1_points)))
+
+    """
+    Checks that points shared once can be used for several MSMs
+    """
+    def test_01_shared_points(self):
+        shared = self.pool.share(self.g2_points)
+        try:
+            for _ in range(2):
+                scalars = self.random_scalars(len(self.g2_points))
+                self.assertEqual(self.pool.msm(shared, scalars), msm(self.g2_points, scalars))
+        finally:
+            shared.close()
+
+    """
+    Checks that the prover gives the same proof with the pool
+    """
+    def test_02_parallel_prover(self):
+        # the pickled polynomials are over the scalar field, which is only built on first use
+        get_field()
+        with open(project_path("test", "qap_data.pkl"), "rb") as f:
+            data = pickle.load(f)
+
+        setup_data = Setup(data["out_polys"], data["left_polys"], data["right_polys"], backend=self.backend).get_setup()
+
+        def prove(pool):
+            return Prover(
+                witness=data["correct_witness"],
+                left_polys=data["left_polys"],
+                right_polys=data["right_polys"],
+                out_polys=data["out_polys"],
+                alpha_g1=setup_data["alpha_g1"],
+                beta_g2=setup_data["beta_g2"],
+                g1_srs=setup_data["g1_srs"],
+                g2_srs=setup_data["g2_srs"],
+                t_tau_srs=setup_data["t_tau_srs"],
+                psis=setup_data["psis"],
+                backend=self.backend,
+                pool=pool
+            ).get_proof()
+
+        self.assertEqual(prove(self.pool), prove(None))
+
+        # the MSMs of a whole batch on the pool
+        args = [data[name] for name in ["left_polys", "right_polys", "out_polys"]] + [
+            setup_data[name] for name in ["alpha_g1", "beta_g2", "g1_srs", "g2_srs", "t_tau_srs", "psis"]
+        ]
+        witnesses = [data["correct_witness"]] * 2
+        with CircuitProver(*args, backend=self.backend, pool=self.pool) as circuit_prover:
+            self.assertEqual(circuit_prover.prove_batch(witnesses), [prove(None)] * 2)
+
+    """
+    Checks that the workers get the backend's configuration, not a default backend of its class
+    """
+    def test_03_backend_configuration(self):
+        for backend in [JacobianBackend(glv=False), JacobianBackend(glv=True), PyEccBackend()]:
+            # the pool's initializer gets the backend pickled
+            copy = pickle.loads(pickle.dumps(backend))
+            self.assertIs(type(copy), type(backend))
+            self.assertIs(type(copy.g1), type(backend.g1))
+            self.assertIs(type(copy.g2), type(backend.g2))
+
+        backend = JacobianBackend(glv=False)
+        with MsmPool(workers=2, backend=backend, min_chunk=4) as pool:
+            self.assertEqual(pool.executor.submit(_worker_g1_type).result(), type(backend.g1))
+            scalars = self.random_scalars(len(self.g1_points))
+            self.assertEqual(pool.msm(self.g1_points, scalars), msm(self.g1_points, scalars))
+
+def run_tests():
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestParallel)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+if __name__ == "__main__":
+    run_tests()
@@ -14,13 +14,15 @@ sys.path.append(parent_dir)
 #
 
 from Setup import Setup
-from Prover import Prover
+from Prover import Prover, CircuitProver
+from Curve import JacobianBackend
+from FieldContext import get_field
 
 
 class TestProver(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.GF = galois.GF(curve_order)
+        cls.GF = get_field()
         
         with open(project_path("test", "qap_data.pkl"), "rb") as f:
             cls.data = pickle.load(f)
@@ -224,6 +226,124 @@ class TestProver(unittest.TestCase):
         error_msg = str(context.exception)
         self.assertIn("Invalid witness", error_msg)
 
+    """
+    Checks that the Jacobian curve backend constructs exactly the same proof
+    """
+    def test_07_jacobian_backend(self):
+        prover = Prover(
+            witness=self.witness,
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            out_polys=self.data["out_polys"],
+            alpha_g1=self.setup_data["alpha_g1"],
+            beta_g2=self.setup_data["beta_g2"],
+            g1_srs=self.setup_data["g1_srs"],
+            g2_srs=self.setup_data["g2_srs"],
+            t_tau_srs=self.setup_data["t_tau_srs"],
+            psis=self.setup_data["psis"],
+            backend=JacobianBackend()
+        )
+
+        self.assertEqual(prover.get_proof(), self.prover.get_proof())
+
+    """
+    Checks that a circuit prover gives the same proofs as the one-shot prover, for several witnesses
+    """
+    def test_08_circuit_prover(self):
+        circuit_prover = CircuitProver(
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            out_polys=self.data["out_polys"],
+            alpha_g1=self.setup_data["alpha_g1"],
+            beta_g2=self.setup_data["beta_g2"],
+            g1_srs=self.setup_data["g1_srs"],
+            g2_srs=self.setup_data["g2_srs"],
+            t_tau_srs=self.setup_data["t_tau_srs"],
+            psis=self.setup_data["psis"],
+            backend=JacobianBackend()
+        )
+
+        for _ in range(2):
+            self.assertEqual(circuit_prover.prove(self.witness), self.prover.get_proof())
+
+        with self.assertRaises(ValueError):
+            circuit_prover.prove(self.data["false_witness"])
+        with self.assertRaises(ValueError):
+            circuit_prover.prove(list(self.witness) + [1])
+
+    """
+    Checks that proving with the per wire query points of the setup gives the same proof
+    """
+    def test_09_query_points(self):
+        circuit_prover = CircuitProver(
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            out_polys=self.data["out_polys"],
+            alpha_g1=self.setup_data["alpha_g1"],
+            beta_g2=self.setup_data["beta_g2"],
+            g1_srs=self.setup_data["g1_srs"],
+            g2_srs=self.setup_data["g2_srs"],
+            t_tau_srs=self.setup_data["t_tau_srs"],
+            psis=self.setup_data["psis"],
+            a_query_g1=self.setup_data["a_query_g1"],
+            b_query_g2=self.setup_data["b_query_g2"],
+            backend=JacobianBackend()
+        )
+
+        self.assertEqual(circuit_prover.prove(self.witness), self.prover.get_proof())
+
+    """
+    Checks that prove_batch gives the proofs of prove for several witnesses,
+    with and without the query points, and rejects a batch with an invalid witness
+    """
+    def test_10_prove_batch(self):
+        # witnesses 1, out, x, y, v1, v2, v3 of the example circuit for different x and y
+        witnesses = [self.witness]
+        for x, y in [(3, 5), (0, 0), (curve_order - 1, 2)]:
+            v1 = x * x % curve_order
+            v2 = v1 * v1 % curve_order
+            v3 = (curve_order - 5) * y * y % curve_order
+            witnesses.append([1, (v3 * v1 + v2) % curve_order, x, y, v1, v2, v3])
+
+        for queries in [{}, {"a_query_g1": self.setup_data["a_query_g1"], "b_query_g2": self.setup_data["b_query_g2"]}]:
+            circuit_prover = CircuitProver(
+                left_polys=self.data["left_polys"],
+                right_polys=self.data["right_polys"],
+                out_polys=self.data["out_polys"],
+                alpha_g1=self.setup_data["alpha_g1"],
+                beta_g2=self.setup_data["beta_g2"],
+                g1_srs=self.setup_data["g1_srs"],
+                g2_srs=self.setup_data["g2_srs"],
+                t_tau_srs=self.setup_data["t_tau_srs"],
+                psis=self.setup_data["psis"],
+                backend=JacobianBackend(),
+                **queries
+            )
+            expected = [circuit_prover.prove(witness) for witness in witnesses]
+            self.assertEqual(circuit_prover.prove_batch(witnesses), expected)
+            # the second batch reuses the shifted srs points of the first
+            self.assertEqual(circuit_prover.prove_batch(witnesses[1:3]), expected[1:3])
+
+        self.assertEqual(circuit_prover.prove_batch([]), [])
+
+        false_witness = self.data["false_witness"]
+        with self.assertRaises(ValueError):
+            circuit_prover.prove_batch(witnesses + [false_witness])
+        self.assertEqual(
+            circuit_prover.prove_batch([false_witness], allowFalseWitness=True),
+            [circuit_prover.prove(false_witness, allowFalseWitness=True)]
+        )
+
+    """
+    Checks that the GF attribute of both provers is the scalar field, on the class and on instances
+    """
+    def test_11_gf_attribute(self):
+        for prover_class in [Prover, CircuitProver]:
+            self.assertIs(prover_class.GF, get_field())
+            self.assertEqual(int(prover_class.GF(3) * prover_class.GF(5)), 15)
+        self.assertIs(self.prover.GF, get_field())
+
+
 def run_tests():
     loader = unittest.TestLoader()
     suite = loader.loadTestsFromTestCase(TestProver)
@@ -0,0 +1,112 @@
+import json
+import pickle
+import tempfile
+import threading
+import socket
+import time
+import unittest
+from utils import project_path
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Setup import Setup
+from Prover import Prover, CircuitProver
+from Keys import point_from_json
+from Curve import JacobianBackend
+from prover_service import ProverService
+from FieldContext import get_field
+
+class TestProverService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the pickled polynomials are over the scalar field, which is only built on first use
+        get_field()
+        with open(project_path("test", "qap_data.pkl"), "rb") as f:
+            cls.data = pickle.load(f)
+
+        backend = JacobianBackend()
+        setup_data = Setup(cls.data["out_polys"], cls.data["left_polys"], cls.data["right_polys"], backend=backend).get_setup()
+
+        cls.expected = Prover(
+            witness=cls.data["correct_witness"],
+            left_polys=cls.data["left_polys"],
+            right_polys=cls.data["right_polys"],
+            out_polys=cls.data["out_polys"],
+            alpha_g1=setup_data["alpha_g1"],
+            beta_g2=setup_data["beta_g2"],
+            g1_srs=setup_data["g1_srs"],
+            g2_srs=setup_data["g2_srs"],
+            t_tau_srs=setup_data["t_tau_srs"],
+            psis=setup_data["psis"],
+            backend=backend
+        ).get_proof()
+
+        circuit_prover = CircuitProver(
+            cls.data["left_polys"], cls.data["right_polys"], cls.data["out_polys"],
+            setup_data["alpha_g1"], setup_data["beta_g2"], setup_data["g1_srs"],
+            setup_data["g2_srs"], setup_data["t_tau_srs"], setup_data["psis"],
+            backend=backend
+        )
+        cls.service = ProverService(circuit_prover, threads=3)
+
+        cls.requests = [
+            json.dumps({"id": 0, "witness": [int(w) for w in cls.data["correct_witness"]]}),
+            json.dumps({"id": 1, "witness": [int(w) for w in cls.data["false_witness"]]}),
+            json.dumps({"id": 2, "witness": [str(w) for w in cls.data["correct_witness"]]}),
+            "not json",
+        ]
+
+    def check_responses(self, lines):
+        responses = [json.loads(line) for line in lines]
+        by_id = {response["id"]: response for response in responses}
+        self.assertEqual(len(responses), len(self.requests))
+
+        for request_id in [0, 2]:
+            proof = {name: point_from_json(point) for name, point in by_id[request_id]["proof"].items()}
+            self.assertEqual(proof, self.expected)
+        self.assertIn("devision remainder", by_id[1]["error"])
+        self.assertIn("error", by_id[None])
+
+    """
+    Checks the answers to concurrently handled request lines
+    """
+    def test_00_serve_lines(self):
+        output = []
+        self.service.serve_lines(self.requests, output.append)
+        self.check_responses("".join(output).splitlines())
+
+    """
+    Checks the service on a unix socket
+    """
+    def test_01_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "prover.sock")
+            thread = threading.Thread(target=self.service.serve_unix, args=(path,))
+            thread.start()
+            try:
+                while not os.path.exists(path):
+                    time.sleep(0.01)
+
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                    client.connect(path)
+                    client.sendall("".join(request + "\n" for request in self.requests).encode("utf-8"))
+                    client.shutdown(socket.SHUT_WR)
+                    with client.makefile("r", encoding="utf-8") as responses:
+                        self.check_responses(responses.readlines())
+            finally:
+                self.service.shutdown()
+                thread.join()
+
+def run_tests():
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestProverService)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,299 @@
+import unittest
+import numpy as np
+import galois
+from py_ecc.bn128 import G1, multiply, add, curve_order
+import pickle
+import tempfile
+from utils import project_path
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Qap import QAP
+from QapCache import QapCache
+from Setup import Setup
+from Prover import Prover, CircuitProver
+from Curve import JacobianBackend
+from FieldContext import get_field
+
+# R1CS of the example in example_qap.py
+L = np.array([
+    [0, 0, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, curve_order-5, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 1],
+])
+
+R = np.array([
+    [0, 0, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, 1, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+])
+
+O = np.array([
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0, 0, 1],
+    [0, 1, 0, 0, 0, curve_order-1, 0],
+])
+
+class TestQap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.GF = get_field()
+
+        with open(project_path("test", "qap_data.pkl"), "rb") as f:
+            cls.data = pickle.load(f)
+
+        cls.witness = cls.data["correct_witness"]
+
+        cls.qap_integers = QAP(L, R, O, curve_order, cache=False)
+        cls.qap_roots = QAP(L, R, O, curve_order, domain="roots", cache=False)
+
+    """
+    Checks that the integer domain gives the polynomials of the example
+    """
+    def test_00_integer_domain_matches_example(self):
+        for polys, expected in [
+            (self.qap_integers.U_polys, self.data["left_polys"]),
+            (self.qap_integers.V_polys, self.data["right_polys"]),
+            (self.qap_integers.W_polys, self.data["out_polys"]),
+        ]:
+            self.assertEqual(len(polys), len(expected))
+            for poly, expected_poly in zip(polys, expected):
+                self.assertEqual(poly, expected_poly)
+
+    """
+    Checks that the polynomials of the roots of unity domain evaluate
+    to the matrix entries at the domain points
+    """
+    def test_01_roots_domain_interpolation(self):
+        points = self.GF(self.qap_roots.domain.points())
+        for polys, matrix in [
+            (self.qap_roots.U_polys, L),
+            (self.qap_roots.V_polys, R),
+            (self.qap_roots.W_polys, O),
+        ]:
+            for col, poly in enumerate(polys):
+                for row, point in enumerate(points):
+                    self.assertEqual(int(poly(point)), int(matrix[row, col]))
+
+    """
+    Checks t(x) = x^n - 1 and that it divides the witness' QAP polynomial only for the correct witness
+    """
+    def test_02_roots_domain_t(self):
+        qap = self.qap_roots
+        self.assertEqual(qap.t.degree, 4)
+        self.assertEqual(qap.t, galois.Poly.Degrees([4, 0], [1, -1], field=self.GF))
+
+        A, B, C = qap.combine(self.witness)
+        self.assertEqual(A * B, C + ((A * B - C) // qap.t) * qap.t)
+        for each in [self.qap_integers, self.qap_roots]:
+            self.assertTrue(each.check(self.witness))
+            self.assertFalse(each.check(self.data["false_witness"]))
+
+        with self.assertRaises(ValueError):
+            qap.check(self.witness[:-1])
+
+    """
+    Checks that sparse input (triples) gives the same QAP as the dense matrices,
+    including a zero column which is not interpolated at all
+    """
+    def test_03_sparse_input(self):
+        def triples(matrix):
+            return [(row, col, int(matrix[row, col])) for row, col in zip(*np.nonzero(matrix))]
+
+        for domain, dense_qap in [("integers", self.qap_integers), ("roots", self.qap_roots)]:
+            qap = QAP(triples(L), triples(R), triples(O), curve_order, domain=domain, num_wires=len(self.witness), cache=False)
+
+            self.assertEqual(qap.L.nnz, 4)
+            for polys, expected in [
+                (qap.U_polys, dense_qap.U_polys),
+                (qap.V_polys, dense_qap.V_polys),
+                (qap.W_polys, dense_qap.W_polys),
+            ]:
+                self.assertEqual(list(polys), list(expected))
+            self.assertEqual(qap.t, dense_qap.t)
+
+        # the constant wire (column 0) is never used
+        self.assertEqual(self.qap_integers.U_polys[0], galois.Poly.Zero(field=self.GF))
+
+    """
+    Checks Setup and Prover with the roots of unity domain
+    by computing [A]_1 manually as in TestProver
+    """
+    def test_04_roots_domain_proof(self):
+        qap = self.qap_roots
+        tau, alpha, beta = 7, 3, 5
+
+        setup = Setup(
+            out_polys=qap.W_polys,
+            left_polys=qap.U_polys,
+            right_polys=qap.V_polys,
+            tau=tau,
+            alpha=alpha,
+            beta=beta,
+            backend=JacobianBackend(),
+            domain=qap.domain
+        )
+        setup_data = setup.get_setup()
+
+        prover = Prover(
+            witness=self.witness,
+            left_polys=qap.U_polys,
+            right_polys=qap.V_polys,
+            out_polys=qap.W_polys,
+            alpha_g1=setup_data["alpha_g1"],
+            beta_g2=setup_data["beta_g2"],
+            g1_srs=setup_data["g1_srs"],
+            g2_srs=setup_data["g2_srs"],
+            t_tau_srs=setup_data["t_tau_srs"],
+            psis=setup_data["psis"],
+            backend=JacobianBackend(),
+            domain=qap.domain
+        )
+
+        A, B, C = qap.combine(self.witness)
+        a_at_tau = int(A(self.GF(tau)))
+        self.assertEqual(prover.A_1, add(setup_data["alpha_g1"], multiply(G1, a_at_tau)))
+
+        h_poly = galois.Poly(prover.h_coeffs, field=self.GF)
+        self.assertEqual(h_poly, (A * B - C) // qap.t)
+
+        with self.assertRaises(ValueError):
+            Prover(
+                witness=self.data["false_witness"],
+                left_polys=qap.U_polys,
+                right_polys=qap.V_polys,
+                out_polys=qap.W_polys,
+                alpha_g1=setup_data["alpha_g1"],
+                beta_g2=setup_data["beta_g2"],
+                g1_srs=setup_data["g1_srs"],
+                g2_srs=setup_data["g2_srs"],
+                t_tau_srs=setup_data["t_tau_srs"],
+                psis=setup_data["psis"],
+                domain=qap.domain
+            )
+
+    """
+    Checks that h from coset FFTs equals h from polynomial division,
+    including the invalid witness error and the domain requirement
+    """
+    def test_05_coset_h_mode(self):
+        qap = self.qap_roots
+        setup_data = Setup(
+            out_polys=qap.W_polys,
+            left_polys=qap.U_polys,
+            right_polys=qap.V_polys,
+            backend=JacobianBackend(),
+            domain=qap.domain
+        ).get_setup()
+
+        def get_prover(witness, h_mode, domain=qap.domain):
+            return Prover(
+                witness=witness,
+                left_polys=qap.U_polys,
+                right_polys=qap.V_polys,
+                out_polys=qap.W_polys,
+                alpha_g1=setup_data["alpha_g1"],
+                beta_g2=setup_data["beta_g2"],
+                g1_srs=setup_data["g1_srs"],
+                g2_srs=setup_data["g2_srs"],
+                t_tau_srs=setup_data["t_tau_srs"],
+                psis=setup_data["psis"],
+                backend=JacobianBackend(),
+                domain=domain,
+                h_mode=h_mode
+            )
+
+        coset_prover = get_prover(self.witness, "coset")
+        division_prover = get_prover(self.witness, "division")
+
+        self.assertTrue(np.all(coset_prover.h_coeffs == division_prover.h_coeffs))
+        self.assertEqual(coset_prover.get_proof(), division_prover.get_proof())
+
+        with self.assertRaises(ValueError) as context:
+            get_prover(self.data["false_witness"], "coset")
+        self.assertIn("Invalid witness", str(context.exception))
+
+        with self.assertRaises(ValueError):
+            get_prover(self.witness, "coset", domain=self.qap_integers.domain)
+
+        # the batch of FFTs over all witnesses of prove_batch
+        circuit_prover = CircuitProver(
+            qap.U_polys, qap.V_polys, qap.W_polys,
+            setup_data["alpha_g1"], setup_data["beta_g2"], setup_data["g1_srs"], setup_data["g2_srs"],
+            setup_data["t_tau_srs"], setup_data["psis"],
+            backend=JacobianBackend(), domain=qap.domain, h_mode="coset"
+        )
+        false_witness = self.data["false_witness"]
+        self.assertEqual(
+            circuit_prover.prove_batch([self.witness, false_witness], allowFalseWitness=True),
+            [circuit_prover.prove(self.witness), circuit_prover.prove(false_witness, allowFalseWitness=True)]
+        )
+        with self.assertRaises(ValueError) as context:
+            circuit_prover.prove_batch([self.witness, false_witness, self.witness])
+        self.assertIn("witnesses [1]", str(context.exception))
+
+    """
+    Checks that a warm cache gives the same QAP, keyed by the R1CS and the domain,
+    and that the least recently used entries are evicted beyond the size limit
+    """
+    def test_06_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = QapCache(tmp_dir)
+            for domain, expected in [("integers", self.qap_integers), ("roots", self.qap_roots)]:
+                cold = QAP(L, R, O, curve_order, domain=domain, cache=cache)
+                warm = QAP(L, R, O, curve_order, domain=domain, cache=cache)
+                for qap in [cold, warm]:
+                    for name in ["U_polys", "V_polys", "W_polys"]:
+                        self.assertEqual(list(getattr(qap, name)), list(getattr(expected, name)))
+                    self.assertEqual(qap.t, expected.t)
+            entries = sorted(os.listdir(tmp_dir))
+            self.assertEqual(len(entries), 2)
+
+            # another R1CS is another entry
+            changed_O = O.copy()
+            changed_O[0, 4] = 2
+            other = QAP(L, R, changed_O, curve_order, cache=cache)
+            self.assertEqual(len(os.listdir(tmp_dir)), 3)
+
+            # a corrupted entry is dropped and recomputed
+            path = cache.path(QapCache.key(other.L, other.R, other.O, curve_order, "integers"))
+            with open(path, "r+b") as f:
+                f.truncate(100)
+            recomputed = QAP(L, R, changed_O, curve_order, cache=cache)
+            self.assertEqual(list(recomputed.U_polys), list(other.U_polys))
+            self.assertGreater(os.path.getsize(path), 100)
+
+            # room for two entries only: the least recently used one goes
+            os.utime(os.path.join(tmp_dir, entries[0]), (0, 0))
+            cache.max_bytes = 2 * os.path.getsize(path)
+            cache.evict()
+            self.assertNotIn(entries[0], os.listdir(tmp_dir))
+            self.assertEqual(len(os.listdir(tmp_dir)), 2)
+
+            # an unusable cache directory (here a file) only warns
+            with self.assertWarns(RuntimeWarning):
+                unusable = QAP(L, R, O, curve_order, cache=QapCache(path))
+            self.assertEqual(list(unusable.U_polys), list(self.qap_integers.U_polys))
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestQap)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+    
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
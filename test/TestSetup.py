@@ -2,6 +2,8 @@ import numpy as np
 import galois
 from py_ecc.bn128 import G1, G2, multiply, curve_order, pairing, curve_order
 import pickle
+import stat
+import tempfile
 from utils import project_path
 import unittest
 
@@ -13,12 +15,15 @@ parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
 sys.path.append(parent_dir)
 #
 
-from Setup import Setup
+from Setup import Setup, StreamingSetup
+from Keys import ProvingKey, PointSection
+from Curve import JacobianBackend
+from FieldContext import get_field
 
 class TestSetup(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.GF = galois.GF(curve_order)
+        cls.GF = get_field()
 
         with open(project_path("test", "qap_data.pkl"), "rb") as f:
             cls.data = pickle.load(f)
@@ -143,6 +148,190 @@ class TestSetup(unittest.TestCase):
         
         self.assertEqual(left_pairing, right_pairing)
 
+    """
+    Checks that the Jacobian curve backend constructs exactly the same setup
+    """
+    def test_08_jacobian_backend(self):
+        setup = Setup(
+            out_polys=self.data["out_polys"],
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            tau=self.tau,
+            alpha=self.alpha,
+            beta=self.beta,
+            backend=JacobianBackend()
+        )
+
+        self.assertEqual(setup.get_setup(), self.setup.get_setup())
+
+    """
+    Checks the per wire query points [u_i(tau)]_1, [v_i(tau)]_1 and [v_i(tau)]_2
+    """
+    def test_09_query_points(self):
+        num_polys = len(self.data["left_polys"])
+        self.assertEqual(len(self.setup.a_query_g1), num_polys)
+        self.assertEqual(len(self.setup.b_query_g1), num_polys)
+        self.assertEqual(len(self.setup.b_query_g2), num_polys)
+
+        for i in range(num_polys):
+            u_tau = self.poly_eval_mod(self.data["left_polys"][i], self.tau, curve_order)
+            v_tau = self.poly_eval_mod(self.data["right_polys"][i], self.tau, curve_order)
+
+            self.assertEqual(self.setup.a_query_g1[i], multiply(G1, u_tau))
+            self.assertEqual(self.setup.b_query_g1[i], multiply(G1, v_tau))
+            self.assertEqual(self.setup.b_query_g2[i], multiply(G2, v_tau))
+
+    """
+    Checks the batch evaluation at tau with polynomials of different lengths,
+    as galois strips leading zero-coefficients (down to the zero polynomial)
+    """
+    def test_10_stripped_leading_zeros(self):
+        left_polys = [galois.Poly([3, 0, 0, 1], field=self.GF), galois.Poly.Zero(field=self.GF)]
+        right_polys = [galois.Poly([0, 0, 2], field=self.GF), galois.Poly([5, 4], field=self.GF)]
+        out_polys = [galois.Poly.One(field=self.GF), galois.Poly([1, 0], field=self.GF)]
+
+        setup = Setup(out_polys=out_polys, left_polys=left_polys, right_polys=right_polys,
+            tau=self.tau, alpha=self.alpha, beta=self.beta)
+
+        # the longest polynomial has 4 coefficients
+        self.assertEqual(setup.num_constraints, 4)
+        self.assertEqual(setup.tau_powers, [1, self.tau, self.tau**2, self.tau**3])
+        self.assertEqual(len(setup.g1_srs), 4)
+
+        for polys, points, group in [(left_polys, setup.a_query_g1, G1), (right_polys, setup.b_query_g2, G2)]:
+            for poly, point in zip(polys, points):
+                u_tau = self.poly_eval_mod(poly, self.tau, curve_order)
+                self.assertEqual(point, multiply(group, u_tau) if u_tau != 0 else None)
+
+        # the same polynomials as coefficient matrices (one column per polynomial, lowest power first)
+        coeffs = []
+        for polys in [left_polys, right_polys, out_polys]:
+            matrix = np.zeros((4, len(polys)), dtype=object)
+            for col, poly in enumerate(polys):
+                poly_coeffs = [int(c) for c in poly.coeffs[::-1]]
+                matrix[:len(poly_coeffs), col] = poly_coeffs
+            coeffs.append(matrix)
+        from_coeffs = Setup(out_polys=out_polys, left_polys=left_polys, right_polys=right_polys,
+            tau=self.tau, alpha=self.alpha, beta=self.beta, coeffs=coeffs)
+        self.assertEqual(from_coeffs.num_constraints, 4)
+        self.assertEqual(from_coeffs.psis, setup.psis)
+        self.assertEqual(from_coeffs.a_query_g1, setup.a_query_g1)
+
+    """
+    Checks that the streaming setup writes exactly the points of the in-memory setup
+    """
+    def test_11_streaming_setup(self):
+        streaming = StreamingSetup(
+            out_polys=self.data["out_polys"],
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            tau=self.tau,
+            alpha=self.alpha,
+            beta=self.beta,
+            backend=JacobianBackend(),
+            chunk_size=2
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "proving.key")
+            chunks = []
+            with streaming.write_key(path, progress=lambda done, total: chunks.append((done, total))) as key:
+                self.assertEqual(self.__key_points(key), self.setup.get_setup())
+            self.assertEqual(chunks[-1][0], chunks[-1][1])
+            self.assertFalse(os.path.exists(path + ".progress"))
+
+    """
+    Checks that an interrupted streaming setup is resumed from its last completed chunk
+    """
+    def test_12_streaming_setup_resume(self):
+        def streaming_setup(tau=None):
+            return StreamingSetup(
+                out_polys=self.data["out_polys"],
+                left_polys=self.data["left_polys"],
+                right_polys=self.data["right_polys"],
+                tau=tau,
+                alpha=self.alpha,
+                beta=self.beta,
+                chunk_size=2
+            )
+
+        class Interrupt(Exception):
+            pass
+
+        def interrupt_after_3(done, total):
+            if done == 3:
+                raise Interrupt()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "proving.key")
+            with self.assertRaises(Interrupt):
+                streaming_setup(self.tau).write_key(path, progress=interrupt_after_3)
+
+            # the unfinished file has no header yet
+            self.assertTrue(os.path.exists(path + ".progress"))
+            with self.assertRaises(ValueError):
+                ProvingKey.load(path)
+            # nor may it be resumed with another tau
+            with self.assertRaises(ValueError):
+                streaming_setup(self.tau + 1).write_key(path)
+
+            with streaming_setup().write_key(path) as key:
+                self.assertEqual(self.__key_points(key), self.setup.get_setup())
+            self.assertFalse(os.path.exists(path + ".progress"))
+
+    """
+    Checks that the progress file, which holds tau, alpha and beta, is only readable by its owner
+    """
+    def test_13_streaming_setup_progress_mode(self):
+        def interrupt(done, total):
+            raise InterruptedError()
+
+        streaming = StreamingSetup(
+            out_polys=self.data["out_polys"],
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            chunk_size=2
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "proving.key")
+            # even without the umask restricting it
+            umask = os.umask(0)
+            try:
+                with self.assertRaises(InterruptedError):
+                    streaming.write_key(path, progress=interrupt)
+            finally:
+                os.umask(umask)
+            self.assertEqual(stat.S_IMODE(os.stat(path + ".progress").st_mode), 0o600)
+
+    """
+    Checks that the timer gets every phase of the setup and doesn't change its result
+    """
+    def test_14_timer(self):
+        phases = []
+        def timer(phase, fn, *args):
+            phases.append(phase)
+            return fn(*args)
+
+        timed = Setup(
+            out_polys=self.data["out_polys"],
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            tau=self.tau,
+            alpha=self.alpha,
+            beta=self.beta,
+            timer=timer
+        )
+        self.assertEqual(timed.get_setup(), self.setup.get_setup())
+        self.assertEqual(phases, [
+            "qap_coeffs", "tau_powers", "tables", "g1_srs", "g2_srs", "alpha_beta_g1", "beta_g2",
+            "t_tau", "t_tau_srs", "qap_eval", "psi_scalars", "psis", "a_query_g1", "b_query_g1", "b_query_g2"
+        ])
+
+    def __key_points(self, key):
+        return {
+            name: list(points) if isinstance(points, PointSection) else points
+            for name, points in key.get_setup().items()
+        }
+
     """
     Horner's method for polynomial evaluation with modular arithmetic
     """
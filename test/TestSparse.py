@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+from py_ecc.bn128 import curve_order
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Sparse import SparseMatrix
+
+"""
+Minimal stand-ins for scipy.sparse's COO and CSR matrices
+"""
+class CooMatrix:
+    def __init__(self, row, col, data, shape):
+        self.row, self.col, self.data, self.shape = row, col, data, shape
+
+class CsrMatrix:
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr, self.indices, self.data, self.shape = indptr, indices, data, shape
+
+class TestSparse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dense = np.array([
+            [0, 0, 1, 0],
+            [0, -5, 0, 0],
+            [0, 0, 0, 0],
+            [3, 0, 0, 1],
+        ])
+        cls.triples = [(0, 2, 1), (1, 1, -5), (3, 0, 3), (3, 3, 1)]
+
+    """
+    Checks that all input formats result in the same matrix with reduced values
+    """
+    def test_00_input_formats(self):
+        expected = SparseMatrix.from_any(self.dense, curve_order)
+        self.assertEqual(expected.shape, (4, 4))
+        self.assertEqual(expected.nnz, 4)
+        self.assertEqual(expected.columns[1], {1: curve_order - 5})
+
+        from_triples = SparseMatrix.from_any(self.triples, curve_order, shape=(4, 4))
+        coo = CooMatrix([0, 1, 3, 3], [2, 1, 0, 3], [1, -5, 3, 1], (4, 4))
+        csr = CsrMatrix([0, 1, 2, 2, 4], [2, 1, 0, 3], [1, -5, 3, 1], (4, 4))
+
+        for matrix in [from_triples, SparseMatrix.from_any(coo, curve_order), SparseMatrix.from_any(csr, curve_order)]:
+            self.assertEqual(matrix.shape, expected.shape)
+            self.assertEqual(matrix.columns, expected.columns)
+            self.assertTrue(np.all(matrix.to_dense() == self.dense.astype(object) % curve_order))
+
+    """
+    Checks that zero entries and entries summing up to zero are dropped
+    and that the shape is derived from the largest indices
+    """
+    def test_01_zero_entries(self):
+        matrix = SparseMatrix.from_any([(0, 0, 2), (0, 0, curve_order - 2), (2, 1, 0), (1, 3, 7)], curve_order)
+        self.assertEqual(matrix.shape, (3, 4))
+        self.assertEqual(matrix.nnz, 1)
+        self.assertEqual(matrix.nonzero_columns(), [3])
+
+        with self.assertRaises(ValueError):
+            SparseMatrix.from_any(self.triples, curve_order, shape=(2, 2))
+
+    """
+    Checks the matrix vector product against the dense one
+    """
+    def test_02_matvec(self):
+        matrix = SparseMatrix.from_any(self.dense, curve_order)
+        vector = [1, 2, 3, curve_order - 1]
+        expected = [int(v) % curve_order for v in self.dense.astype(object).dot(np.array(vector, dtype=object))]
+        self.assertEqual(matrix.matvec(vector, curve_order), expected)
+
+
+def run_tests():
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestSparse)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    res = runner.run(suite)
+    
+    return res
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -1,6 +1,6 @@
-import galois
 from py_ecc.bn128 import multiply, curve_order
 import pickle
+import subprocess
 from utils import project_path
 import unittest
 
@@ -14,13 +14,15 @@ sys.path.append(parent_dir)
 
 from Setup import Setup
 from Prover import Prover
-from Verifier import Verifier
+from Verifier import Verifier, BatchVerifier, PreparedVerificationKey
+from Keys import ProvingKey
+from FieldContext import get_field
 
 class TestVerifier(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        cls.GF = galois.GF(curve_order)
+        cls.GF = get_field()
         
         with open(project_path("test", "qap_data.pkl"), "rb") as f:
             cls.data = pickle.load(f)
@@ -190,7 +192,76 @@ class TestVerifier(unittest.TestCase):
         )
         
         self.assertFalse(verifier.isValid)
-    
+
+    """
+    Checks that a batch of valid proofs verifies and a batch with a
+    manipulated proof fails, pointing out the manipulated one
+    """
+    def test_04_batch_verification(self):
+        prover = Prover(
+            witness=self.data["correct_witness"],
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            out_polys=self.data["out_polys"],
+            alpha_g1=self.setup_data["alpha_g1"],
+            beta_g2=self.setup_data["beta_g2"],
+            g1_srs=self.setup_data["g1_srs"],
+            g2_srs=self.setup_data["g2_srs"],
+            t_tau_srs=self.setup_data["t_tau_srs"],
+            psis=self.setup_data["psis"]
+        )
+        proof = prover.get_proof()
+
+        batch = BatchVerifier([proof, proof], self.setup_data["alpha_g1"], self.setup_data["beta_g2"])
+        self.assertTrue(batch.isValid)
+        self.assertEqual(batch.results, [True, True])
+
+        manipulated = dict(proof, C=multiply(proof["C"], 2))
+        batch = BatchVerifier([proof, manipulated], self.setup_data["alpha_g1"], self.setup_data["beta_g2"])
+        self.assertFalse(batch.isValid)
+        self.assertEqual(batch.invalid_proofs(), [1])
+
+        self.assertTrue(BatchVerifier([], self.setup_data["alpha_g1"], self.setup_data["beta_g2"]).isValid)
+
+    """
+    Checks verification with a prepared key, reused for several proofs
+    """
+    def test_05_prepared_key(self):
+        prover = Prover(
+            witness=self.data["correct_witness"],
+            left_polys=self.data["left_polys"],
+            right_polys=self.data["right_polys"],
+            out_polys=self.data["out_polys"],
+            alpha_g1=self.setup_data["alpha_g1"],
+            beta_g2=self.setup_data["beta_g2"],
+            g1_srs=self.setup_data["g1_srs"],
+            g2_srs=self.setup_data["g2_srs"],
+            t_tau_srs=self.setup_data["t_tau_srs"],
+            psis=self.setup_data["psis"]
+        )
+        proof = prover.get_proof()
+
+        prepared_key = PreparedVerificationKey.from_key(ProvingKey.from_setup(self.setup_data).verification_key())
+
+        self.assertTrue(Verifier(proof["A"], proof["B"], proof["C"], prepared_key=prepared_key).isValid)
+        self.assertFalse(Verifier(proof["A"], proof["B"], multiply(proof["C"], 3), prepared_key=prepared_key).isValid)
+        self.assertTrue(BatchVerifier([proof], prepared_key=prepared_key).isValid)
+
+    """
+    Checks that verifying doesn't import galois or numba, and that the shared field
+    is the one the test data was pickled with
+    """
+    def test_06_lightweight_import(self):
+        modules = subprocess.run(
+            [sys.executable, "-c", "import sys, Verifier; print(' '.join(sys.modules))"],
+            cwd=parent_dir, check=True, capture_output=True, text=True
+        ).stdout.split()
+        self.assertNotIn("galois", modules)
+        self.assertNotIn("numba", modules)
+
+        self.assertIs(get_field(), self.GF)
+        self.assertIs(type(self.data["correct_witness"]), get_field())
+
 
 def run_tests():
     loader = unittest.TestLoader()
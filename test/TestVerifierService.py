@@ -0,0 +1,187 @@
+import asyncio
+import json
+import pickle
+import tempfile
+import unittest
+from utils import project_path
+
+# for class import from parent dir (god forbid I could just use a file path for imports...)
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(parent_dir)
+#
+
+from Setup import Setup
+from Prover import CircuitProver
+from Keys import point_to_json
+from Curve import JacobianBackend
+from Verifier import PreparedVerificationKey
+from verifier_service import VerifierService
+from FieldContext import get_field
+
+class TestVerifierService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the pickled polynomials are over the scalar field, which is only built on first use
+        get_field()
+        with open(project_path("test", "qap_data.pkl"), "rb") as f:
+            data = pickle.load(f)
+
+        backend = JacobianBackend()
+        setup_data = Setup(data["out_polys"], data["left_polys"], data["right_polys"], backend=backend).get_setup()
+        circuit_prover = CircuitProver(
+            data["left_polys"], data["right_polys"], data["out_polys"],
+            setup_data["alpha_g1"], setup_data["beta_g2"], setup_data["g1_srs"],
+            setup_data["g2_srs"], setup_data["t_tau_srs"], setup_data["psis"],
+            backend=backend
+        )
+        cls.prepared_key = PreparedVerificationKey(setup_data["alpha_g1"], setup_data["beta_g2"])
+
+        valid = circuit_prover.prove(data["correct_witness"])
+        # A and C swapped, both on the curve but not a valid proof
+        invalid = {"A": valid["C"], "B": valid["B"], "C": valid["A"]}
+        cls.proofs = [valid, valid, invalid, valid]
+        cls.expected = [True, True, False, True]
+
+        cls.requests = [
+            json.dumps({"id": i, "proof": {name: point_to_json(point) for name, point in proof.items()}})
+            for i, proof in enumerate(cls.proofs)
+        ]
+        off_curve = {name: point_to_json(point) for name, point in valid.items()}
+        off_curve["A"] = [1, 3]
+        cls.requests += [
+            json.dumps({"id": 4, "proof": off_curve}),
+            json.dumps({"id": 5, "proof": {"A": off_curve["C"]}}),
+            "not json",
+        ]
+
+    def check_responses(self, lines):
+        responses = [json.loads(line) for line in lines]
+        by_id = {response["id"]: response for response in responses}
+        self.assertEqual(len(responses), len(self.requests))
+
+        for request_id, valid in enumerate(self.expected):
+            self.assertEqual(by_id[request_id], {"id": request_id, "valid": valid})
+        self.assertIn("not on the curve", by_id[4]["error"])
+        self.assertIn("error", by_id[5])
+        self.assertIn("error", by_id[None])
+
+    """
+    Checks that concurrent requests within the window are verified as one batch,
+    with the result of each proof
+    """
+    def test_00_coalescing(self):
+        async def run():
+            service = VerifierService(self.prepared_key, window=0.05, max_batch=32)
+            try:
+                results = await asyncio.gather(*[service.verify(proof) for proof in self.proofs])
+                self.assertEqual(list(results), self.expected)
+                self.assertEqual((service.batches, service.verified), (1, len(self.proofs)))
+
+                # a full batch doesn't wait for the window
+                service.max_batch = 2
+                service.window = 60
+                results = await asyncio.wait_for(asyncio.gather(*[service.verify(proof) for proof in self.proofs]), 30)
+                self.assertEqual(list(results), self.expected)
+                self.assertEqual(service.batches, 3)
+            finally:
+                service.close()
+
+        asyncio.run(run())
+
+    """
+    Checks the in process queue
+    """
+    def test_01_queue(self):
+        async def run():
+            service = VerifierService(self.prepared_key, window=0.01)
+            queue = asyncio.Queue()
+            consumer = asyncio.ensure_future(service.serve_queue(queue))
+            try:
+                futures = []
+                for proof in self.proofs:
+                    future = asyncio.get_running_loop().create_future()
+                    await queue.put((proof, future))
+                    futures.append(future)
+                self.assertEqual(list(await asyncio.gather(*futures)), self.expected)
+            finally:
+                consumer.cancel()
+                service.close()
+
+        asyncio.run(run())
+
+    """
+    Checks the answers to request lines
+    """
+    def test_02_handle(self):
+        async def run():
+            service = VerifierService(self.prepared_key, window=0.01)
+            try:
+                return await asyncio.gather(*[service.handle(request) for request in self.requests])
+            finally:
+                service.close()
+
+        self.check_responses(asyncio.run(run()))
+
+    """
+    Checks the service on a unix socket, verifying in a worker process
+    """
+    def test_03_unix_socket(self):
+        async def run(path):
+            service = VerifierService(self.prepared_key, window=0.01, workers=1)
+            server = asyncio.ensure_future(service.serve_unix(path))
+            try:
+                while not os.path.exists(path):
+                    await asyncio.sleep(0.01)
+
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write("".join(request + "\n" for request in self.requests).encode("utf-8"))
+                writer.write_eof()
+                lines = [line.decode("utf-8") async for line in reader]
+                writer.close()
+                return lines
+            finally:
+                service.shutdown()
+                await server
+                service.close()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.check_responses(asyncio.run(run(os.path.join(tmp_dir, "verifier.sock"))))
+
+    """
+    Checks that a malformed proof only fails its own request, not the others of its batch
+    """
+    def test_04_malformed_proof(self):
+        valid, _, invalid, _ = self.proofs
+        malformed = [
+            {"A": valid["A"], "B": valid["B"]},
+            {"A": ("1", "2"), "B": valid["B"], "C": valid["C"]},
+            {"A": valid["A"], "B": valid["A"], "C": valid["C"]},
+            [valid["A"], valid["B"], valid["C"]],
+        ]
+
+        async def run():
+            service = VerifierService(self.prepared_key, window=0.05, max_batch=32)
+            try:
+                return await asyncio.gather(
+                    service.verify(valid), *[service.verify(proof) for proof in malformed], service.verify(invalid),
+                    return_exceptions=True
+                )
+            finally:
+                service.close()
+
+        results = asyncio.run(run())
+        self.assertIs(results[0], True)
+        for result in results[1:-1]:
+            self.assertIsInstance(result, ValueError)
+        self.assertIs(results[-1], False)
+
+def run_tests():
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestVerifierService)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from py_ecc.bn128 import FQ, FQ2
+
+from Keys import VerificationKey, encode_point, decode_point, point_from_json
+from Verifier import BatchVerifier, PreparedVerificationKey
+
+"""
+Long running verifier for one verification key on asyncio, which answers verification requests
+as JSON lines on a unix socket, or in process with the verify coroutine:
+
+request:  {"id": 1, "proof": {"A": [x, y], "B": [[x0, x1], [y0, y1]], "C": [x, y]}}
+response: {"id": 1, "valid": true}
+      or  {"id": 1, "error": "Point [...] is not on the curve"}
+
+Requests arriving within window seconds of the first pending one are coalesced
+into one BatchVerifier (one product of pairings with a single final exponentiation),
+a batch is verified right away once it has max_batch proofs.
+The pairings run in an executor, so the event loop keeps accepting requests meanwhile:
+a thread by default, or worker processes which verify batches in parallel.
+Responses are written as soon as their batch is done and have to be matched by their id.
+Points are encoded as in Keys.point_to_json
+"""
+
+# prepared verification key of a worker process, set by the pool's initializer
+_worker_key = None
+
+def _init_worker(alpha_1, beta_2):
+    global _worker_key
+    _worker_key = PreparedVerificationKey(decode_point(alpha_1, 1), decode_point(beta_2, 2))
+
+"""
+Verifies a batch in a worker process, the proofs' points encoded as in Keys.py
+as py_ecc's Fq2 elements can not be pickled
+"""
+def _verify_encoded(proofs):
+    proofs = [
+        {name: decode_point(data, 2 if name == "B" else 1) for name, data in proof.items()}
+        for proof in proofs
+    ]
+    return BatchVerifier(proofs, prepared_key=_worker_key).results
+
+"""
+Raises a ValueError unless the proof is a dict with the A and C points (tuples of two FQ)
+and the B point (a tuple of two FQ2), None being the point at infinity,
+so a malformed proof is rejected on its own instead of failing the batch it would join
+"""
+def _check_proof(proof):
+    if not isinstance(proof, dict):
+        raise ValueError(f"Invalid proof {proof!r}, expected a dict with the A, B and C points")
+    for name, coord_type in [("A", FQ), ("B", FQ2), ("C", FQ)]:
+        if name not in proof:
+            raise ValueError(f"Proof has no {name} point")
+        point = proof[name]
+        if point is not None and not (
+            isinstance(point, tuple) and len(point) == 2 and all(isinstance(coord, coord_type) for coord in point)
+        ):
+            raise ValueError(f"Invalid {name} point {point!r}")
+
+
+class VerifierService:
+    def __init__(self, prepared_key, window=0.005, max_batch=32, workers=0):
+        self.prepared_key = prepared_key
+        self.window = window
+        self.max_batch = max_batch
+
+        if workers > 0:
+            # forked by a fresh forkserver, as workers forked from the service itself (they're started
+            # on demand) would inherit its open connections, which then wouldn't close for the clients
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+                initargs=(encode_point(prepared_key.alpha_1, 1), encode_point(prepared_key.beta_2, 2))
+            )
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self.workers = workers
+        # totals, the average batch size shows how well requests are coalesced
+        self.batches = 0
+        self.verified = 0
+
+        # (proof, future) pairs waiting for their batch
+        self.__pending = []
+        self.__timer = None
+        self.__tasks = set()
+        self.__server = None
+
+    """
+    Whether the proof (a dict with the A, B and C points) is valid, verified within a batch
+    """
+    async def verify(self, proof):
+        future = asyncio.get_running_loop().create_future()
+        self.__submit(proof, future)
+        return await future
+
+    """
+    Takes (proof, future) pairs from the asyncio queue and sets each future to the proof's validity
+    """
+    async def serve_queue(self, queue):
+        while True:
+            proof, future = await queue.get()
+            self.__submit(proof, future)
+            queue.task_done()
+
+    def __submit(self, proof, future):
+        try:
+            _check_proof(proof)
+        except ValueError as e:
+            future.set_exception(e)
+            return
+
+        self.__pending.append((proof, future))
+        if len(self.__pending) >= self.max_batch:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = asyncio.get_running_loop().call_later(self.window, self.__flush)
+
+    """
+    Starts verifying the pending proofs as one batch
+    """
+    def __flush(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        batch, self.__pending = self.__pending, []
+        if len(batch) > 0:
+            self.batches += 1
+            self.verified += len(batch)
+            task = asyncio.ensure_future(self.__verify_batch(batch))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def __verify_batch(self, batch):
+        try:
+            results = await self.__run_batch([proof for proof, _ in batch])
+        except Exception:
+            # something in the batch failed it as a whole, verified one by one only its own request fails
+            for proof, future in batch:
+                try:
+                    [valid] = await self.__run_batch([proof])
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(valid)
+            return
+
+        for (_, future), valid in zip(batch, results):
+            if not future.done():
+                future.set_result(valid)
+
+    """
+    Validity per proof of one BatchVerifier in the executor
+    """
+    async def __run_batch(self, proofs):
+        loop = asyncio.get_running_loop()
+        if self.workers > 0:
+            encoded = [{name: encode_point(proof[name], 2 if name == "B" else 1) for name in "ABC"} for proof in proofs]
+            return await loop.run_in_executor(self.executor, _verify_encoded, encoded)
+        return await loop.run_in_executor(
+            self.executor, lambda: BatchVerifier(proofs, prepared_key=self.prepared_key).results
+        )
+
+    """
+    Answers a single request line
+    """
+    async def handle(self, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            proof = {name: point_from_json(request["proof"][name]) for name in ["A", "B", "C"]}
+            response = {"id": request_id, "valid": await self.verify(proof)}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e) or type(e).__name__}
+        return json.dumps(response)
+
+    """
+    Serves every connection to the unix socket at path, until shutdown()
+    """
+    async def serve_unix(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        self.__server = await asyncio.start_unix_server(self.__serve_connection, path=path)
+        try:
+            async with self.__server:
+                await self.__server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def __serve_connection(self, reader, writer):
+        async def respond(line):
+            writer.write((await self.handle(line) + "\n").encode("utf-8"))
+            await writer.drain()
+
+        responses = []
+        try:
+            async for raw in reader:
+                line = raw.decode("utf-8")
+                if line.strip():
+                    responses.append(asyncio.ensure_future(respond(line)))
+            await asyncio.gather(*responses)
+        finally:
+            writer.close()
+
+    def shutdown(self):
+        if self.__server is not None:
+            self.__server.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifies proofs for one verification key as JSON lines service")
+    parser.add_argument("--key", required=True, help="verification key file (see Keys.py), e.g. saved by prover_service.py")
+    parser.add_argument("--socket", required=True, help="unix socket to listen on")
+    parser.add_argument("--window-ms", type=float, default=5, help="how long a request waits for others to share its batch")
+    parser.add_argument("--max-batch", type=int, default=32, help="batch size that is verified without waiting")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes for the pairings, 0 uses one thread")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    with VerificationKey.load(args.key) as key:
+        prepared_key = PreparedVerificationKey.from_key(key)
+
+    service = VerifierService(prepared_key, window=args.window_ms / 1000, max_batch=args.max_batch, workers=args.workers)
+    log(f"--- Listening on {args.socket} ---")
+    try:
+        asyncio.run(service.serve_unix(args.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()